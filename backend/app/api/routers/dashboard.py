@@ -0,0 +1,60 @@
+import asyncio
+from fastapi import APIRouter, Depends
+from app.api.routers.notifications import FEED_TYPE, encode_cursor
+from app.core.config import settings
+from app.core.security import verify_token
+from app.db import Repository, get_repository
+from app.services.catalog import job_catalog
+from typing import Optional
+
+router = APIRouter()
+
+DASHBOARD_MATCH_COLUMNS = "id,resume_id,job_id,score,top_terms,created_at"
+
+
+@router.get("/dashboard")
+async def get_dashboard(user_id: str = Depends(verify_token), repo: Repository = Depends(get_repository)):
+    """Everything the dashboard page shows, in one response.
+
+    Latest resumes, latest matches with their job titles, the first page of
+    notifications (continue with GET /notifications?cursor=next_notifications_cursor)
+    and the match and unread counts. The reads are independent, so they run
+    concurrently; job titles come from the cached catalog.
+    """
+    resumes, matches, match_count, notifications, unread = await asyncio.gather(
+        repo.list_user_resumes(user_id, limit=settings.dashboard_resumes),
+        repo.list_user_matches(user_id, columns=DASHBOARD_MATCH_COLUMNS, limit=settings.dashboard_matches),
+        repo.count_user_matches(user_id),
+        repo.list_notifications(user_id, FEED_TYPE, limit=settings.dashboard_notifications + 1),
+        repo.count_unread_notifications(user_id, FEED_TYPE),
+    )
+    next_cursor = None
+    if len(notifications) > settings.dashboard_notifications:
+        notifications = notifications[:settings.dashboard_notifications]
+        next_cursor = encode_cursor(notifications[-1])
+
+    # Notifications point at matches; only the ones not among the latest matches are read
+    matches_by_id = {str(match['id']): match for match in matches}
+    missing = {str(row['match_id']) for row in notifications} - matches_by_id.keys()
+    if missing:
+        matches_by_id.update(
+            (str(match['id']), match) for match in await repo.get_matches_by_ids(missing, columns=DASHBOARD_MATCH_COLUMNS)
+        )
+    jobs = await job_catalog.get_by_ids(repo, {str(match['job_id']) for match in matches_by_id.values()})
+
+    def job_title(match: Optional[dict]) -> Optional[str]:
+        job = jobs.get(str(match['job_id'])) if match else None
+        return job['title'] if job else None
+
+    feed = []
+    for row in notifications:
+        match = matches_by_id.get(str(row['match_id']))
+        feed.append({**row, "job_title": job_title(match), "score": match['score'] if match else None})
+
+    return {
+        "resumes": resumes,
+        "matches": [{**match, "job_title": job_title(match)} for match in matches],
+        "notifications": feed,
+        "next_notifications_cursor": next_cursor,
+        "counts": {"matches": match_count, "unread_notifications": unread},
+    }
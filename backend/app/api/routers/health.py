@@ -1,8 +1,17 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+from app.services.warmup import readiness
 
 router = APIRouter()
 
 
 @router.get("/health")
 def health_check():
-    return {"status": "ok", "version": "0.1.0"}
\ No newline at end of file
+    return {"status": "ok", "version": "0.1.0"}
+
+
+@router.get("/health/ready")
+def readiness_check(response: Response):
+    # Liveness stays on /health; this one fails until warm-up is done, for load balancer probes
+    if not readiness.ready:
+        response.status_code = 503
+    return readiness.report()
@@ -1,25 +1,65 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from app.core.security import verify_token
-from app.models.schemas import JobCreate, JobResponse
-from supabase import create_client
-from app.core.config import settings
-from typing import List
+from app.models.schemas import JobCreate, JobListItem, JobResponse
+from app.db import Repository, get_repository
+from app.services.catalog import job_catalog
+from app.services.job_index import job_index
+from app.workers.reverse_match import match_new_job
+from typing import List, Optional
 
 router = APIRouter()
-supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
 
+JOB_FIELDS = set(JobResponse.model_fields)
 
-@router.get("/jobs", response_model=List[JobResponse])
-def get_jobs():
-    response = supabase.table("jobs").select("*").execute()
-    return response.data
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match list (RFC 9110 13.1.2) against our ETag."""
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+@router.get("/jobs", response_model=List[JobListItem], response_model_exclude_unset=True)
+async def get_jobs(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    repo: Repository = Depends(get_repository)
+):
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    if selected and not set(selected) <= JOB_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(set(selected) - JOB_FIELDS))}")
+
+    page = await job_catalog.page(repo, cursor, limit, selected)
+    # Clients revalidate with If-None-Match and get an empty 304 while the catalog is unchanged
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), page.etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @router.post("/jobs", response_model=JobResponse)
-def create_job(
+async def create_job(
     job: JobCreate,
-    user_id: str = Depends(verify_token)
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(verify_token),
+    repo: Repository = Depends(get_repository)
 ):
     data = job.dict()
-    response = supabase.table("jobs").insert(data).execute()
-    return response.data[0]
\ No newline at end of file
+    row = await repo.insert_job(data)
+    job_catalog.invalidate()
+    await run_in_threadpool(job_index.upsert, [row])
+    # Existing resumes are matched against the new posting right after the response
+    background_tasks.add_task(match_new_job, row)
+    return row
@@ -1,78 +1,241 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+import random
+import time
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from app.core.security import verify_token
-from app.models.schemas import MatchCreate, MatchResponse
-from supabase import create_client
+from app.models.schemas import MatchCreate, MatchJobResponse, MatchResponse
 from app.core.config import settings
+from app.db import Repository, get_repository
+from app.services.catalog import job_catalog
 from app.services.vectorize import vectorizer
-from app.services.match_score import compute_weighted_score
-from app.api.routers.notifications import send_email
+from app.services.job_index import EncodedResume, IndexSnapshot, job_index
+from app.services.model_store import load_current_model, publish_model
+from app.services.persistence import load_existing_matches, match_key, persist_matches
+from app.services.skills import resume_skill_text
 from app.core.logging import logger
-from typing import List
+from app.core.metrics import PAIRS_CONSIDERED, stage_timer
+from app.core.profiling import profile_if_slow
+from app.workers.match_jobs import MatchJobQueueFull, match_jobs
+from typing import List, Optional
+from uuid import UUID
 
 router = APIRouter()
-supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
 
 
-@router.post("/matches", response_model=List[MatchResponse])
-def compute_matches(
-    match: MatchCreate,
-    user_id: str = Depends(verify_token)
-):
-    # Get resume
-    resume_response = supabase.table("resumes").select("*").eq("id", str(match.resume_id)).eq("user_id", user_id).execute()
-    if not resume_response.data:
-        raise HTTPException(status_code=404, detail="Resume not found")
-    resume = resume_response.data[0]
-
-    # Get all jobs
-    jobs_response = supabase.table("jobs").select("*").execute()
-    jobs = jobs_response.data
-
-    # Fit vectorizer on job descriptions if not fitted
-    if not hasattr(vectorizer.vectorizer, 'vocabulary_'):
+def _sync_index(jobs: list[dict]):
+    # Load the published model, or fit vectorizer on job descriptions if there is none yet
+    fitted_here = False
+    if not vectorizer.is_fitted and not load_current_model():
         job_texts = [job['description'] for job in jobs]
         vectorizer.fit(job_texts)
+        fitted_here = True
+    # Only new or edited postings are vectorized; the rest of the matrix is reused
+    with stage_timer("index_sync"):
+        job_index.sync(jobs)
+    if fitted_here:
+        publish_model()
 
-    matches = []
-    for job in jobs:
-        scores = compute_weighted_score(
+
+def _score(
+    resume: dict,
+    location: Optional[str],
+    min_score: Optional[float],
+    top_k: Optional[int],
+    block: Optional[slice] = None,
+    snapshot: Optional[IndexSnapshot] = None,
+    encoded: Optional[EncodedResume] = None
+) -> list[tuple[dict, dict, list[str]]]:
+    # Score and explain share one snapshot and one transform of the resume
+    snapshot = snapshot or job_index.snapshot()
+    encoded = encoded or job_index.encode(resume['text_content'], snapshot, resume_skill_text(resume))
+    with stage_timer("score"):
+        scored = job_index.score(
             resume['text_content'],
-            job['description'],
-            job['skills'],
-            job.get('experience_years'),
-            job.get('education_level'),
-            # Assume resume has these fields, or extract from text (simplified)
-            resume_experience_years=5,  # Placeholder
-            resume_education_level='bachelor'  # Placeholder
+            # Parsed once at upload (or by the backfill) and stored on the row
+            resume_experience_years=resume.get('experience_years'),
+            resume_education_level=resume.get('education_level'),
+            top_k=top_k,
+            location=location,
+            min_score=min_score,
+            block=block,
+            snapshot=snapshot,
+            encoded=encoded
         )
-        logger.info(f"Match score for user {user_id} job {job['id']}: {scores['overall']}")
-        if scores['overall'] >= 70:  # Threshold
-            match_data = {
+    # Only jobs at or above min_score come back, so every one of them gets explained
+    with stage_timer("explain"):
+        terms = job_index.explain(resume['text_content'], [job for job, _ in scored], snapshot=snapshot, encoded=encoded)
+    return [(job, scores, job_terms) for (job, scores), job_terms in zip(scored, terms)]
+
+
+def _score_resume(
+    resume: dict,
+    jobs: list[dict],
+    location: Optional[str] = None,
+    min_score: Optional[float] = None
+) -> list[tuple[dict, dict, list[str]]]:
+    # CPU-bound; runs in the threadpool so the event loop keeps serving requests
+    with profile_if_slow("match"):
+        _sync_index(jobs)
+        return _score(resume, location, min_score, settings.match_top_k)
+
+
+async def _store_matches(
+    user_id: str,
+    resume_id: str,
+    scored: list[tuple[dict, dict, list[str]]],
+    min_score: float,
+    existing: dict
+) -> tuple[list[dict], int]:
+    """Persist the scored pairs at or above ``min_score``; returns their responses and how many were new."""
+    candidates = []
+    jobs_by_id = {}
+    for job, scores, terms in scored:
+        # A sampled share of the per-pair scores; the summary line covers every request
+        if settings.match_log_sample_rate and random.random() < settings.match_log_sample_rate:
+            logger.info(f"Match score for user {user_id} job {job['id']}: {scores['overall']}")
+        if scores['overall'] >= min_score:
+            candidates.append({
                 "user_id": user_id,
-                "resume_id": str(match.resume_id),
+                "resume_id": resume_id,
                 "job_id": str(job['id']),
                 "score": scores['overall'],
-                "top_terms": []  # Placeholder
-            }
-            supabase.table("matches").insert(match_data).execute()
-            # Create notification
-            notification_data = {
-                "user_id": user_id,
-                "match_id": None,  # Would need to get the inserted match ID
-                "type": "in_app",
-                "sent_at": None,
-                "status": "pending"
-            }
-            supabase.table("notifications").insert(notification_data).execute()
-            # Send email
-            user_email = "user@example.com"  # In real app, get from auth
-            send_email(user_email, "New Job Match!", f"You have a {scores['overall']}% match for {job['title']}")
-            matches.append({
-                "id": None,
-                "job": job,
-                "score": scores['overall'],
-                "top_terms": [],
-                "created_at": None
+                "top_terms": terms
             })
+            jobs_by_id[str(job['id'])] = job
+
+    # Emails are only queued here; the outbox dispatcher sends them
+    inserted = await persist_matches(candidates, existing)
+
+    matches = []
+    for candidate in candidates:
+        row = existing[match_key(candidate)]
+        matches.append({
+            "id": row['id'],
+            "job": jobs_by_id[candidate['job_id']],
+            "score": candidate['score'],
+            "top_terms": row.get('top_terms') or candidate['top_terms'],
+            "created_at": row['created_at']
+        })
+    return matches, len(inserted)
+
+
+async def _get_resume(repo: Repository, user_id: str, resume_id) -> dict:
+    resume = await repo.get_resume(str(resume_id), user_id, columns="id,text_content,skill_text,experience_years,education_level")
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return resume
+
+
+async def _compute(repo: Repository, user_id: str, match: MatchCreate, resume: Optional[dict] = None) -> list[dict]:
+    # Resume and jobs are independent reads, so fetch them concurrently; the
+    # jobs normally come straight from the in-process catalog cache
+    if resume is None:
+        resume, jobs = await asyncio.gather(_get_resume(repo, user_id, match.resume_id), job_catalog.get_all(repo))
+    else:
+        jobs = await job_catalog.get_all(repo)
+
+    # Jobs that cannot reach the threshold are dropped before text similarity
+    min_score = max(settings.match_threshold, match.min_score or 0)
+    started = time.perf_counter()
+    scored = await run_in_threadpool(_score_resume, resume, jobs, match.location, min_score)
+    PAIRS_CONSIDERED.inc(len(jobs), source="api")
+
+    # One read for the pairs already stored, then batched upserts for the rest
+    existing = await load_existing_matches([match.resume_id])
+    matches, inserted = await _store_matches(user_id, str(match.resume_id), scored, min_score, existing)
+    logger.info(
+        f"Resume {match.resume_id}: {len(matches)} of {len(jobs)} jobs at or above {min_score} "
+        f"({inserted} new) in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return matches
+
+
+@router.post("/matches", response_model=List[MatchResponse])
+async def compute_matches(
+    match: MatchCreate,
+    user_id: str = Depends(verify_token),
+    repo: Repository = Depends(get_repository)
+):
+    return await _compute(repo, user_id, match)
+
+
+@router.post("/matches/jobs", response_model=MatchJobResponse, status_code=202)
+async def submit_match_job(
+    match: MatchCreate,
+    request: Request,
+    response: Response,
+    user_id: str = Depends(verify_token),
+    repo: Repository = Depends(get_repository)
+):
+    """Queue the same computation as POST /matches; poll the returned job for its results."""
+    # Checked up front so a bad id fails now rather than inside the job
+    resume = await _get_resume(repo, user_id, match.resume_id)
+    try:
+        job = await match_jobs.submit(
+            user_id, lambda: _compute(repo, user_id, match, resume), resume_id=str(match.resume_id)
+        )
+    except MatchJobQueueFull:
+        raise HTTPException(status_code=503, detail="Too many match jobs in progress", headers={"Retry-After": "5"})
+    response.headers["Location"] = str(request.url_for("get_match_job", job_id=job['id']).path)
+    return job
+
+
+@router.get("/matches/jobs/{job_id}", response_model=MatchJobResponse)
+async def get_match_job(job_id: UUID, user_id: str = Depends(verify_token)):
+    job = await match_jobs.get(str(job_id))
+    # Other users' jobs look the same as missing ones
+    if job is None or job['user_id'] != user_id:
+        raise HTTPException(status_code=404, detail="Match job not found")
+    return job
+
+
+@router.post("/matches/stream")
+async def stream_matches(
+    match: MatchCreate,
+    request: Request,
+    user_id: str = Depends(verify_token),
+    repo: Repository = Depends(get_repository)
+):
+    """Score and store matches block by block, sending each block's matches as soon as it is done.
+
+    NDJSON (one match per line) by default, or Server-Sent Events ("match"
+    events, then a final "done") when the client accepts text/event-stream.
+    Every match above the threshold is sent: match_top_k is not applied, as the
+    best matches are only known once the last block is scored.
+    """
+    resume, jobs = await asyncio.gather(_get_resume(repo, user_id, match.resume_id), job_catalog.get_all(repo))
+    min_score = max(settings.match_threshold, match.min_score or 0)
+    await run_in_threadpool(_sync_index, jobs)
+    # Pinned, so a rebuild during the stream cannot shift rows between blocks;
+    # the resume is transformed once for all of them
+    snapshot = job_index.snapshot()
+    encoded = await run_in_threadpool(job_index.encode, resume['text_content'], snapshot, resume_skill_text(resume))
+    existing = await load_existing_matches([match.resume_id])
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    async def lines():
+        started = time.perf_counter()
+        total = len(snapshot.jobs) if snapshot else 0
+        sent = 0
+        for start in range(0, total, settings.match_stream_block_size):
+            block = slice(start, start + settings.match_stream_block_size)
+            scored = await run_in_threadpool(_score, resume, match.location, min_score, None, block, snapshot, encoded)
+            matches, _ = await _store_matches(user_id, str(match.resume_id), scored, min_score, existing)
+            for row in matches:
+                data = json.dumps(MatchResponse.model_validate(row).model_dump(mode="json"))
+                yield f"event: match\ndata: {data}\n\n" if sse else data + "\n"
+            sent += len(matches)
+        PAIRS_CONSIDERED.inc(total, source="stream")
+        logger.info(
+            f"Resume {match.resume_id}: streamed {sent} of {total} jobs at or above {min_score} "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        if sse:
+            yield f"event: done\ndata: {json.dumps({'count': sent})}\n\n"
 
-    return matches
\ No newline at end of file
+    if sse:
+        return StreamingResponse(lines(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from app.core.metrics import registry
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def metrics():
+    # Prometheus text exposition format
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,21 +1,113 @@
-from fastapi import APIRouter, Depends
-from app.core.security import verify_token
-from supabase import create_client
-from app.core.config import settings
-from typing import List
+import asyncio
+import base64
+import binascii
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from app.core.logging import logger
+from app.core.security import authenticate, verify_token
+from app.db import Repository, get_repository
+from app.models.schemas import NotificationsRead
+from app.services.notification_feed import notification_feed
+from typing import List, Optional
 
 router = APIRouter()
-supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
+
+FEED_TYPE = "in_app"
+
+
+def encode_cursor(row: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps([row['created_at'], str(row['id'])]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        created_at, notification_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(created_at), str(notification_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 @router.get("/notifications", response_model=List[dict])
-def get_notifications(user_id: str = Depends(verify_token)):
-    response = supabase.table("notifications").select("*").eq("user_id", user_id).order("created_at", desc=True).execute()
-    return response.data
+async def get_notifications(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    notification_type: str = Query(FEED_TYPE, alias="type", pattern="^(email|in_app)$"),
+    user_id: str = Depends(verify_token),
+    repo: Repository = Depends(get_repository)
+):
+    # The in-app feed unless ``type=email`` asks for the outbox's rows, which
+    # duplicate every in-app row. Keyset pagination, newest first: the cursor is the (created_at, id) of the previous page's last row
+    before = decode_cursor(cursor) if cursor else None
+    # One extra row tells whether there is a next page
+    rows = await repo.list_notifications(user_id, notification_type, limit=limit + 1, before=before)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+    return rows
+
+
+@router.get("/notifications/unread-count")
+async def get_unread_count(user_id: str = Depends(verify_token), repo: Repository = Depends(get_repository)):
+    return {"unread": await repo.count_unread_notifications(user_id, FEED_TYPE)}
+
+
+@router.post("/notifications/read")
+async def mark_notifications_read(
+    read: NotificationsRead,
+    user_id: str = Depends(verify_token),
+    repo: Repository = Depends(get_repository)
+):
+    await repo.mark_notifications_read(user_id, FEED_TYPE, None if read.ids is None else [str(i) for i in read.ids])
+    return {"unread": await repo.count_unread_notifications(user_id, FEED_TYPE)}
+
+
+@router.websocket("/notifications/ws")
+async def notifications_socket(websocket: WebSocket, token: str = Query(...)):
+    """Pushes each new in-app notification as {"type": "notification", ...}, after an initial unread count.
+
+    Browsers cannot set headers on a WebSocket, so the bearer token comes as
+    ``?token=``. Anything the client sends is ignored (e.g. keep-alive pings).
+    """
+    try:
+        # Signature checks and a JWKS refresh are blocking, so off the event loop
+        user_id = await run_in_threadpool(authenticate, token)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    queue = notification_feed.subscribe(user_id)
+
+    async def forward():
+        count = await get_repository().count_unread_notifications(user_id, FEED_TYPE)
+        await websocket.send_json({"type": "unread", "unread": count})
+        while True:
+            row = await queue.get()
+            await websocket.send_json({"type": "notification", "notification": row})
 
+    async def receive():
+        # Returns only when the client goes away
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
 
-# Mock email send function
-def send_email(to: str, subject: str, body: str):
-    # In production, integrate with Resend or SendGrid
-    print(f"Sending email to {to}: {subject} - {body}")
-    return True
\ No newline at end of file
+    sender = asyncio.create_task(forward())
+    receiver = asyncio.create_task(receive())
+    try:
+        await asyncio.wait([sender, receiver], return_when=asyncio.FIRST_COMPLETED)
+        if sender.done():
+            # forward only ends by failing (storage error, failed send): close
+            # rather than leave the client connected without updates
+            logger.warning(f"Notification socket for user {user_id} stopped", exc_info=sender.exception())
+            try:
+                await websocket.close(code=1011)
+            except Exception:
+                # The connection itself may be what failed
+                pass
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        notification_feed.unsubscribe(user_id, queue)
@@ -3,51 +3,80 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.core.security import verify_token
 from app.models.schemas import ResumeResponse
-from supabase import create_client
+from fastapi.concurrency import run_in_threadpool
 from app.core.config import settings
-import PyPDF2
-import io
+from app.core.metrics import stage_timer
+from app.db import Repository, get_repository
+import hashlib
+from app.services.pdf_extract import PDFExtractionError, pdf_pool
 from app.services.preprocess import preprocess_text
+from app.services.resume_features import extract_resume_features
 
 router = APIRouter()
-supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
 
 limiter = Limiter(key_func=get_remote_address)
 
 
-def extract_text_from_pdf(file: bytes) -> str:
-    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file))
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text()
-    return text
+# Bytes read per chunk while hashing and size-checking an upload
+_READ_CHUNK = 1024 * 1024
 
 
 @router.post("/resumes", response_model=ResumeResponse)
 @limiter.limit("5/minute")
-def upload_resume(
+async def upload_resume(
     request: Request,
     file: UploadFile = File(...),
-    user_id: str = Depends(verify_token)
+    user_id: str = Depends(verify_token),
+    repo: Repository = Depends(get_repository)
 ):
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-    if file.size > 10 * 1024 * 1024:  # 10MB
+    if file.size and file.size > settings.max_upload_bytes:
         raise HTTPException(status_code=400, detail="File too large")
-    # ... rest of the code
-    file_content = file.file.read()
+    # Read in chunks, hashing as we go and stopping as soon as the limit is passed
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while chunk := await file.read(_READ_CHUNK):
+        size += len(chunk)
+        if size > settings.max_upload_bytes:
+            raise HTTPException(status_code=400, detail="File too large")
+        digest.update(chunk)
+        chunks.append(chunk)
+    file_content = b"".join(chunks)
+    content_hash = digest.hexdigest()
+
+    # An identical PDF was parsed before: reuse its text instead of parsing again
+    previous = await repo.find_resume_by_hash(
+        content_hash, columns="id,user_id,filename,text_content,experience_years,education_level,features_version,skill_text,created_at"
+    )
+    if previous and str(previous['user_id']) == user_id:
+        return previous
+
     file_path = f"resumes/{user_id}/{file.filename}"
-    supabase.storage.from_("resumes").upload(file_path, file_content)
+    await repo.upload_resume_file(file_path, file_content)
 
-    # Extract and preprocess text
-    raw_text = extract_text_from_pdf(file_content)
-    text_content = preprocess_text(raw_text)
+    if previous:
+        text_content = previous['text_content']
+        features = {key: previous.get(key) for key in ("experience_years", "education_level", "features_version", "skill_text")}
+    else:
+        # Extract in the worker pool and preprocess off the event loop
+        try:
+            raw_text = await pdf_pool.extract(file_content)
+        except PDFExtractionError as e:
+            raise HTTPException(status_code=422, detail=f"Could not read PDF: {e}")
+        with stage_timer("preprocess"):
+            text_content = await run_in_threadpool(preprocess_text, raw_text)
+        # Parsed once here, from the raw text (preprocessing drops the digits),
+        # so scoring only ever reads the stored columns
+        features = await run_in_threadpool(extract_resume_features, raw_text)
 
     # Save to DB
     data = {
         "user_id": user_id,
         "filename": file.filename,
-        "text_content": text_content
+        "text_content": text_content,
+        "content_hash": content_hash,
+        **features
     }
-    response = supabase.table("resumes").insert(data).execute()
-    return response.data[0]
\ No newline at end of file
+    return await repo.insert_resume(data)
@@ -1,13 +1,160 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
-    supabase_url: str
-    supabase_anon_key: str
-    supabase_service_role_key: str
+    # Storage backend: "supabase", or "sqlite" / "memory" to run everything
+    # locally without credentials. The SQLite file defaults to data_dir/app.db.
+    storage_backend: str = "supabase"
+    sqlite_path: Optional[str] = None
+    supabase_url: Optional[str] = None
+    supabase_anon_key: Optional[str] = None
+    supabase_service_role_key: Optional[str] = None
+
+    # Bearer tokens: HS256 tokens are checked against the project's JWT secret,
+    # asymmetric ones against the JWKS (default: the Supabase auth endpoint),
+    # cached for jwks_refresh_seconds. Verified tokens are remembered in an LRU of
+    # token_cache_size entries until their exp, or token_cache_ttl_seconds at most.
+    # jwt_verify_signature=false trusts any well-formed token (local development only).
+    supabase_jwt_secret: Optional[str] = None
+    jwt_jwks_url: Optional[str] = None
+    jwt_audience: Optional[str] = "authenticated"
+    jwt_verify_signature: bool = True
+    jwks_refresh_seconds: int = 3600
+    token_cache_size: int = 10000
+    token_cache_ttl_seconds: int = 300
+
+    # Matching
+    match_threshold: float = 70
+    # Batch rescoring: resumes scored per block, threads sharing the blocks,
+    # and an optional cap on matches kept per resume
+    rescore_block_size: int = 256
+    rescore_workers: Optional[int] = None
+    rescore_top_k: Optional[int] = None
+    # Refit the vocabulary (forcing a full rescore) only when more than this
+    # share of the catalog changed since the last run
+    rescore_refit_ratio: float = 0.2
+    # Rescore coordination across every worker sharing the storage backend: each
+    # checks every rescore_check_seconds, and a run starts once
+    # rescore_interval_seconds have passed since the last completed one. One worker
+    # holds the coordinator lease and splits resumes into rescore_shards id-range
+    # shards; every worker polls every rescore_poll_seconds to claim unfinished
+    # ones. Leases are renewed while work is in flight and last
+    # rescore_lease_seconds, so a crashed worker's shard is retried.
+    rescore_interval_seconds: int = 24 * 60 * 60
+    rescore_check_seconds: int = 300
+    rescore_shards: int = 8
+    rescore_poll_seconds: int = 10
+    rescore_lease_seconds: int = 900
+
+    # Resume uploads: size cap, PDF worker processes, per-document page and time
+    # limits, and documents a worker parses before it is replaced
+    max_upload_bytes: int = 10 * 1024 * 1024  # 10MB
+    pdf_workers: int = 2
+    pdf_max_pages: int = 50
+    pdf_timeout_seconds: float = 10
+    pdf_max_tasks_per_child: int = 100
+
+    # Matches kept per resume on POST /matches (None keeps every job above the
+    # threshold). With a limit, an inverted-index search over the posting lists of
+    # the resume's retrieval_query_terms heaviest terms (0 = all of them) picks
+    # top_k * retrieval_candidates jobs, and only those are fully scored. Raise
+    # either for recall, lower them for latency.
+    match_top_k: Optional[int] = None
+    retrieval_candidates: int = 4
+    retrieval_query_terms: int = 32
+
+    # How often the in-memory resume index re-reads the whole resumes table
+    # (in between it only reads rows updated since its last refresh)
+    resume_index_full_load_seconds: int = 3600
+
+    # Share of the skills score that comes from the job's listed skills found in
+    # the resume; the rest is description similarity. Jobs listing no skills use
+    # similarity alone.
+    skill_match_weight: float = 0.5
+
+    # Terms stored with each match to explain its score
+    top_terms_count: int = 5
+
+    # Resumes per read, and PDFs downloaded and parsed at once, when backfilling
+    # the extracted experience/education columns
+    backfill_batch_size: int = 200
+    backfill_concurrency: int = 4
+
+    # How long a worker serves its cached job catalog before re-reading the table
+    catalog_ttl_seconds: int = 60
+
+    # Per-pair match scores logged per request as a sampled share (each request
+    # always logs one summary line), and an optional cProfile capture of match
+    # computations slower than match_profile_threshold_ms, kept in data_dir/profiles
+    match_log_sample_rate: float = 0.0
+    match_profile_threshold_ms: Optional[float] = None
+
+    # Async match jobs (POST /matches/jobs): computations run at once per worker,
+    # jobs queued or running before new ones get 503, and how long a job's status
+    # and results stay readable. POST /matches/stream scores and sends the catalog
+    # match_stream_block_size jobs at a time.
+    match_job_workers: int = 2
+    match_job_max_pending: int = 100
+    match_job_ttl_seconds: int = 3600
+    match_stream_block_size: int = 1000
+
+    # Notification push (WebSocket): how often each worker looks for rows that
+    # other workers wrote while clients are connected, and how many undelivered
+    # notifications a slow client may have queued
+    notification_poll_seconds: float = 5
+    notification_queue_size: int = 100
+
+    # Rows returned by GET /dashboard: latest resumes, latest matches, and the
+    # first page of notifications
+    dashboard_resumes: int = 10
+    dashboard_matches: int = 20
+    dashboard_notifications: int = 20
+
+    # Rows per batched match/notification upsert
+    persist_chunk_size: int = 500
+
+    # Database HTTP pool: connections shared by all requests, per-call timeout,
+    # and rows per page on list reads
+    db_max_connections: int = 20
+    db_timeout_seconds: float = 30
+    db_page_size: int = 1000
+
+    # Email outbox: transport ("console" or "memory"), drain interval, rows per
+    # drain, concurrent sends, send rate cap, and retries with exponential backoff.
+    # A drain holds its rows for outbox_claim_seconds; rows of a drain that died
+    # are sent by a later one
+    email_transport: str = "console"
+    outbox_poll_seconds: int = 30
+    outbox_batch_size: int = 1000
+    outbox_claim_seconds: int = 600
+    outbox_concurrency: int = 8
+    outbox_rate_per_second: float = 10
+    outbox_max_retries: int = 3
+    outbox_backoff_seconds: float = 1.0
+
+    # Preprocessing process pool, used for batches of at least
+    # preprocess_pool_min_texts texts; 0 or 1 keeps it in-process
+    preprocess_processes: int = 0
+    preprocess_pool_min_texts: int = 5000
+
+    # Startup: "background" serves at once and warms up (sklearn, model, job
+    # catalog and index) alongside, "blocking" warms up before serving, "lazy"
+    # skips it so the first requests load what they need. GET /health/ready
+    # answers 503 until warm-up is done. A failed warm-up is retried
+    # warm_up_retries times with exponential backoff, then left to lazy loading.
+    startup_mode: str = "background"
+    warm_up_retries: int = 4
+    warm_up_backoff_seconds: float = 2.0
+
+    # Local state such as the rescore watermark and model artifacts
+    data_dir: str = "data"
+    # Artifacts kept on disk, and how often workers check for a newer one
+    model_keep_versions: int = 3
+    model_refresh_seconds: int = 60
 
     class Config:
         env_file = ".env"
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
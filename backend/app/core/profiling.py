@@ -0,0 +1,45 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from app.core.config import settings
+from app.core.logging import logger
+
+# cProfile can only watch one computation at a time; the others run unprofiled
+_profiling = threading.Lock()
+
+
+@contextmanager
+def profile_if_slow(name: str, threshold_ms: Optional[float] = None):
+    """Run the block under cProfile and keep the profile if it took at least ``threshold_ms``.
+
+    Off unless ``threshold_ms`` or the match_profile_threshold_ms setting is
+    set. Slow runs are saved to data_dir/profiles/<name>-<ms>.prof (open with
+    ``python -m pstats`` or snakeviz), and their top functions are logged.
+    """
+    threshold_ms = settings.match_profile_threshold_ms if threshold_ms is None else threshold_ms
+    if threshold_ms is None or not _profiling.acquire(blocking=False):
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _profiling.release()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= threshold_ms:
+            directory = os.path.join(settings.data_dir, "profiles")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{name}-{int(time.time() * 1000)}.prof")
+            profiler.dump_stats(path)
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(15)
+            logger.warning(f"Slow {name} took {elapsed_ms:.0f} ms; profile saved to {path}\n{summary.getvalue()}")
@@ -1,20 +1,181 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+import httpx
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
+from jose import jwt, JOSEError, JWTError
 from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import AUTH_TOKENS
 
 security = HTTPBearer()
 
+# Asymmetric algorithms accepted from the key set; HS256 only with the shared secret
+_JWKS_ALGORITHMS = ["RS256", "ES256", "EdDSA"]
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
+
+class TokenCache:
+    """Bounded LRU of already-verified tokens, keyed by the token's SHA-256.
+
+    An entry lives until the token's ``exp`` or ``ttl`` seconds, whichever comes
+    first, so a cached token is never accepted after it has expired.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[str]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user_id, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user_id
+
+    def put(self, token: str, user_id: str, exp: Optional[float] = None):
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if self.max_size <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (user_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class KeySet:
+    """Signing keys from the auth server's JWKS endpoint, cached in process.
+
+    Re-fetched every ``refresh_seconds``, or early when a token names an unknown
+    ``kid`` (key rotation), but never more than once per ``min_refresh_seconds``.
+    A failed fetch keeps the keys already held and is retried only after
+    ``min_refresh_seconds``, so an auth server outage does not stall every request.
+    """
+
+    def __init__(self, url: Optional[str], refresh_seconds: float, min_refresh_seconds: float = 30):
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self._keys: dict[str, dict] = {}
+        self._fetched_at = 0.0
+        # No fetch before this (monotonic) time after a failure
+        self._retry_at = 0.0
+        self._error: Optional[httpx.HTTPError] = None
+        self._lock = threading.Lock()
+
+    def load(self, keys: list[dict]):
+        self._keys = {key.get('kid', ''): key for key in keys}
+        self._fetched_at = time.monotonic()
+        self._error = None
+
+    def _refresh(self):
+        try:
+            response = httpx.get(self.url, timeout=settings.db_timeout_seconds)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            self._retry_at = time.monotonic() + self.min_refresh_seconds
+            self._error = e
+            logger.warning(f"Fetching signing keys failed, keeping {len(self._keys)} cached: {e}")
+            return
+        self.load(response.json().get('keys', []))
+
+    def _due(self, kid: str) -> bool:
+        now = time.monotonic()
+        age = now - self._fetched_at
+        return now >= self._retry_at and (age > self.refresh_seconds or (kid not in self._keys and age > self.min_refresh_seconds))
+
+    def get(self, kid: Optional[str]) -> Optional[dict]:
+        kid = kid or ''
+        if self.url and self._due(kid):
+            with self._lock:
+                # Another thread may have refreshed while this one waited
+                if self._due(kid):
+                    self._refresh()
+        if not self._keys and self._error is not None:
+            # Nothing to fall back on yet
+            raise self._error
+        return self._keys.get(kid)
+
+
+def _jwks_url() -> Optional[str]:
+    if settings.jwt_jwks_url:
+        return settings.jwt_jwks_url
+    if settings.supabase_url:
+        return settings.supabase_url.rstrip("/") + "/auth/v1/.well-known/jwks.json"
+    return None
+
+
+# Global instances
+token_cache = TokenCache(settings.token_cache_size, settings.token_cache_ttl_seconds)
+key_set = KeySet(_jwks_url(), settings.jwks_refresh_seconds)
+
+
+def decode_token(token: str) -> dict:
+    """Claims of ``token`` after checking its signature, ``exp`` and audience."""
+    if not settings.jwt_verify_signature:
+        # Local development only: trust any well-formed token
+        return jwt.get_unverified_claims(token)
+
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get('alg')
+    options = {"verify_aud": settings.jwt_audience is not None}
+    if algorithm == "HS256":
+        if not settings.supabase_jwt_secret:
+            raise JWTError("HS256 tokens need SUPABASE_JWT_SECRET")
+        return jwt.decode(token, settings.supabase_jwt_secret, algorithms=["HS256"], audience=settings.jwt_audience, options=options)
+    if algorithm not in _JWKS_ALGORITHMS:
+        raise JWTError(f"Unsupported algorithm {algorithm}")
     try:
-        # Decode JWT using Supabase's public key or verify locally if possible
-        # For simplicity, assume we trust the token if it's valid format
-        payload = jwt.get_unverified_claims(token)
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
+        key = key_set.get(header.get('kid'))
+    except httpx.HTTPError:
+        raise HTTPException(status_code=503, detail="Signing keys unavailable")
+    if key is None:
+        raise JWTError("Unknown signing key")
+    return jwt.decode(token, key, algorithms=[algorithm], audience=settings.jwt_audience, options=options)
+
+
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return authenticate(credentials.credentials)
+
+
+def authenticate(token: str) -> str:
+    """User id of a bearer token; 401 if it is invalid. Also used where there is no Authorization header (WebSockets)."""
+    # Repeat requests with the same token skip the signature check
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        AUTH_TOKENS.inc(result="cached")
         return user_id
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
\ No newline at end of file
+    try:
+        payload = decode_token(token)
+    except JOSEError:
+        AUTH_TOKENS.inc(result="rejected")
+        raise HTTPException(status_code=401, detail="Invalid token")
+    user_id = payload.get("sub")
+    if not user_id:
+        AUTH_TOKENS.inc(result="rejected")
+        raise HTTPException(status_code=401, detail="Invalid token")
+    token_cache.put(token, user_id, payload.get("exp"))
+    AUTH_TOKENS.inc(result="verified")
+    return user_id
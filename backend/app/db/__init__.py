@@ -0,0 +1,4 @@
+from app.db.base import Repository
+from app.db.repository import SupabaseRepository, close_repository, create_repository, get_repository
+
+__all__ = ["Repository", "SupabaseRepository", "close_repository", "create_repository", "get_repository"]
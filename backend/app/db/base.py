@@ -0,0 +1,212 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+# Columns each caller actually needs, instead of select("*")
+RESUME_COLUMNS = "id,user_id,filename,text_content,experience_years,education_level,created_at"
+JOB_COLUMNS = "id,title,description,skills,experience_years,education_level,location,created_at"
+MATCH_COLUMNS = "id,user_id,resume_id,job_id,score,top_terms,created_at"
+NOTIFICATION_COLUMNS = "id,user_id,match_id,type,status,sent_at,read_at,created_at"
+NOTIFICATION_TYPES = ("email", "in_app")
+
+
+class Repository(ABC):
+    """Storage interface used by every router and worker.
+
+    Backends cover the resumes, jobs, matches and notifications tables, the
+    resume file bucket, and the leases and shared state the workers coordinate
+    through; ``columns`` is always a comma-separated column list.
+    Inserted rows come back with their generated ``id``, ``created_at`` and
+    ``updated_at``.
+    """
+
+    async def close(self):
+        pass
+
+    # Resumes
+
+    @abstractmethod
+    async def get_resume(self, resume_id: str, user_id: str, columns: str = RESUME_COLUMNS) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def list_resumes(
+        self,
+        columns: str = RESUME_COLUMNS,
+        updated_since: Optional[str] = None,
+        id_range: Optional[tuple[Optional[str], Optional[str]]] = None
+    ) -> list[dict]:
+        # id_range is [low, high) with None for an open end
+        ...
+
+    @abstractmethod
+    async def list_user_resumes(self, user_id: str, columns: str = "id,filename,created_at", limit: Optional[int] = None) -> list[dict]:
+        # Newest first
+        ...
+
+    @abstractmethod
+    async def find_resume_by_hash(self, content_hash: str, columns: str = RESUME_COLUMNS) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def list_resumes_needing_features(
+        self, version: int, limit: int, columns: str = "id,user_id,filename", after_id: Optional[str] = None
+    ) -> list[dict]:
+        # Rows whose features_version is missing or below ``version``, in id order after ``after_id``
+        ...
+
+    @abstractmethod
+    async def insert_resumes(self, rows: list[dict]) -> list[dict]:
+        ...
+
+    async def insert_resume(self, row: dict) -> dict:
+        return (await self.insert_resumes([row]))[0]
+
+    @abstractmethod
+    async def update_resume(self, resume_id: str, values: dict):
+        ...
+
+    @abstractmethod
+    async def upload_resume_file(self, path: str, content: bytes, content_type: str = "application/pdf"):
+        ...
+
+    @abstractmethod
+    async def download_resume_file(self, path: str) -> bytes:
+        ...
+
+    # Jobs
+
+    @abstractmethod
+    async def list_jobs(self, columns: str = JOB_COLUMNS, updated_since: Optional[str] = None) -> list[dict]:
+        ...
+
+    @abstractmethod
+    async def get_jobs_by_ids(self, job_ids: Iterable[str], columns: str = JOB_COLUMNS) -> list[dict]:
+        ...
+
+    @abstractmethod
+    async def insert_jobs(self, rows: list[dict]) -> list[dict]:
+        ...
+
+    async def insert_job(self, row: dict) -> dict:
+        return (await self.insert_jobs([row]))[0]
+
+    # Matches
+
+    @abstractmethod
+    async def list_matches(self, columns: str = MATCH_COLUMNS, resume_ids: Optional[Iterable[str]] = None) -> list[dict]:
+        ...
+
+    @abstractmethod
+    async def list_user_matches(self, user_id: str, columns: str = MATCH_COLUMNS, limit: Optional[int] = None) -> list[dict]:
+        # Newest first
+        ...
+
+    @abstractmethod
+    async def count_user_matches(self, user_id: str) -> int:
+        ...
+
+    @abstractmethod
+    async def get_matches_by_ids(self, match_ids: Iterable[str], columns: str = MATCH_COLUMNS) -> list[dict]:
+        ...
+
+    @abstractmethod
+    async def upsert_matches(self, rows: list[dict], on_conflict: str) -> list[dict]:
+        # Rows conflicting on the ``on_conflict`` columns are skipped; only rows
+        # that were actually inserted come back
+        ...
+
+    # Notifications
+
+    @abstractmethod
+    async def list_notifications(
+        self,
+        user_id: str,
+        notification_type: Optional[str],
+        columns: str = NOTIFICATION_COLUMNS,
+        limit: Optional[int] = None,
+        before: Optional[tuple[str, str]] = None
+    ) -> list[dict]:
+        # Newest first, ordered by (created_at, id), of one type or (None) all of
+        # them; ``before`` is the (created_at, id) of the last row of the previous page
+        ...
+
+    @abstractmethod
+    async def list_notifications_since(
+        self,
+        notification_type: str,
+        since: str,
+        user_ids: Iterable[str],
+        columns: str = NOTIFICATION_COLUMNS
+    ) -> list[dict]:
+        # The given users' rows created at or after ``since``, oldest first
+        ...
+
+    @abstractmethod
+    async def count_unread_notifications(self, user_id: str, notification_type: str) -> int:
+        ...
+
+    @abstractmethod
+    async def mark_notifications_read(self, user_id: str, notification_type: str, notification_ids: Optional[list] = None):
+        # Sets read_at on the user's unread rows: the given ones, or all of them
+        ...
+
+    @abstractmethod
+    async def list_pending_notifications(self, notification_type: str, limit: int, columns: str = NOTIFICATION_COLUMNS) -> list[dict]:
+        # Ordered by user_id, so one user's rows arrive together
+        ...
+
+    @abstractmethod
+    async def claim_pending_notifications(
+        self,
+        notification_type: str,
+        limit: int,
+        claim_seconds: float,
+        columns: str = NOTIFICATION_COLUMNS
+    ) -> list[dict]:
+        # Pending rows nobody holds, ordered by user_id. Each row is returned to
+        # exactly one caller, and to nobody else until claim_seconds have passed
+        ...
+
+    @abstractmethod
+    async def upsert_notifications(self, rows: list[dict], on_conflict: str) -> list[dict]:
+        # Like upsert_matches, only rows that were actually inserted come back
+        ...
+
+    @abstractmethod
+    async def update_notifications(self, notification_ids: list, values: dict):
+        ...
+
+    # Coordination
+
+    @abstractmethod
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        # Takes or extends ``name`` for ``ttl`` seconds; False while another holder
+        # has it or once it is done. Atomic for every process sharing the backend
+        ...
+
+    @abstractmethod
+    async def release_lease(self, name: str, holder: str):
+        # Only drops the lease while ``holder`` has it and it is not done
+        ...
+
+    @abstractmethod
+    async def complete_lease(self, name: str, holder: str):
+        # A done lease can never be acquired again
+        ...
+
+    @abstractmethod
+    async def list_completed_leases(self, names: Iterable[str]) -> set[str]:
+        ...
+
+    @abstractmethod
+    async def delete_leases(self, prefix: str, keep: str):
+        # Leases named ``prefix``..., except the ones named ``keep``...
+        ...
+
+    @abstractmethod
+    async def get_state(self, key: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def set_state(self, key: str, value: dict):
+        ...
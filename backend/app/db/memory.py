@@ -0,0 +1,306 @@
+import json
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from app.db.base import JOB_COLUMNS, MATCH_COLUMNS, NOTIFICATION_COLUMNS, NOTIFICATION_TYPES, RESUME_COLUMNS, Repository
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _project(row: dict, columns: str) -> dict:
+    if columns == "*":
+        return dict(row)
+    return {column: row.get(column) for column in columns.split(",")}
+
+
+class MemoryRepository(Repository):
+    """In-process backend over plain dicts, for tests, benchmarks and load tests.
+
+    Lookups the routers and workers make by something other than the id
+    (resumes by hash, matches by resume, notifications by user, type, status or
+    read state) go through secondary indexes, so nothing scans a whole table.
+    Nothing persists beyond the process.
+    """
+
+    def __init__(self):
+        self.resumes: dict[str, dict] = {}
+        self.jobs: dict[str, dict] = {}
+        self.matches: dict[str, dict] = {}
+        self.notifications: dict[str, dict] = {}
+        self.files: dict[str, bytes] = {}
+        self._resumes_by_hash: dict[str, str] = {}
+        self._resumes_by_user: dict[str, list[str]] = defaultdict(list)
+        self._matches_by_resume: dict[str, list[str]] = defaultdict(list)
+        self._matches_by_user: dict[str, list[str]] = defaultdict(list)
+        self._notifications_by_user: dict[tuple, list[str]] = defaultdict(list)
+        self._unread: dict[tuple, set[str]] = defaultdict(set)
+        self._pending: dict[str, set[str]] = defaultdict(set)
+        self._unique_keys: dict[tuple, str] = {}
+        self.leases: dict[str, dict] = {}
+        self.state: dict[str, str] = {}
+
+    def _new_row(self, row: dict) -> dict:
+        now = _now()
+        row = {"created_at": now, **row, "updated_at": now}
+        row['id'] = str(row.get('id') or uuid.uuid4())
+        return row
+
+    # Resumes
+
+    async def get_resume(self, resume_id: str, user_id: str, columns: str = RESUME_COLUMNS) -> Optional[dict]:
+        row = self.resumes.get(str(resume_id))
+        if row is None or str(row['user_id']) != str(user_id):
+            return None
+        return _project(row, columns)
+
+    async def list_resumes(
+        self,
+        columns: str = RESUME_COLUMNS,
+        updated_since: Optional[str] = None,
+        id_range: Optional[tuple[Optional[str], Optional[str]]] = None
+    ) -> list[dict]:
+        low, high = id_range or (None, None)
+        return [
+            _project(row, columns) for row in self.resumes.values()
+            if (updated_since is None or row['updated_at'] > updated_since)
+            and (low is None or row['id'] >= low) and (high is None or row['id'] < high)
+        ]
+
+    async def list_user_resumes(self, user_id: str, columns: str = "id,filename,created_at", limit: Optional[int] = None) -> list[dict]:
+        return self._newest(self.resumes, self._resumes_by_user.get(str(user_id), ()), columns, limit)
+
+    async def find_resume_by_hash(self, content_hash: str, columns: str = RESUME_COLUMNS) -> Optional[dict]:
+        resume_id = self._resumes_by_hash.get(content_hash)
+        return _project(self.resumes[resume_id], columns) if resume_id else None
+
+    async def list_resumes_needing_features(
+        self, version: int, limit: int, columns: str = "id,user_id,filename", after_id: Optional[str] = None
+    ) -> list[dict]:
+        rows = sorted(
+            (
+                row for row in self.resumes.values()
+                if (row.get('features_version') or 0) < version and (after_id is None or str(row['id']) > after_id)
+            ),
+            key=lambda row: row['id']
+        )
+        return [_project(row, columns) for row in rows[:limit]]
+
+    async def insert_resumes(self, rows: list[dict]) -> list[dict]:
+        inserted = []
+        for row in rows:
+            row = self._new_row(row)
+            self.resumes[row['id']] = row
+            self._resumes_by_user[str(row['user_id'])].append(row['id'])
+            # The first resume with a hash is the one lookups return
+            if row.get('content_hash'):
+                self._resumes_by_hash.setdefault(row['content_hash'], row['id'])
+            inserted.append(dict(row))
+        return inserted
+
+    async def update_resume(self, resume_id: str, values: dict):
+        self.resumes[str(resume_id)].update(values, updated_at=_now())
+
+    async def upload_resume_file(self, path: str, content: bytes, content_type: str = "application/pdf"):
+        self.files[path] = content
+
+    async def download_resume_file(self, path: str) -> bytes:
+        if path not in self.files:
+            raise FileNotFoundError(path)
+        return self.files[path]
+
+    # Jobs
+
+    async def list_jobs(self, columns: str = JOB_COLUMNS, updated_since: Optional[str] = None) -> list[dict]:
+        return [
+            _project(row, columns) for row in self.jobs.values()
+            if updated_since is None or row['updated_at'] > updated_since
+        ]
+
+    async def get_jobs_by_ids(self, job_ids: Iterable[str], columns: str = JOB_COLUMNS) -> list[dict]:
+        return [_project(self.jobs[job_id], columns) for job_id in dict.fromkeys(map(str, job_ids)) if job_id in self.jobs]
+
+    async def insert_jobs(self, rows: list[dict]) -> list[dict]:
+        inserted = []
+        for row in rows:
+            row = self._new_row(row)
+            self.jobs[row['id']] = row
+            inserted.append(dict(row))
+        return inserted
+
+    # Matches
+
+    async def list_matches(self, columns: str = MATCH_COLUMNS, resume_ids: Optional[Iterable[str]] = None) -> list[dict]:
+        if resume_ids is None:
+            return [_project(row, columns) for row in self.matches.values()]
+        return [
+            _project(self.matches[match_id], columns)
+            for resume_id in dict.fromkeys(map(str, resume_ids))
+            for match_id in self._matches_by_resume.get(resume_id, ())
+        ]
+
+    async def list_user_matches(self, user_id: str, columns: str = MATCH_COLUMNS, limit: Optional[int] = None) -> list[dict]:
+        return self._newest(self.matches, self._matches_by_user.get(str(user_id), ()), columns, limit)
+
+    async def count_user_matches(self, user_id: str) -> int:
+        return len(self._matches_by_user.get(str(user_id), ()))
+
+    async def get_matches_by_ids(self, match_ids: Iterable[str], columns: str = MATCH_COLUMNS) -> list[dict]:
+        return [_project(self.matches[match_id], columns) for match_id in dict.fromkeys(map(str, match_ids)) if match_id in self.matches]
+
+    async def upsert_matches(self, rows: list[dict], on_conflict: str) -> list[dict]:
+        inserted = self._insert_ignoring_duplicates("matches", self.matches, rows, on_conflict)
+        for row in inserted:
+            self._matches_by_resume[str(row['resume_id'])].append(row['id'])
+            self._matches_by_user[str(row['user_id'])].append(row['id'])
+        return inserted
+
+    # Notifications
+
+    async def list_notifications(
+        self,
+        user_id: str,
+        notification_type: Optional[str],
+        columns: str = NOTIFICATION_COLUMNS,
+        limit: Optional[int] = None,
+        before: Optional[tuple[str, str]] = None
+    ) -> list[dict]:
+        types = NOTIFICATION_TYPES if notification_type is None else (notification_type,)
+        ids = [i for kind in types for i in self._notifications_by_user.get((str(user_id), kind), ())]
+        rows = sorted((self.notifications[i] for i in ids), key=lambda row: (row['created_at'], row['id']), reverse=True)
+        if before is not None:
+            rows = [row for row in rows if (row['created_at'], row['id']) < tuple(before)]
+        return [_project(row, columns) for row in rows[:limit]]
+
+    async def list_notifications_since(
+        self,
+        notification_type: str,
+        since: str,
+        user_ids: Iterable[str],
+        columns: str = NOTIFICATION_COLUMNS
+    ) -> list[dict]:
+        rows = sorted(
+            (
+                row
+                for user_id in set(map(str, user_ids))
+                for row in map(self.notifications.get, self._notifications_by_user.get((user_id, notification_type), ()))
+                if row['created_at'] >= since
+            ),
+            key=lambda row: (row['created_at'], row['id'])
+        )
+        return [_project(row, columns) for row in rows]
+
+    async def count_unread_notifications(self, user_id: str, notification_type: str) -> int:
+        return len(self._unread.get((str(user_id), notification_type), ()))
+
+    async def mark_notifications_read(self, user_id: str, notification_type: str, notification_ids: Optional[list] = None):
+        unread = self._unread.get((str(user_id), notification_type))
+        if not unread:
+            return
+        ids = set(unread) if notification_ids is None else unread & set(map(str, notification_ids))
+        now = _now()
+        for notification_id in ids:
+            self.notifications[notification_id].update(read_at=now, updated_at=now)
+        unread -= ids
+
+    async def list_pending_notifications(self, notification_type: str, limit: int, columns: str = NOTIFICATION_COLUMNS) -> list[dict]:
+        rows = sorted((self.notifications[i] for i in self._pending[notification_type]), key=lambda row: str(row['user_id']))
+        return [_project(row, columns) for row in rows[:limit]]
+
+    async def claim_pending_notifications(
+        self,
+        notification_type: str,
+        limit: int,
+        claim_seconds: float,
+        columns: str = NOTIFICATION_COLUMNS
+    ) -> list[dict]:
+        now = datetime.now(timezone.utc)
+        claimed_until = (now + timedelta(seconds=claim_seconds)).isoformat()
+        rows = sorted(
+            (
+                row for row in map(self.notifications.get, self._pending[notification_type])
+                if row['claimed_until'] is None or row['claimed_until'] < now.isoformat()
+            ),
+            key=lambda row: str(row['user_id'])
+        )[:limit]
+        for row in rows:
+            row['claimed_until'] = claimed_until
+        return [_project(row, columns) for row in rows]
+
+    async def upsert_notifications(self, rows: list[dict], on_conflict: str) -> list[dict]:
+        rows = [{"status": "pending", "read_at": None, "claimed_until": None, **row} for row in rows]
+        inserted = self._insert_ignoring_duplicates("notifications", self.notifications, rows, on_conflict)
+        for row in inserted:
+            key = (str(row['user_id']), row['type'])
+            self._notifications_by_user[key].append(row['id'])
+            if row['read_at'] is None:
+                self._unread[key].add(row['id'])
+            if row['status'] == "pending":
+                self._pending[row['type']].add(row['id'])
+        return inserted
+
+    async def update_notifications(self, notification_ids: list, values: dict):
+        for notification_id in map(str, notification_ids):
+            row = self.notifications.get(notification_id)
+            if row is None:
+                continue
+            row.update(values)
+            if row['status'] == "pending":
+                self._pending[row['type']].add(notification_id)
+            else:
+                self._pending[row['type']].discard(notification_id)
+
+    @staticmethod
+    def _newest(table: dict, ids: Iterable[str], columns: str, limit: Optional[int]) -> list[dict]:
+        rows = sorted((table[i] for i in ids), key=lambda row: (row['created_at'], row['id']), reverse=True)
+        return [_project(row, columns) for row in rows[:limit]]
+
+    def _insert_ignoring_duplicates(self, table_name: str, table: dict, rows: list[dict], on_conflict: str) -> list[dict]:
+        columns = on_conflict.split(",")
+        inserted = []
+        for row in rows:
+            key = (table_name, on_conflict, *(str(row[column]) for column in columns))
+            if key in self._unique_keys:
+                continue
+            row = self._new_row(row)
+            table[row['id']] = row
+            self._unique_keys[key] = row['id']
+            inserted.append(dict(row))
+        return inserted
+
+    # Coordination
+
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        now = datetime.now(timezone.utc)
+        lease = self.leases.get(name)
+        if lease is not None and (lease['done'] or (lease['holder'] != holder and lease['expires_at'] >= now.isoformat())):
+            return False
+        self.leases[name] = {"holder": holder, "expires_at": (now + timedelta(seconds=ttl)).isoformat(), "done": False}
+        return True
+
+    async def release_lease(self, name: str, holder: str):
+        lease = self.leases.get(name)
+        if lease is not None and lease['holder'] == holder and not lease['done']:
+            del self.leases[name]
+
+    async def complete_lease(self, name: str, holder: str):
+        lease = self.leases.get(name)
+        if lease is not None and lease['holder'] == holder:
+            lease['done'] = True
+
+    async def list_completed_leases(self, names: Iterable[str]) -> set[str]:
+        return {name for name in names if name in self.leases and self.leases[name]['done']}
+
+    async def delete_leases(self, prefix: str, keep: str):
+        for name in [name for name in self.leases if name.startswith(prefix) and not name.startswith(keep)]:
+            del self.leases[name]
+
+    async def get_state(self, key: str) -> Optional[dict]:
+        # Kept serialized, like the other backends, so callers never share a mutable value
+        value = self.state.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def set_state(self, key: str, value: dict):
+        self.state[key] = json.dumps(value)
@@ -0,0 +1,402 @@
+import asyncio
+import functools
+import inspect
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+import httpx
+from app.core.config import settings
+from app.core.metrics import DB_SECONDS
+from app.db.base import JOB_COLUMNS, MATCH_COLUMNS, NOTIFICATION_COLUMNS, RESUME_COLUMNS, Repository
+
+# Ids per request for "in" filters, keeping URLs well under server limits
+_IN_CHUNK = 200
+
+
+def eq(value) -> str:
+    return f"eq.{value}"
+
+
+def gt(value) -> str:
+    return f"gt.{value}"
+
+
+def gte(value) -> str:
+    return f"gte.{value}"
+
+
+def lt(value) -> str:
+    return f"lt.{value}"
+
+
+def is_null() -> str:
+    return "is.null"
+
+
+def in_(values: Iterable) -> str:
+    return f"in.({','.join(str(value) for value in values)})"
+
+
+def quoted(value) -> str:
+    # For values inside in.() lists and logic trees that may hold reserved characters (",.:()")
+    return '"' + str(value).replace('"', '\\"') + '"'
+
+
+def _chunks(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class SupabaseRepository(Repository):
+    """Supabase backend over one pooled async HTTP client.
+
+    Talks to Supabase's PostgREST and Storage APIs directly, so requests share
+    keep-alive connections and never block the event loop.
+    """
+
+    def __init__(self, url: str, key: str):
+        self._client = httpx.AsyncClient(
+            base_url=url,
+            headers={"apikey": key, "Authorization": f"Bearer {key}"},
+            limits=httpx.Limits(
+                max_connections=settings.db_max_connections,
+                max_keepalive_connections=settings.db_max_connections,
+            ),
+            timeout=settings.db_timeout_seconds,
+        )
+
+    async def close(self):
+        await self._client.aclose()
+
+    # PostgREST primitives
+
+    async def _select(
+        self,
+        table: str,
+        columns: str,
+        filters: Optional[dict] = None,
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> list[dict]:
+        params = {"select": columns, **(filters or {})}
+        if order:
+            params["order"] = order
+        if limit is not None:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        response = await self._client.get(f"/rest/v1/{table}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _select_all(self, table: str, columns: str, filters: Optional[dict] = None) -> list[dict]:
+        # PostgREST caps rows per response, so read in stable pages ordered by id
+        page_size = settings.db_page_size
+        rows = []
+        while True:
+            page = await self._select(table, columns, filters, order="id", limit=page_size, offset=len(rows))
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+
+    async def _select_in(self, table: str, columns: str, column: str, values: Iterable, filters: Optional[dict] = None) -> list[dict]:
+        # Independent chunks are fetched concurrently over the shared pool
+        values = list(dict.fromkeys(str(value) for value in values))
+        pages = await asyncio.gather(*(
+            self._select_all(table, columns, {**(filters or {}), column: in_(chunk)})
+            for chunk in _chunks(values, _IN_CHUNK)
+        ))
+        return [row for page in pages for row in page]
+
+    async def _insert(
+        self,
+        table: str,
+        rows: list[dict],
+        on_conflict: Optional[str] = None,
+        ignore_duplicates: bool = False
+    ) -> list[dict]:
+        prefer = ["return=representation"]
+        params = {}
+        if on_conflict:
+            params["on_conflict"] = on_conflict
+            prefer.append("resolution=ignore-duplicates" if ignore_duplicates else "resolution=merge-duplicates")
+        response = await self._client.post(
+            f"/rest/v1/{table}", json=rows, params=params, headers={"Prefer": ",".join(prefer)}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _count(self, table: str, filters: dict) -> int:
+        # Only the total from Content-Range ("*/42"), no rows
+        response = await self._client.head(
+            f"/rest/v1/{table}", params={"select": "id", **filters}, headers={"Prefer": "count=exact"}
+        )
+        response.raise_for_status()
+        return int(response.headers["content-range"].rsplit("/", 1)[1])
+
+    async def _update(self, table: str, values: dict, filters: dict, columns: Optional[str] = None) -> list[dict]:
+        # With ``columns``, the updated rows come back
+        params = filters if columns is None else {**filters, "select": columns}
+        response = await self._client.patch(
+            f"/rest/v1/{table}", json=values, params=params,
+            headers={"Prefer": "return=minimal" if columns is None else "return=representation"}
+        )
+        response.raise_for_status()
+        return [] if columns is None else response.json()
+
+    async def _delete(self, table: str, filters: dict):
+        response = await self._client.delete(f"/rest/v1/{table}", params=filters, headers={"Prefer": "return=minimal"})
+        response.raise_for_status()
+
+    # Resumes
+
+    async def get_resume(self, resume_id: str, user_id: str, columns: str = RESUME_COLUMNS) -> Optional[dict]:
+        rows = await self._select("resumes", columns, {"id": eq(resume_id), "user_id": eq(user_id)}, limit=1)
+        return rows[0] if rows else None
+
+    async def list_resumes(
+        self,
+        columns: str = RESUME_COLUMNS,
+        updated_since: Optional[str] = None,
+        id_range: Optional[tuple[Optional[str], Optional[str]]] = None
+    ) -> list[dict]:
+        filters = {"updated_at": gt(updated_since)} if updated_since else {}
+        low, high = id_range or (None, None)
+        bounds = [f"id.{condition}" for condition in (low and gte(low), high and lt(high)) if condition]
+        if bounds:
+            filters["and"] = f"({','.join(bounds)})"
+        return await self._select_all("resumes", columns, filters)
+
+    async def list_user_resumes(self, user_id: str, columns: str = "id,filename,created_at", limit: Optional[int] = None) -> list[dict]:
+        return await self._select("resumes", columns, {"user_id": eq(user_id)}, order="created_at.desc,id.desc", limit=limit)
+
+    async def find_resume_by_hash(self, content_hash: str, columns: str = RESUME_COLUMNS) -> Optional[dict]:
+        rows = await self._select("resumes", columns, {"content_hash": eq(content_hash)}, order="created_at", limit=1)
+        return rows[0] if rows else None
+
+    async def list_resumes_needing_features(
+        self, version: int, limit: int, columns: str = "id,user_id,filename", after_id: Optional[str] = None
+    ) -> list[dict]:
+        params = {"or": f"(features_version.is.null,features_version.{lt(version)})"}
+        if after_id is not None:
+            params["id"] = gt(after_id)
+        return await self._select("resumes", columns, params, order="id", limit=limit)
+
+    async def insert_resumes(self, rows: list[dict]) -> list[dict]:
+        return await self._insert("resumes", rows)
+
+    async def update_resume(self, resume_id: str, values: dict):
+        await self._update("resumes", values, {"id": eq(resume_id)})
+
+    async def upload_resume_file(self, path: str, content: bytes, content_type: str = "application/pdf"):
+        response = await self._client.post(
+            f"/storage/v1/object/resumes/{path}", content=content, headers={"Content-Type": content_type}
+        )
+        response.raise_for_status()
+
+    async def download_resume_file(self, path: str) -> bytes:
+        response = await self._client.get(f"/storage/v1/object/resumes/{path}")
+        response.raise_for_status()
+        return response.content
+
+    # Jobs
+
+    async def list_jobs(self, columns: str = JOB_COLUMNS, updated_since: Optional[str] = None) -> list[dict]:
+        filters = {"updated_at": gt(updated_since)} if updated_since else None
+        return await self._select_all("jobs", columns, filters)
+
+    async def get_jobs_by_ids(self, job_ids: Iterable[str], columns: str = JOB_COLUMNS) -> list[dict]:
+        return await self._select_in("jobs", columns, "id", job_ids)
+
+    async def insert_jobs(self, rows: list[dict]) -> list[dict]:
+        return await self._insert("jobs", rows)
+
+    # Matches
+
+    async def list_matches(self, columns: str = MATCH_COLUMNS, resume_ids: Optional[Iterable[str]] = None) -> list[dict]:
+        if resume_ids is None:
+            return await self._select_all("matches", columns)
+        return await self._select_in("matches", columns, "resume_id", resume_ids)
+
+    async def list_user_matches(self, user_id: str, columns: str = MATCH_COLUMNS, limit: Optional[int] = None) -> list[dict]:
+        return await self._select("matches", columns, {"user_id": eq(user_id)}, order="created_at.desc,id.desc", limit=limit)
+
+    async def count_user_matches(self, user_id: str) -> int:
+        return await self._count("matches", {"user_id": eq(user_id)})
+
+    async def get_matches_by_ids(self, match_ids: Iterable[str], columns: str = MATCH_COLUMNS) -> list[dict]:
+        return await self._select_in("matches", columns, "id", match_ids)
+
+    async def upsert_matches(self, rows: list[dict], on_conflict: str) -> list[dict]:
+        # Only rows that were actually inserted come back
+        return await self._insert("matches", rows, on_conflict=on_conflict, ignore_duplicates=True)
+
+    # Notifications
+
+    async def list_notifications(
+        self,
+        user_id: str,
+        notification_type: Optional[str],
+        columns: str = NOTIFICATION_COLUMNS,
+        limit: Optional[int] = None,
+        before: Optional[tuple[str, str]] = None
+    ) -> list[dict]:
+        filters = {"user_id": eq(user_id)}
+        if notification_type is not None:
+            filters["type"] = eq(notification_type)
+        if before is not None:
+            created_at, notification_id = before
+            # Quoted, as timestamps contain characters PostgREST's logic trees reserve
+            filters["or"] = f'(created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{notification_id}))'
+        return await self._select("notifications", columns, filters, order="created_at.desc,id.desc", limit=limit)
+
+    async def list_notifications_since(
+        self,
+        notification_type: str,
+        since: str,
+        user_ids: Iterable[str],
+        columns: str = NOTIFICATION_COLUMNS
+    ) -> list[dict]:
+        # Paged, so a burst larger than PostgREST's row cap is not cut short
+        rows = await self._select_in(
+            "notifications", columns, "user_id", user_ids, {"type": eq(notification_type), "created_at": gte(since)}
+        )
+        return sorted(rows, key=lambda row: (row['created_at'], str(row['id'])))
+
+    async def count_unread_notifications(self, user_id: str, notification_type: str) -> int:
+        return await self._count("notifications", {"user_id": eq(user_id), "type": eq(notification_type), "read_at": is_null()})
+
+    async def mark_notifications_read(self, user_id: str, notification_type: str, notification_ids: Optional[list] = None):
+        values = {"read_at": datetime.now(timezone.utc).isoformat()}
+        filters = {"user_id": eq(user_id), "type": eq(notification_type), "read_at": is_null()}
+        if notification_ids is None:
+            await self._update("notifications", values, filters)
+            return
+        await asyncio.gather(*(
+            self._update("notifications", values, {**filters, "id": in_(chunk)})
+            for chunk in _chunks([str(notification_id) for notification_id in notification_ids], _IN_CHUNK)
+        ))
+
+    async def list_pending_notifications(self, notification_type: str, limit: int, columns: str = NOTIFICATION_COLUMNS) -> list[dict]:
+        return await self._select(
+            "notifications", columns, {"type": eq(notification_type), "status": eq("pending")}, order="user_id", limit=limit
+        )
+
+    async def claim_pending_notifications(
+        self,
+        notification_type: str,
+        limit: int,
+        claim_seconds: float,
+        columns: str = NOTIFICATION_COLUMNS
+    ) -> list[dict]:
+        now = datetime.now(timezone.utc)
+        claimable = {"type": eq(notification_type), "status": eq("pending")}
+        unclaimed = f'(claimed_until.is.null,claimed_until.lt."{now.isoformat()}")'
+        candidates = await self._select("notifications", "id", {**claimable, "or": unclaimed}, order="user_id", limit=limit)
+        # The update re-checks the claim per row, so a row another worker took in
+        # between is not returned here
+        values = {"claimed_until": (now + timedelta(seconds=claim_seconds)).isoformat()}
+        pages = await asyncio.gather(*(
+            self._update("notifications", values, {**claimable, "or": unclaimed, "id": in_(chunk)}, columns=columns)
+            for chunk in _chunks([row['id'] for row in candidates], _IN_CHUNK)
+        ))
+        return sorted((row for page in pages for row in page), key=lambda row: str(row.get('user_id')))
+
+    async def upsert_notifications(self, rows: list[dict], on_conflict: str) -> list[dict]:
+        return await self._insert("notifications", rows, on_conflict=on_conflict, ignore_duplicates=True)
+
+    async def update_notifications(self, notification_ids: list, values: dict):
+        await asyncio.gather(*(
+            self._update("notifications", values, {"id": in_(chunk)})
+            for chunk in _chunks(list(notification_ids), _IN_CHUNK)
+        ))
+
+
+    # Coordination
+
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        now = datetime.now(timezone.utc)
+        lease = {"holder": holder, "expires_at": (now + timedelta(seconds=ttl)).isoformat()}
+        # A new lease is an insert. An existing one is taken over by an update
+        # whose filter Postgres re-checks per row under its lock, so of two
+        # workers racing for an expired lease only one gets the row back
+        if await self._insert("leases", [{"name": name, **lease}], on_conflict="name", ignore_duplicates=True):
+            return True
+        taken = f"(holder.eq.{quoted(holder)},expires_at.lt.{quoted(now.isoformat())})"
+        return bool(await self._update("leases", lease, {"name": eq(name), "done": eq("false"), "or": taken}, columns="name"))
+
+    async def release_lease(self, name: str, holder: str):
+        await self._delete("leases", {"name": eq(name), "holder": eq(holder), "done": eq("false")})
+
+    async def complete_lease(self, name: str, holder: str):
+        await self._update("leases", {"done": True}, {"name": eq(name), "holder": eq(holder)})
+
+    async def list_completed_leases(self, names: Iterable[str]) -> set[str]:
+        names = list(dict.fromkeys(names))
+        pages = await asyncio.gather(*(
+            self._select("leases", "name", {"done": eq("true"), "name": f"in.({','.join(map(quoted, chunk))})"})
+            for chunk in _chunks(names, _IN_CHUNK)
+        ))
+        return {row['name'] for page in pages for row in page}
+
+    async def delete_leases(self, prefix: str, keep: str):
+        await self._delete("leases", {"and": f"(name.like.{quoted(prefix + '*')},name.not.like.{quoted(keep + '*')})"})
+
+    async def get_state(self, key: str) -> Optional[dict]:
+        rows = await self._select("worker_state", "value", {"key": eq(key)}, limit=1)
+        return rows[0]['value'] if rows else None
+
+    async def set_state(self, key: str, value: dict):
+        await self._insert("worker_state", [{"key": key, "value": value}], on_conflict="key")
+
+
+_repository: Optional[Repository] = None
+
+
+def _time_calls(method, operation: str):
+    @functools.wraps(method)
+    async def call(*args, **kwargs):
+        with DB_SECONDS.time(operation=operation):
+            return await method(*args, **kwargs)
+    return call
+
+
+def _timed(repository: Repository) -> Repository:
+    # Every public coroutine of the backend is recorded as a round trip named
+    # after the repository method
+    for name, method in inspect.getmembers(repository, inspect.iscoroutinefunction):
+        if not name.startswith("_") and name != "close":
+            setattr(repository, name, _time_calls(method, name))
+    return repository
+
+
+def create_repository(backend: Optional[str] = None) -> Repository:
+    """The storage backend named by ``backend`` (default: the storage_backend setting)."""
+    backend = backend or settings.storage_backend
+    if backend == "supabase":
+        if not (settings.supabase_url and settings.supabase_service_role_key):
+            raise RuntimeError("storage_backend=supabase needs SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY")
+        return _timed(SupabaseRepository(settings.supabase_url, settings.supabase_service_role_key))
+    if backend == "sqlite":
+        from app.db.sqlite import SQLiteRepository
+        return _timed(SQLiteRepository(settings.sqlite_path or os.path.join(settings.data_dir, "app.db")))
+    if backend == "memory":
+        from app.db.memory import MemoryRepository
+        return _timed(MemoryRepository())
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_repository() -> Repository:
+    # Created on first use, so importing a router does not open connections
+    global _repository
+    if _repository is None:
+        _repository = create_repository()
+    return _repository
+
+
+async def close_repository():
+    global _repository
+    if _repository is not None:
+        await _repository.close()
+        _repository = None
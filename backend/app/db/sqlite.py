@@ -0,0 +1,509 @@
+import asyncio
+import json
+import os
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from app.db.base import JOB_COLUMNS, MATCH_COLUMNS, NOTIFICATION_COLUMNS, RESUME_COLUMNS, Repository
+
+# Same tables and unique constraints as the Supabase schema, with indexes for
+# every lookup the repository makes
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    text_content TEXT NOT NULL,
+    content_hash TEXT,
+    experience_years INTEGER,
+    education_level TEXT,
+    features_version INTEGER,
+    skill_text TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resumes_user_id_idx ON resumes (user_id);
+CREATE INDEX IF NOT EXISTS resumes_content_hash_idx ON resumes (content_hash, created_at);
+CREATE INDEX IF NOT EXISTS resumes_updated_at_idx ON resumes (updated_at);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    skills TEXT,
+    experience_years INTEGER,
+    education_level TEXT,
+    location TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_updated_at_idx ON jobs (updated_at);
+
+CREATE TABLE IF NOT EXISTS matches (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    resume_id TEXT NOT NULL REFERENCES resumes (id) ON DELETE CASCADE,
+    job_id TEXT NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    score REAL NOT NULL,
+    top_terms TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (user_id, resume_id, job_id)
+);
+CREATE INDEX IF NOT EXISTS matches_resume_id_idx ON matches (resume_id);
+CREATE INDEX IF NOT EXISTS matches_user_idx ON matches (user_id, created_at);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    match_id TEXT NOT NULL REFERENCES matches (id) ON DELETE CASCADE,
+    type TEXT NOT NULL CHECK (type IN ('email', 'in_app')),
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'sent', 'failed')),
+    sent_at TEXT,
+    read_at TEXT,
+    claimed_until TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (match_id, type)
+);
+CREATE INDEX IF NOT EXISTS notifications_user_idx ON notifications (user_id, type, created_at);
+CREATE INDEX IF NOT EXISTS notifications_pending_idx ON notifications (type, status, user_id);
+CREATE INDEX IF NOT EXISTS notifications_created_at_idx ON notifications (type, created_at);
+
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    content BLOB NOT NULL,
+    content_type TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS worker_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Columns added since the first version of SCHEMA, added to older files on
+# open, and the indexes that need them
+_ADDED_COLUMNS = {"resumes": {"skill_text": "TEXT"}, "notifications": {"read_at": "TEXT", "claimed_until": "TEXT"}}
+_ADDED_INDEXES = """
+CREATE INDEX IF NOT EXISTS notifications_unread_idx ON notifications (user_id, type) WHERE read_at IS NULL;
+CREATE INDEX IF NOT EXISTS notifications_all_idx ON notifications (user_id, created_at, id);
+"""
+
+# Array columns, stored as JSON text
+_JSON_COLUMNS = {"skills", "top_terms"}
+
+# Ids per statement for "in" filters, under SQLite's bound parameter limit
+_IN_CHUNK = 500
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _chunks(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class SQLiteRepository(Repository):
+    """Local backend on a single SQLite file (or ``:memory:``).
+
+    All statements run on one dedicated thread that owns the connection, so the
+    event loop never blocks and writes are serialized the way SQLite wants.
+    Bulk inserts are one ``executemany`` per chunk inside a single transaction.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._connection = self._executor.submit(self._connect, path).result()
+        self._columns = {
+            table: [row[1] for row in self._connection.execute(f"PRAGMA table_info({table})")]
+            for table in ("resumes", "jobs", "matches", "notifications")
+        }
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        connection.executescript(SCHEMA)
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in columns.items():
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        connection.executescript(_ADDED_INDEXES)
+        return connection
+
+    async def close(self):
+        await self._run(self._connection.close)
+        self._executor.shutdown()
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    # SQL primitives
+
+    def _column_list(self, table: str, columns: str) -> str:
+        names = self._columns[table] if columns == "*" else columns.split(",")
+        unknown = set(names) - set(self._columns[table])
+        if unknown:
+            raise ValueError(f"Unknown columns for {table}: {', '.join(sorted(unknown))}")
+        return ", ".join(names)
+
+    @staticmethod
+    def _decode(row) -> dict:
+        data = dict(row)
+        for column in _JSON_COLUMNS & data.keys():
+            if data[column] is not None:
+                data[column] = json.loads(data[column])
+        return data
+
+    @staticmethod
+    def _encode(row: dict) -> dict:
+        now = _now()
+        row = {"id": str(uuid.uuid4()), "created_at": now, **row, "updated_at": now}
+        for column in _JSON_COLUMNS & row.keys():
+            if row[column] is not None:
+                row[column] = json.dumps(row[column])
+        # Ids may arrive as UUID objects; they are stored and compared as text
+        return {key: str(value) if key.endswith("id") and value is not None else value for key, value in row.items()}
+
+    async def _select(self, table: str, columns: str, where: str = "", params: tuple = (), suffix: str = "") -> list[dict]:
+        sql = f"SELECT {self._column_list(table, columns)} FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        if suffix:
+            sql += f" {suffix}"
+
+        def query():
+            return [self._decode(row) for row in self._connection.execute(sql, params)]
+        return await self._run(query)
+
+    async def _select_in(self, table: str, columns: str, column: str, values: Iterable) -> list[dict]:
+        values = list(dict.fromkeys(str(value) for value in values))
+        column_list = self._column_list(table, columns)
+
+        def query():
+            rows = []
+            for chunk in _chunks(values, _IN_CHUNK):
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._connection.execute(f"SELECT {column_list} FROM {table} WHERE {column} IN ({placeholders})", chunk))
+            return [self._decode(row) for row in rows]
+        return await self._run(query)
+
+    async def _insert(self, table: str, rows: list[dict], on_conflict: Optional[str] = None) -> list[dict]:
+        """Insert ``rows``, skipping ones that conflict on ``on_conflict`` when given;
+        returns the rows actually inserted."""
+        encoded = [self._encode(row) for row in rows]
+        conflict = f" ON CONFLICT ({self._column_list(table, on_conflict)}) DO NOTHING" if on_conflict else ""
+
+        def write():
+            inserted = []
+            with self._connection:
+                # Rows sharing a column set go in one executemany
+                groups: dict[tuple, list[dict]] = {}
+                for row in encoded:
+                    groups.setdefault(tuple(row), []).append(row)
+                for names, group in groups.items():
+                    sql = (
+                        f"INSERT INTO {table} ({self._column_list(table, ','.join(names))}) "
+                        f"VALUES ({','.join('?' * len(names))}){conflict}"
+                    )
+                    before = self._connection.total_changes
+                    self._connection.executemany(sql, [tuple(row[name] for name in names) for row in group])
+                    if self._connection.total_changes - before == len(group):
+                        inserted.extend(row['id'] for row in group)
+                    else:
+                        # Some rows were skipped: keep the ids that made it in
+                        ids = [row['id'] for row in group]
+                        for chunk in _chunks(ids, _IN_CHUNK):
+                            found = {
+                                found_id for (found_id,) in self._connection.execute(
+                                    f"SELECT id FROM {table} WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                                )
+                            }
+                            inserted.extend(row_id for row_id in chunk if row_id in found)
+                by_id = {row['id']: row for row in encoded}
+                return [self._decode(by_id[row_id]) for row_id in inserted]
+        return await self._run(write)
+
+    async def _update(self, table: str, values: dict, where: str, params: tuple):
+        values = self._encode_values(values)
+        assignments = ", ".join(f"{column} = ?" for column in self._column_list(table, ",".join(values)).split(", "))
+
+        def write():
+            with self._connection:
+                self._connection.execute(f"UPDATE {table} SET {assignments} WHERE {where}", (*values.values(), *params))
+        await self._run(write)
+
+    async def _execute(self, sql: str, params: tuple):
+        def write():
+            with self._connection:
+                self._connection.execute(sql, params)
+        await self._run(write)
+
+    @staticmethod
+    def _encode_values(values: dict) -> dict:
+        values = {**values, "updated_at": _now()}
+        for column in _JSON_COLUMNS & values.keys():
+            if values[column] is not None:
+                values[column] = json.dumps(values[column])
+        return values
+
+    # Resumes
+
+    async def get_resume(self, resume_id: str, user_id: str, columns: str = RESUME_COLUMNS) -> Optional[dict]:
+        rows = await self._select("resumes", columns, "id = ? AND user_id = ?", (str(resume_id), str(user_id)))
+        return rows[0] if rows else None
+
+    async def list_resumes(
+        self,
+        columns: str = RESUME_COLUMNS,
+        updated_since: Optional[str] = None,
+        id_range: Optional[tuple[Optional[str], Optional[str]]] = None
+    ) -> list[dict]:
+        low, high = id_range or (None, None)
+        conditions = [
+            (condition, value) for condition, value in
+            (("updated_at > ?", updated_since), ("id >= ?", low), ("id < ?", high)) if value is not None
+        ]
+        return await self._select(
+            "resumes", columns, " AND ".join(condition for condition, _ in conditions), tuple(value for _, value in conditions)
+        )
+
+    async def list_user_resumes(self, user_id: str, columns: str = "id,filename,created_at", limit: Optional[int] = None) -> list[dict]:
+        return await self._select(
+            "resumes", columns, "user_id = ?", (str(user_id), -1 if limit is None else limit), "ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+
+    async def find_resume_by_hash(self, content_hash: str, columns: str = RESUME_COLUMNS) -> Optional[dict]:
+        rows = await self._select("resumes", columns, "content_hash = ?", (content_hash,), "ORDER BY created_at LIMIT 1")
+        return rows[0] if rows else None
+
+    async def list_resumes_needing_features(
+        self, version: int, limit: int, columns: str = "id,user_id,filename", after_id: Optional[str] = None
+    ) -> list[dict]:
+        where, args = "(features_version IS NULL OR features_version < ?)", [version]
+        if after_id is not None:
+            where += " AND id > ?"
+            args.append(str(after_id))
+        return await self._select("resumes", columns, where, (*args, limit), "ORDER BY id LIMIT ?")
+
+    async def insert_resumes(self, rows: list[dict]) -> list[dict]:
+        return await self._insert("resumes", rows)
+
+    async def update_resume(self, resume_id: str, values: dict):
+        await self._update("resumes", values, "id = ?", (str(resume_id),))
+
+    async def upload_resume_file(self, path: str, content: bytes, content_type: str = "application/pdf"):
+        def write():
+            with self._connection:
+                self._connection.execute(
+                    "INSERT INTO files (path, content, content_type) VALUES (?, ?, ?) "
+                    "ON CONFLICT (path) DO UPDATE SET content = excluded.content, content_type = excluded.content_type",
+                    (path, content, content_type)
+                )
+        await self._run(write)
+
+    async def download_resume_file(self, path: str) -> bytes:
+        def read():
+            row = self._connection.execute("SELECT content FROM files WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                raise FileNotFoundError(path)
+            return row[0]
+        return await self._run(read)
+
+    # Jobs
+
+    async def list_jobs(self, columns: str = JOB_COLUMNS, updated_since: Optional[str] = None) -> list[dict]:
+        if updated_since:
+            return await self._select("jobs", columns, "updated_at > ?", (updated_since,))
+        return await self._select("jobs", columns)
+
+    async def get_jobs_by_ids(self, job_ids: Iterable[str], columns: str = JOB_COLUMNS) -> list[dict]:
+        return await self._select_in("jobs", columns, "id", job_ids)
+
+    async def insert_jobs(self, rows: list[dict]) -> list[dict]:
+        return await self._insert("jobs", rows)
+
+    # Matches
+
+    async def list_matches(self, columns: str = MATCH_COLUMNS, resume_ids: Optional[Iterable[str]] = None) -> list[dict]:
+        if resume_ids is None:
+            return await self._select("matches", columns)
+        return await self._select_in("matches", columns, "resume_id", resume_ids)
+
+    async def list_user_matches(self, user_id: str, columns: str = MATCH_COLUMNS, limit: Optional[int] = None) -> list[dict]:
+        return await self._select(
+            "matches", columns, "user_id = ?", (str(user_id), -1 if limit is None else limit), "ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+
+    async def count_user_matches(self, user_id: str) -> int:
+        def query():
+            return self._connection.execute("SELECT COUNT(*) FROM matches WHERE user_id = ?", (str(user_id),)).fetchone()[0]
+        return await self._run(query)
+
+    async def get_matches_by_ids(self, match_ids: Iterable[str], columns: str = MATCH_COLUMNS) -> list[dict]:
+        return await self._select_in("matches", columns, "id", match_ids)
+
+    async def upsert_matches(self, rows: list[dict], on_conflict: str) -> list[dict]:
+        return await self._insert("matches", rows, on_conflict)
+
+    # Notifications
+
+    async def list_notifications(
+        self,
+        user_id: str,
+        notification_type: Optional[str],
+        columns: str = NOTIFICATION_COLUMNS,
+        limit: Optional[int] = None,
+        before: Optional[tuple[str, str]] = None
+    ) -> list[dict]:
+        where, params = "user_id = ?", (str(user_id),)
+        if notification_type is not None:
+            where += " AND type = ?"
+            params += (notification_type,)
+        if before is not None:
+            where += " AND (created_at, id) < (?, ?)"
+            params += tuple(before)
+        return await self._select(
+            "notifications", columns, where, params + (-1 if limit is None else limit,), "ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+
+    async def list_notifications_since(
+        self,
+        notification_type: str,
+        since: str,
+        user_ids: Iterable[str],
+        columns: str = NOTIFICATION_COLUMNS
+    ) -> list[dict]:
+        rows = []
+        for chunk in _chunks(list(dict.fromkeys(map(str, user_ids))), _IN_CHUNK):
+            rows += await self._select(
+                "notifications", columns, f"type = ? AND created_at >= ? AND user_id IN ({','.join('?' * len(chunk))})",
+                (notification_type, since, *chunk)
+            )
+        return sorted(rows, key=lambda row: (row['created_at'], row['id']))
+
+    async def count_unread_notifications(self, user_id: str, notification_type: str) -> int:
+        def query():
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM notifications WHERE user_id = ? AND type = ? AND read_at IS NULL",
+                (str(user_id), notification_type)
+            ).fetchone()[0]
+        return await self._run(query)
+
+    async def mark_notifications_read(self, user_id: str, notification_type: str, notification_ids: Optional[list] = None):
+        values = {"read_at": _now()}
+        where, params = "user_id = ? AND type = ? AND read_at IS NULL", (str(user_id), notification_type)
+        if notification_ids is None:
+            await self._update("notifications", values, where, params)
+            return
+        for chunk in _chunks([str(notification_id) for notification_id in notification_ids], _IN_CHUNK):
+            await self._update("notifications", values, f"{where} AND id IN ({','.join('?' * len(chunk))})", params + tuple(chunk))
+
+    async def list_pending_notifications(self, notification_type: str, limit: int, columns: str = NOTIFICATION_COLUMNS) -> list[dict]:
+        return await self._select(
+            "notifications", columns, "type = ? AND status = 'pending'", (notification_type, limit), "ORDER BY user_id LIMIT ?"
+        )
+
+    async def claim_pending_notifications(
+        self,
+        notification_type: str,
+        limit: int,
+        claim_seconds: float,
+        columns: str = NOTIFICATION_COLUMNS
+    ) -> list[dict]:
+        now = datetime.now(timezone.utc)
+        column_list = self._column_list("notifications", columns)
+
+        def claim():
+            # One statement, so a row is claimed once even by processes sharing the file
+            with self._connection:
+                rows = self._connection.execute(
+                    "UPDATE notifications SET claimed_until = ? WHERE id IN ("
+                    "SELECT id FROM notifications WHERE type = ? AND status = 'pending' "
+                    "AND (claimed_until IS NULL OR claimed_until < ?) ORDER BY user_id LIMIT ?"
+                    f") RETURNING {column_list}",
+                    ((now + timedelta(seconds=claim_seconds)).isoformat(), notification_type, now.isoformat(), limit)
+                ).fetchall()
+            # RETURNING does not keep the subquery's order
+            return sorted((self._decode(row) for row in rows), key=lambda row: str(row.get('user_id')))
+        return await self._run(claim)
+
+    async def upsert_notifications(self, rows: list[dict], on_conflict: str) -> list[dict]:
+        return await self._insert("notifications", rows, on_conflict)
+
+    async def update_notifications(self, notification_ids: list, values: dict):
+        for chunk in _chunks([str(notification_id) for notification_id in notification_ids], _IN_CHUNK):
+            await self._update("notifications", values, f"id IN ({','.join('?' * len(chunk))})", tuple(chunk))
+
+    # Coordination
+
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        now = datetime.now(timezone.utc)
+
+        def acquire():
+            # One upsert whose update re-checks holder and expiry, so processes
+            # sharing the file never both take the same lease
+            with self._connection:
+                self._connection.execute(
+                    "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+                    "WHERE leases.done = 0 AND (leases.holder = excluded.holder OR leases.expires_at < ?)",
+                    (name, holder, (now + timedelta(seconds=ttl)).isoformat(), now.isoformat())
+                )
+                row = self._connection.execute("SELECT holder, done FROM leases WHERE name = ?", (name,)).fetchone()
+            return tuple(row) == (holder, 0)
+        return await self._run(acquire)
+
+    async def release_lease(self, name: str, holder: str):
+        await self._execute("DELETE FROM leases WHERE name = ? AND holder = ? AND done = 0", (name, holder))
+
+    async def complete_lease(self, name: str, holder: str):
+        await self._execute("UPDATE leases SET done = 1 WHERE name = ? AND holder = ?", (name, holder))
+
+    async def list_completed_leases(self, names: Iterable[str]) -> set[str]:
+        names = list(names)
+
+        def query():
+            return {
+                row[0] for chunk in _chunks(names, _IN_CHUNK) for row in self._connection.execute(
+                    f"SELECT name FROM leases WHERE done = 1 AND name IN ({','.join('?' * len(chunk))})", chunk
+                )
+            }
+        return await self._run(query)
+
+    async def delete_leases(self, prefix: str, keep: str):
+        # substr instead of LIKE, so "_" and "%" in names are not wildcards
+        await self._execute(
+            "DELETE FROM leases WHERE substr(name, 1, ?) = ? AND substr(name, 1, ?) != ?",
+            (len(prefix), prefix, len(keep), keep)
+        )
+
+    async def get_state(self, key: str) -> Optional[dict]:
+        def query():
+            return self._connection.execute("SELECT value FROM worker_state WHERE key = ?", (key,)).fetchone()
+        row = await self._run(query)
+        return json.loads(row[0]) if row else None
+
+    async def set_state(self, key: str, value: dict):
+        await self._execute(
+            "INSERT INTO worker_state (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value))
+        )
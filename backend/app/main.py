@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -9,7 +10,16 @@ from app.api.routers.resumes import router as resumes_router
 from app.api.routers.jobs import router as jobs_router
 from app.api.routers.matches import router as matches_router
 from app.api.routers.notifications import router as notifications_router
+from app.api.routers.metrics import router as metrics_router
+from app.api.routers.dashboard import router as dashboard_router
 from app.workers.scheduler import start_scheduler
+from app.workers.match_jobs import match_jobs
+from app.services.warmup import start_warm_up
+from app.core.metrics import HTTP_SECONDS
+from app.db import close_repository
+from app.services.pdf_extract import pdf_pool
+
+API_PREFIX = "/api/v1"
 
 limiter = Limiter(key_func=get_remote_address)
 app = FastAPI(title="Job Matching API", version="0.1.0")
@@ -26,12 +36,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(health_router, prefix="/api/v1")
-app.include_router(resumes_router, prefix="/api/v1", tags=["resumes"])
-app.include_router(jobs_router, prefix="/api/v1", tags=["jobs"])
-app.include_router(matches_router, prefix="/api/v1", tags=["matches"])
-app.include_router(notifications_router, prefix="/api/v1", tags=["notifications"])
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # Labelled by route template, so /resumes/{id} is one series rather than one per id
+    route = request.scope.get("route")
+    HTTP_SECONDS.observe(
+        time.perf_counter() - started,
+        method=request.method,
+        route=API_PREFIX + route.path if route is not None else "unmatched",
+        status=response.status_code
+    )
+    return response
+
+
+app.include_router(health_router, prefix=API_PREFIX)
+app.include_router(metrics_router, prefix=API_PREFIX, tags=["metrics"])
+app.include_router(resumes_router, prefix=API_PREFIX, tags=["resumes"])
+app.include_router(jobs_router, prefix=API_PREFIX, tags=["jobs"])
+app.include_router(matches_router, prefix=API_PREFIX, tags=["matches"])
+app.include_router(notifications_router, prefix=API_PREFIX, tags=["notifications"])
+app.include_router(dashboard_router, prefix=API_PREFIX, tags=["dashboard"])
 
 @app.on_event("startup")
 async def startup_event():
-    start_scheduler()
\ No newline at end of file
+    # Maps the published model and loads the catalog, instead of doing it on first request
+    await start_warm_up()
+    start_scheduler()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    pdf_pool.close()
+    match_jobs.close()
+    await close_repository()
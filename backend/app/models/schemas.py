@@ -72,8 +72,23 @@ class JobResponse(BaseModel):
     created_at: str
 
 
+class JobListItem(BaseModel):
+    # GET /jobs may project a subset of JobResponse fields; unselected ones are left out
+    id: Optional[UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    skills: Optional[List[str]] = None
+    experience_years: Optional[int] = None
+    education_level: Optional[str] = None
+    location: Optional[str] = None
+    created_at: Optional[str] = None
+
+
 class MatchCreate(BaseModel):
     resume_id: UUID
+    # Hard filters: only jobs in this location, scoring at least this much
+    location: Optional[str] = None
+    min_score: Optional[float] = None
 
 
 class MatchResponse(BaseModel):
@@ -81,4 +96,21 @@ class MatchResponse(BaseModel):
     job: JobResponse
     score: float
     top_terms: List[str]
-    created_at: str
\ No newline at end of file
+    created_at: str
+
+class MatchJobResponse(BaseModel):
+    id: UUID
+    resume_id: UUID
+    # queued, running, done or failed
+    status: str
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    # Set once the job is done
+    matches: Optional[List[MatchResponse]] = None
+
+
+class NotificationsRead(BaseModel):
+    # None marks every unread notification as read
+    ids: Optional[List[UUID]] = None
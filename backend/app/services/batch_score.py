@@ -0,0 +1,149 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+import numpy as np
+from app.core.config import settings
+from app.services.vectorize import FittedModel, vectorizer
+from app.services.explain import top_terms
+from app.services.skills import SkillDictionary, blend_skill_scores, resume_skill_text, skill_overlap_scores
+from app.services.match_score import (
+    combine_scores,
+    compute_education_scores,
+    compute_experience_scores,
+    education_rank,
+)
+
+
+class BatchMatch(NamedTuple):
+    resume_row: int
+    job_row: int
+    scores: dict
+
+
+class StructuredFeatures(NamedTuple):
+    experience_years: np.ndarray
+    education_ranks: np.ndarray
+    # Skill bitsets, one row per resume/job; None skips skill matching
+    skill_bits: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_values(cls, experience_years: list, education_levels: list, skill_bits=None) -> "StructuredFeatures":
+        return cls(
+            np.asarray(experience_years, dtype=float),
+            np.asarray([education_rank(level) for level in education_levels], dtype=float),
+            skill_bits,
+        )
+
+    @classmethod
+    def for_jobs(cls, jobs: list[dict], skills: Optional[SkillDictionary] = None) -> "StructuredFeatures":
+        return cls.from_values(
+            [job.get('experience_years') for job in jobs],
+            [job.get('education_level') for job in jobs],
+            skills.encode_jobs(jobs) if skills is not None else None,
+        )
+
+    def take(self, rows) -> "StructuredFeatures":
+        return StructuredFeatures(*(column[rows] if column is not None else None for column in self))
+
+
+def score_matrices(
+    resume_matrix,
+    job_matrix,
+    resume_features: StructuredFeatures,
+    job_features: StructuredFeatures,
+    threshold: Optional[float] = None,
+    top_k: Optional[int] = None,
+    block_size: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> list[BatchMatch]:
+    """Score every resume row against every job row in memory-bounded blocks.
+
+    Only ``block_size x n_jobs`` dense scores exist per worker at any time. Pairs
+    below ``threshold`` are dropped, and ``top_k`` keeps the best jobs per resume.
+    """
+    if resume_matrix.shape[0] == 0 or job_matrix.shape[0] == 0:
+        return []
+    block_size = block_size or settings.rescore_block_size
+    workers = workers or settings.rescore_workers or os.cpu_count() or 1
+    # Transposed once up front so each block product needs no format conversion
+    job_matrix_t = job_matrix.T.tocsr()
+    n_resumes = resume_matrix.shape[0]
+
+    def score_block(start: int) -> list[BatchMatch]:
+        stop = min(start + block_size, n_resumes)
+        skills = (resume_matrix[start:stop] @ job_matrix_t).toarray() * 100
+        if resume_features.skill_bits is not None and job_features.skill_bits is not None:
+            overlap = skill_overlap_scores(resume_features.skill_bits[start:stop], job_features.skill_bits)
+            skills = blend_skill_scores(skills, overlap)
+        experience = compute_experience_scores(resume_features.experience_years[start:stop], job_features.experience_years)
+        education = compute_education_scores(resume_features.education_ranks[start:stop], job_features.education_ranks)
+        overall = skills * 0.5 + experience * 0.3 + education * 0.2
+
+        # Leave a rounding margin here; the exact check happens on the rounded dicts below
+        mask = np.ones(overall.shape, dtype=bool) if threshold is None else overall >= threshold - 0.005
+        if top_k is not None and top_k < overall.shape[1]:
+            keep = np.argpartition(-overall, top_k - 1, axis=1)[:, :top_k]
+            top_mask = np.zeros_like(mask)
+            np.put_along_axis(top_mask, keep, True, axis=1)
+            mask &= top_mask
+
+        matches = []
+        for row, col in zip(*np.nonzero(mask)):
+            scores = combine_scores(float(skills[row, col]), float(experience[row, col]), float(education[row, col]))
+            if threshold is None or scores['overall'] >= threshold:
+                matches.append(BatchMatch(start + int(row), int(col), scores))
+        return matches
+
+    starts = range(0, n_resumes, block_size)
+    if workers == 1 or len(starts) <= 1:
+        blocks = map(score_block, starts)
+        return [match for block in blocks for match in block]
+    # scipy's sparse products and numpy release the GIL, so threads share the
+    # job matrix without copying it into every worker
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [match for block in executor.map(score_block, starts) for match in block]
+
+
+def score_all(
+    resumes: list[dict],
+    jobs: list[dict],
+    resume_experience_years: list,
+    resume_education_levels: list,
+    job_matrix=None,
+    model: Optional[FittedModel] = None,
+    job_features: Optional[StructuredFeatures] = None,
+    skills: Optional[SkillDictionary] = None,
+    threshold: Optional[float] = None,
+    top_k: Optional[int] = None,
+    block_size: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> list[tuple[dict, dict, dict, list[str]]]:
+    # Each text is preprocessed and vectorized exactly once for the whole run;
+    # callers holding a JobIndex snapshot pass its rows as job_matrix, its model,
+    # so resumes land in the same vector space as the jobs, and its feature columns
+    # with the skill dictionary their bitsets were encoded with
+    model = model or vectorizer.model
+    if skills is None:
+        skills = SkillDictionary.from_jobs(jobs)
+    resume_matrix = model.transform_many([resume['text_content'] for resume in resumes])
+    if job_matrix is None:
+        job_matrix = model.transform_many([job['description'] for job in jobs])
+    resume_features = StructuredFeatures.from_values(
+        resume_experience_years, resume_education_levels, skills.encode_texts([resume_skill_text(resume) for resume in resumes])
+    )
+    if job_features is None:
+        job_features = StructuredFeatures.for_jobs(jobs, skills)
+    matches = score_matrices(
+        resume_matrix, job_matrix, resume_features, job_features,
+        threshold=threshold, top_k=top_k, block_size=block_size, workers=workers
+    )
+    # Explanations only for the pairs that survived, in one batched sparse product
+    terms = top_terms(
+        model,
+        resume_matrix[[match.resume_row for match in matches]],
+        job_matrix[[match.job_row for match in matches]],
+    )
+    return [
+        (resumes[match.resume_row], jobs[match.job_row], match.scores, match_terms)
+        for match, match_terms in zip(matches, terms)
+    ]
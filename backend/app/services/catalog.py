@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import json
+import time
+from bisect import bisect_left, bisect_right
+from typing import NamedTuple, Optional
+from app.core.config import settings
+
+
+class CatalogPage(NamedTuple):
+    items: list
+    next_cursor: Optional[str]
+    etag: str
+
+
+class _CatalogState(NamedTuple):
+    jobs: list
+    ids: list
+    digest: str
+    loaded_at: float
+
+
+class JobCatalog:
+    """In-process cache of the jobs table, ordered by id.
+
+    Serves GET /jobs pages and the job list for match computation without going
+    back to the database. create_job invalidates it locally; other workers pick
+    up new postings once their copy is older than catalog_ttl_seconds.
+    """
+
+    def __init__(self):
+        self._state: Optional[_CatalogState] = None
+        self._lock = asyncio.Lock()
+        # Bumped by invalidate; a load that started before the bump is served once but not kept
+        self._generation = 0
+
+    def invalidate(self):
+        self._generation += 1
+        self._state = None
+
+    def _fresh(self, state: Optional[_CatalogState]) -> bool:
+        return state is not None and time.monotonic() - state.loaded_at < settings.catalog_ttl_seconds
+
+    async def _load(self, repo) -> _CatalogState:
+        state = self._state
+        if self._fresh(state):
+            return state
+        # One loader at a time; concurrent callers wait for it instead of all reading the table
+        async with self._lock:
+            state = self._state
+            if self._fresh(state):
+                return state
+            generation = self._generation
+            jobs = sorted(await repo.list_jobs(), key=lambda job: str(job['id']))
+            digest = hashlib.sha1(json.dumps(jobs, sort_keys=True, default=str).encode()).hexdigest()[:16]
+            state = _CatalogState(jobs, [str(job['id']) for job in jobs], digest, time.monotonic())
+            if generation == self._generation:
+                self._state = state
+            return state
+
+    async def get_all(self, repo) -> list[dict]:
+        return (await self._load(repo)).jobs
+
+    async def get_by_ids(self, repo, job_ids) -> dict[str, dict]:
+        """Jobs by id from the cached catalog; ids it does not have yet are read from the table."""
+        state = await self._load(repo)
+        found, missing = {}, []
+        for job_id in dict.fromkeys(map(str, job_ids)):
+            i = bisect_left(state.ids, job_id)
+            if i < len(state.ids) and state.ids[i] == job_id:
+                found[job_id] = state.jobs[i]
+            else:
+                missing.append(job_id)
+        if missing:
+            found.update((str(job['id']), job) for job in await repo.get_jobs_by_ids(missing))
+        return found
+
+    async def page(self, repo, cursor: Optional[str], limit: int, fields: Optional[list[str]] = None) -> CatalogPage:
+        state = await self._load(repo)
+        # Keyset pagination: the cursor is the last id of the previous page
+        start = bisect_right(state.ids, cursor) if cursor else 0
+        jobs = state.jobs[start:start + limit]
+        if fields:
+            jobs = [{field: job.get(field) for field in fields} for job in jobs]
+        next_cursor = state.ids[start + limit - 1] if start + limit < len(state.ids) else None
+
+        query = f"{state.digest}|{cursor}|{limit}|{','.join(fields or [])}"
+        etag = f'W/"{hashlib.sha1(query.encode()).hexdigest()[:20]}"'
+        return CatalogPage(jobs, next_cursor, etag)
+
+
+# Global instance
+job_catalog = JobCatalog()
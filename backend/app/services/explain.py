@@ -0,0 +1,30 @@
+from typing import Optional
+import numpy as np
+import scipy.sparse as sp
+from app.core.config import settings
+from app.services.vectorize import FittedModel
+
+
+def top_terms(model: FittedModel, resume_vectors, job_vectors, n: Optional[int] = None) -> list[list[str]]:
+    """The ``n`` terms contributing most to each match, highest first.
+
+    Row i of ``resume_vectors`` and ``job_vectors`` belong to match i. Each term's
+    contribution to the cosine similarity is the product of its two TF-IDF
+    weights, so one elementwise sparse product covers every match at once.
+    """
+    n = settings.top_terms_count if n is None else n
+    products = sp.csr_matrix(resume_vectors).multiply(job_vectors).tocsr()
+    products.eliminate_zeros()
+    n_rows = products.shape[0]
+    if n <= 0 or products.nnz == 0:
+        return [[] for _ in range(n_rows)]
+
+    # Sort each row's entries by weight, then keep the first n of every row
+    row_lengths = np.diff(products.indptr)
+    row_of = np.repeat(np.arange(n_rows), row_lengths)
+    order = np.lexsort((-products.data, row_of))
+    rank = np.arange(products.nnz) - products.indptr[row_of]
+    terms = model.terms[products.indices[order[rank < n]]].tolist()
+
+    bounds = np.cumsum(np.minimum(row_lengths, n))
+    return [terms[start:stop] for start, stop in zip(np.concatenate(([0], bounds[:-1])), bounds)]
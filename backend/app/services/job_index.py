@@ -0,0 +1,262 @@
+import threading
+from typing import NamedTuple, Optional
+import numpy as np
+import scipy.sparse as sp
+from app.core.config import settings
+from app.services.vectorize import FittedModel, vectorizer
+from app.services.match_score import (
+    combine_scores,
+    compute_education_scores,
+    compute_experience_scores,
+    education_rank,
+)
+from app.services.batch_score import StructuredFeatures
+from app.services.skills import SkillDictionary, blend_skill_scores, skill_overlap_scores
+from app.services.explain import top_terms
+from app.services.retrieval import CandidateIndex, recall_at_k
+
+
+class IndexSnapshot(NamedTuple):
+    # The model that produced the matrix; resumes scored against this snapshot
+    # must be transformed with it, not with whatever model is current
+    model: FittedModel
+    jobs: list
+    positions: dict
+    matrix: sp.csr_matrix
+    # Columns aligned with the matrix rows, for scoring and filtering without
+    # touching the job dicts; features.skill_bits is encoded with ``skills``
+    features: StructuredFeatures
+    locations: np.ndarray
+    skills: SkillDictionary
+
+    @property
+    def version(self) -> str:
+        return self.model.version
+
+
+class EncodedResume(NamedTuple):
+    # A resume transformed with one snapshot's model and skill dictionary, once
+    # per request, then shared by score and explain (and every streamed block)
+    vector: sp.csr_matrix
+    skill_bits: np.ndarray
+
+
+class JobIndex:
+    """In-memory TF-IDF matrix of every job description, one L2-normalized row per job.
+
+    Readers take the current state as a single reference, so a rebuild running in
+    another thread never exposes a half-updated matrix or a mismatched model.
+    """
+
+    def __init__(self, vectorizer=vectorizer):
+        self.vectorizer = vectorizer
+        # Serializes writers; readers never take it
+        self._lock = threading.RLock()
+        self._state = None
+        # (snapshot, CandidateIndex) for the snapshot it was built from
+        self._candidates = None
+
+    def __len__(self) -> int:
+        state = self._state
+        return len(state.jobs) if state else 0
+
+    def snapshot(self) -> Optional[IndexSnapshot]:
+        # Rows of snapshot.matrix line up with snapshot.jobs
+        return self._state
+
+    def install(self, snapshot: Optional[IndexSnapshot]):
+        with self._lock:
+            self._state = snapshot
+
+    def build(self, jobs: list[dict]):
+        with self._lock:
+            if not jobs:
+                self._state = None
+                return
+            if not self.vectorizer.is_fitted:
+                self.vectorizer.fit([job['description'] for job in jobs])
+            model = self.vectorizer.model
+            self._state = make_snapshot(model, list(jobs), model.transform_many([job['description'] for job in jobs]))
+
+    def sync(self, jobs: list[dict]):
+        # Only postings that are new or whose description changed get re-vectorized
+        with self._lock:
+            state = self._state
+            if state is None or state.version != self.vectorizer.version:
+                self.build(jobs)
+                return
+
+            kept_rows, kept_jobs, new_jobs = [], [], []
+            for job in jobs:
+                position = state.positions.get(str(job['id']))
+                if position is not None and state.jobs[position]['description'] == job['description']:
+                    kept_rows.append(position)
+                    kept_jobs.append(job)
+                else:
+                    new_jobs.append(job)
+
+            if not new_jobs and kept_rows == list(range(len(state.jobs))):
+                # Same rows in the same order: keep the matrix itself, which may be
+                # a memory map shared with other workers
+                if kept_jobs != state.jobs:
+                    self._state = make_snapshot(state.model, kept_jobs, state.matrix)
+                return
+
+            parts = [state.matrix[kept_rows]]
+            if new_jobs:
+                parts.append(state.model.transform_many([job['description'] for job in new_jobs]))
+            self._state = make_snapshot(state.model, kept_jobs + new_jobs, sp.vstack(parts, format='csr'))
+
+    def upsert(self, jobs: list[dict]):
+        # Read, merge and sync under one lock, so concurrent upserts never merge
+        # from the same old state and drop each other's jobs
+        with self._lock:
+            state = self._state
+            if state is None:
+                # Nothing built yet; the next sync picks these up with the rest of the catalog
+                return
+            merged = {str(job['id']): job for job in state.jobs}
+            merged.update({str(job['id']): job for job in jobs})
+            self.sync(list(merged.values()))
+
+    def encode(
+        self, resume_text: str, snapshot: Optional[IndexSnapshot] = None, skill_text: Optional[str] = None
+    ) -> Optional[EncodedResume]:
+        # skill_text is the resume's stored skill_text; without it skills are found in resume_text
+        state = snapshot or self._state
+        if state is None:
+            return None
+        return EncodedResume(state.model.transform(resume_text), state.skills.encode_texts([skill_text or resume_text]))
+
+    def candidate_index(self, state: IndexSnapshot) -> CandidateIndex:
+        # Built on first top-k query against a snapshot, then reused until it is replaced
+        cached = self._candidates
+        if cached is None or cached[0] is not state:
+            cached = (state, CandidateIndex(state.matrix))
+            self._candidates = cached
+        return cached[1]
+
+    def score(
+        self,
+        resume_text: str,
+        resume_experience_years: int = None,
+        resume_education_level: str = None,
+        top_k: Optional[int] = None,
+        exhaustive: bool = False,
+        location: Optional[str] = None,
+        min_score: Optional[float] = None,
+        block: Optional[slice] = None,
+        snapshot: Optional[IndexSnapshot] = None,
+        encoded: Optional[EncodedResume] = None
+    ) -> list[tuple[dict, dict]]:
+        """Scores against every job, or only the best ``top_k`` ordered by overall score.
+
+        ``location`` and ``min_score`` are hard filters applied before text
+        similarity: jobs elsewhere, or whose experience and education scores
+        cannot reach ``min_score`` even with a perfect skills score, are skipped.
+        With ``top_k`` an inverted-index search over the resume's heaviest terms
+        first picks ``top_k * retrieval_candidates`` jobs and only those are
+        fully scored; ``exhaustive`` skips it, e.g. to measure its recall. ``block``
+        limits scoring to a slice of the snapshot's rows; pass the ``snapshot``
+        too so consecutive blocks see the same rows while the index is rebuilt.
+        ``encoded`` is the resume from ``encode`` with that snapshot, to skip
+        transforming it again.
+        """
+        state = snapshot or self._state
+        if state is None:
+            return []
+
+        # Structured scores for every job at once, from the columns
+        experience = compute_experience_scores([resume_experience_years or 0], state.features.experience_years)[0]
+        education = compute_education_scores([education_rank(resume_education_level)], state.features.education_ranks)[0]
+        structured = experience * 0.3 + education * 0.2
+
+        allowed = np.ones(len(state.jobs), dtype=bool)
+        if block is not None:
+            allowed[:] = False
+            allowed[block] = True
+        if location:
+            allowed &= state.locations == _normalize_location(location)
+        if min_score is not None:
+            # 50 is the most a perfect skills score adds; keep a rounding margin
+            allowed &= structured + 50 >= min_score - 0.005
+        if not allowed.any():
+            return []
+
+        encoded = encoded or self.encode(resume_text, state)
+        resume_vec = encoded.vector
+        rows = np.flatnonzero(allowed)
+        if top_k and not exhaustive:
+            count = top_k * settings.retrieval_candidates
+            if count < len(rows):
+                rows = self.candidate_index(state).candidates(
+                    resume_vec, count, settings.retrieval_query_terms, allowed=allowed if len(rows) < len(state.jobs) else None
+                )
+
+        # One sparse matrix-vector product gives the cosine similarity against every remaining job
+        matrix = state.matrix if len(rows) == len(state.jobs) else state.matrix[rows]
+        skills = (matrix @ resume_vec.T).toarray().ravel() * 100
+        # Listed skills found in the resume, by popcount over the jobs' bitsets
+        skills = blend_skill_scores(skills, skill_overlap_scores(encoded.skill_bits, state.features.skill_bits[rows])[0])
+        overall = skills * 0.5 + structured[rows]
+        keep = np.ones(len(rows), dtype=bool) if min_score is None else overall >= min_score - 0.005
+
+        results = []
+        for i in np.flatnonzero(keep):
+            row = rows[i]
+            scores = combine_scores(float(skills[i]), float(experience[row]), float(education[row]))
+            if min_score is None or scores['overall'] >= min_score:
+                results.append((state.jobs[row], scores))
+        if top_k:
+            results.sort(key=lambda result: result[1]['overall'], reverse=True)
+            results = results[:top_k]
+        return results
+
+    def explain(
+        self,
+        resume_text: str,
+        jobs: list[dict],
+        n: Optional[int] = None,
+        snapshot: Optional[IndexSnapshot] = None,
+        encoded: Optional[EncodedResume] = None
+    ) -> list[list[str]]:
+        """Top contributing terms of each job's match with the resume; [] for jobs not in the index."""
+        state = snapshot or self._state
+        if state is None or not jobs:
+            return [[] for _ in jobs]
+        rows = [state.positions.get(str(job['id'])) for job in jobs]
+        indexed = [i for i, row in enumerate(rows) if row is not None]
+        resume_vec = (encoded or self.encode(resume_text, state)).vector
+        terms = top_terms(state.model, resume_vec[[0] * len(indexed)], state.matrix[[rows[i] for i in indexed]], n)
+        explained = [[] for _ in jobs]
+        for i, job_terms in zip(indexed, terms):
+            explained[i] = job_terms
+        return explained
+
+    def measure_recall(self, resume_texts: list[str], top_k: int, **features) -> float:
+        """Mean recall@top_k of the pruned search against exhaustive scoring."""
+        recalls = []
+        for text in resume_texts:
+            exact = self.score(text, top_k=top_k, exhaustive=True, **features)
+            retrieved = self.score(text, top_k=top_k, **features)
+            recalls.append(recall_at_k(
+                [scores['overall'] for _, scores in exact],
+                [scores['overall'] for _, scores in retrieved]
+            ))
+        return float(np.mean(recalls)) if recalls else 1.0
+
+
+def _normalize_location(location: Optional[str]) -> str:
+    return (location or "").strip().casefold()
+
+
+def make_snapshot(model: FittedModel, jobs: list[dict], matrix) -> IndexSnapshot:
+    positions = {str(job['id']): i for i, job in enumerate(jobs)}
+    skills = SkillDictionary.from_jobs(jobs)
+    features = StructuredFeatures.for_jobs(jobs, skills)
+    locations = np.array([_normalize_location(job.get('location')) for job in jobs], dtype=object)
+    return IndexSnapshot(model, jobs, positions, sp.csr_matrix(matrix), features, locations, skills)
+
+
+# Global instance
+job_index = JobIndex()
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from app.core.config import settings
+
+
+class EmailTransport(ABC):
+    """Delivers one message; raise to signal a failure the outbox should retry."""
+
+    @abstractmethod
+    async def send(self, to: str, subject: str, body: str):
+        ...
+
+
+class ConsoleTransport(EmailTransport):
+    # In production, integrate with Resend or SendGrid
+    async def send(self, to: str, subject: str, body: str):
+        print(f"Sending email to {to}: {subject} - {body}")
+
+
+class MemoryTransport(EmailTransport):
+    # Local stand-in that keeps every message, for tests and offline runs
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, to: str, subject: str, body: str):
+        self.sent.append({"to": to, "subject": subject, "body": body})
+
+
+TRANSPORTS = {
+    "console": ConsoleTransport,
+    "memory": MemoryTransport,
+}
+
+_transport = None
+
+
+def get_transport() -> EmailTransport:
+    global _transport
+    if _transport is None:
+        _transport = TRANSPORTS[settings.email_transport]()
+    return _transport
@@ -1,24 +1,16 @@
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from app.services.vectorize import vectorizer
+from app.services.skills import SkillDictionary, blend_skill_scores, skill_overlap_scores
+
+EDUCATION_LEVELS = {'high school': 1, 'bachelor': 2, 'master': 3, 'phd': 4}
+
 
 def compute_cosine_similarity(vec1, vec2) -> float:
+    from sklearn.metrics.pairwise import cosine_similarity
     return cosine_similarity(vec1, vec2)[0][0]
 
-def compute_weighted_score(
-    resume_text: str,
-    job_description: str,
-    job_skills: list[str],
-    job_experience_years: int = None,
-    job_education_level: str = None,
-    resume_experience_years: int = None,  # Assume extracted or provided
-    resume_education_level: str = None
-) -> dict:
-    # Skills score (50%)
-    resume_vec = vectorizer.transform(resume_text)
-    job_vec = vectorizer.transform(job_description)
-    skills_score = compute_cosine_similarity(resume_vec, job_vec) * 100
 
+def compute_experience_score(resume_experience_years: int = None, job_experience_years: int = None) -> float:
     # Experience score (30%) - simple match
     experience_score = 0
     if resume_experience_years and job_experience_years:
@@ -26,18 +18,23 @@ def compute_weighted_score(
             experience_score = 100
         else:
             experience_score = (resume_experience_years / job_experience_years) * 100
+    return experience_score
+
 
+def compute_education_score(resume_education_level: str = None, job_education_level: str = None) -> float:
     # Education score (20%) - simple match
     education_score = 0
-    education_levels = {'high school': 1, 'bachelor': 2, 'master': 3, 'phd': 4}
     if resume_education_level and job_education_level:
-        resume_level = education_levels.get(resume_education_level.lower(), 0)
-        job_level = education_levels.get(job_education_level.lower(), 0)
+        resume_level = EDUCATION_LEVELS.get(resume_education_level.lower(), 0)
+        job_level = EDUCATION_LEVELS.get(job_education_level.lower(), 0)
         if resume_level >= job_level:
             education_score = 100
         else:
             education_score = (resume_level / job_level) * 100 if job_level > 0 else 0
+    return education_score
 
+
+def combine_scores(skills_score: float, experience_score: float, education_score: float) -> dict:
     overall_score = (skills_score * 0.5) + (experience_score * 0.3) + (education_score * 0.2)
 
     return {
@@ -45,4 +42,55 @@ def compute_weighted_score(
         'skills': round(skills_score, 2),
         'experience': round(experience_score, 2),
         'education': round(education_score, 2)
-    }
\ No newline at end of file
+    }
+
+
+def compute_weighted_score(
+    resume_text: str,
+    job_description: str,
+    job_skills: list[str],
+    job_experience_years: int = None,
+    job_education_level: str = None,
+    resume_experience_years: int = None,  # Assume extracted or provided
+    resume_education_level: str = None,
+    resume_skill_text: str = None
+) -> dict:
+    # Skills score (50%): description similarity blended with the share of the
+    # job's listed skills that the resume mentions
+    resume_vec = vectorizer.transform(resume_text)
+    job_vec = vectorizer.transform(job_description)
+    skills_score = compute_cosine_similarity(resume_vec, job_vec) * 100
+    if job_skills:
+        skills = SkillDictionary(job_skills)
+        overlap = skill_overlap_scores(skills.encode_texts([resume_skill_text or resume_text]), skills.encode_jobs([{'skills': job_skills}]))
+        skills_score = float(blend_skill_scores(np.array([[skills_score]]), overlap)[0, 0])
+
+    experience_score = compute_experience_score(resume_experience_years, job_experience_years)
+    education_score = compute_education_score(resume_education_level, job_education_level)
+
+    return combine_scores(skills_score, experience_score, education_score)
+
+
+def education_rank(education_level: str = None) -> int:
+    # -1 marks a missing level, which scores 0 just like compute_education_score
+    if not education_level:
+        return -1
+    return EDUCATION_LEVELS.get(education_level.lower(), 0)
+
+
+def compute_experience_scores(resume_experience_years: np.ndarray, job_experience_years: np.ndarray) -> np.ndarray:
+    # Vectorized compute_experience_score: (R,) x (J,) -> (R, J), nan/0 meaning "not given"
+    resume_years = np.nan_to_num(np.asarray(resume_experience_years, dtype=float))[:, None]
+    job_years = np.nan_to_num(np.asarray(job_experience_years, dtype=float))[None, :]
+    valid = (resume_years != 0) & (job_years != 0)
+    ratio = resume_years / np.where(job_years != 0, job_years, 1)
+    return np.where(valid, np.where(resume_years >= job_years, 100.0, ratio * 100), 0.0)
+
+
+def compute_education_scores(resume_ranks: np.ndarray, job_ranks: np.ndarray) -> np.ndarray:
+    # Vectorized compute_education_score over ranks from education_rank()
+    resume_ranks = np.asarray(resume_ranks, dtype=float)[:, None]
+    job_ranks = np.asarray(job_ranks, dtype=float)[None, :]
+    valid = (resume_ranks >= 0) & (job_ranks >= 0)
+    ratio = resume_ranks / np.where(job_ranks > 0, job_ranks, 1)
+    return np.where(valid, np.where(resume_ranks >= job_ranks, 100.0, ratio * 100), 0.0)
@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Optional
+import numpy as np
+import scipy.sparse as sp
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.vectorize import FittedModel, vectorizer
+from app.services.job_index import IndexSnapshot, job_index, make_snapshot
+
+# Layout of one artifact directory, data_dir/models/<artifact id>/:
+#   manifest.json   artifact id, model version, matrix shape
+#   vocabulary.json terms in column order
+#   idf.npy         idf weights
+#   data.npy, indices.npy, indptr.npy   CSR arrays of the job matrix
+#   jobs.json       job rows, aligned with the matrix rows
+# data_dir/models/CURRENT holds the id of the artifact workers should serve.
+_MATRIX_PARTS = ('data', 'indices', 'indptr')
+_POINTER = "CURRENT"
+
+_swap_lock = threading.Lock()
+_active_artifact: Optional[str] = None
+
+
+def _models_dir() -> str:
+    return os.path.join(settings.data_dir, "models")
+
+
+def _read_pointer() -> Optional[str]:
+    try:
+        with open(os.path.join(_models_dir(), _POINTER)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_pointer(artifact_id: str):
+    path = os.path.join(_models_dir(), _POINTER)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(artifact_id)
+    os.replace(tmp_path, path)
+
+
+def _prune(current: str):
+    # Workers may still map an older artifact; on POSIX removing the files keeps
+    # their pages alive until those workers swap to the new version
+    artifacts = sorted(name for name in os.listdir(_models_dir()) if not name.startswith('.') and name != _POINTER)
+    for name in artifacts[:-settings.model_keep_versions]:
+        if name != current:
+            shutil.rmtree(os.path.join(_models_dir(), name), ignore_errors=True)
+
+
+def save_model(snapshot: IndexSnapshot) -> str:
+    models_dir = _models_dir()
+    os.makedirs(models_dir, exist_ok=True)
+    artifact_id = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{snapshot.version}-{os.getpid()}"
+
+    # Everything is written into a private directory and renamed into place, so
+    # readers never find a partially written artifact
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=models_dir)
+    try:
+        matrix = snapshot.matrix.tocsr()
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump({
+                "artifact_id": artifact_id,
+                "model_version": snapshot.version,
+                "shape": list(matrix.shape),
+            }, f)
+        with open(os.path.join(tmp_dir, "vocabulary.json"), "w") as f:
+            json.dump(snapshot.model.tfidf.get_feature_names_out().tolist(), f)
+        np.save(os.path.join(tmp_dir, "idf.npy"), np.asarray(snapshot.model.tfidf.idf_))
+        for part in _MATRIX_PARTS:
+            np.save(os.path.join(tmp_dir, f"{part}.npy"), getattr(matrix, part))
+        with open(os.path.join(tmp_dir, "jobs.json"), "w") as f:
+            json.dump(snapshot.jobs, f, default=str)
+        os.replace(tmp_dir, os.path.join(models_dir, artifact_id))
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    _write_pointer(artifact_id)
+    _prune(artifact_id)
+    return artifact_id
+
+
+def load_model(artifact_id: str) -> IndexSnapshot:
+    path = os.path.join(_models_dir(), artifact_id)
+    with open(os.path.join(path, "manifest.json")) as f:
+        manifest = json.load(f)
+    with open(os.path.join(path, "vocabulary.json")) as f:
+        terms = json.load(f)
+    with open(os.path.join(path, "jobs.json")) as f:
+        jobs = json.load(f)
+
+    # Memory-mapped read-only, so every worker serving this artifact shares the pages
+    idf = np.load(os.path.join(path, "idf.npy"), mmap_mode='r')
+    parts = tuple(np.load(os.path.join(path, f"{part}.npy"), mmap_mode='r') for part in _MATRIX_PARTS)
+    matrix = sp.csr_matrix(parts, shape=tuple(manifest["shape"]), copy=False)
+
+    model = FittedModel.from_arrays(terms, idf, manifest["model_version"])
+    return make_snapshot(model, jobs, matrix)
+
+
+def load_current_model() -> bool:
+    """Swap in the artifact CURRENT points at, if it differs from the one being served."""
+    global _active_artifact
+    artifact_id = _read_pointer()
+    if artifact_id is None or artifact_id == _active_artifact:
+        return False
+    try:
+        # Fully loaded before anything is swapped
+        snapshot = load_model(artifact_id)
+    except (OSError, ValueError, KeyError):
+        logger.exception(f"Could not load model artifact {artifact_id}")
+        return False
+    with _swap_lock:
+        vectorizer.install(snapshot.model)
+        job_index.install(snapshot)
+        _active_artifact = artifact_id
+    logger.info(f"Serving model artifact {artifact_id}")
+    return True
+
+
+def publish_model() -> Optional[str]:
+    """Persist the current job index and its model for the other workers."""
+    global _active_artifact
+    snapshot = job_index.snapshot()
+    if snapshot is None:
+        return None
+    artifact_id = save_model(snapshot)
+    with _swap_lock:
+        _active_artifact = artifact_id
+    return artifact_id
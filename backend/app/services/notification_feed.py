@@ -0,0 +1,79 @@
+import asyncio
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from app.core.config import settings
+from app.core.logging import logger
+from app.db import get_repository
+
+# Ids of recently pushed rows; must cover a couple of poll windows of new notifications
+_DELIVERED_MEMORY = 10000
+
+
+class NotificationFeed:
+    """Pushes new in-app notifications to the clients connected to this worker.
+
+    persist_matches publishes the rows it inserts, so they reach clients of the
+    same worker at once. Rows written by other workers (rescore shards, reverse
+    matching) are picked up every notification_poll_seconds, while anyone is
+    connected, by one query for all of this worker's connected users rather
+    than one per client. Polls overlap by one
+    interval to catch late commits; remembered ids keep a row from being pushed
+    twice.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._delivered: OrderedDict[str, None] = OrderedDict()
+        self._poller: Optional[asyncio.Task] = None
+        self._since: Optional[datetime] = None
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=settings.notification_queue_size)
+        self._subscribers[str(user_id)].add(queue)
+        if self._poller is None or self._poller.done():
+            self._since = datetime.now(timezone.utc)
+            self._poller = asyncio.get_running_loop().create_task(self._poll())
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(str(user_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[str(user_id)]
+        if not self._subscribers and self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    def publish(self, rows: list[dict]):
+        for row in rows:
+            if row.get('type') != "in_app" or row['id'] in self._delivered:
+                continue
+            self._delivered[row['id']] = None
+            if len(self._delivered) > _DELIVERED_MEMORY:
+                self._delivered.popitem(last=False)
+            for queue in self._subscribers.get(str(row['user_id']), ()):
+                try:
+                    queue.put_nowait(row)
+                except asyncio.QueueFull:
+                    # A client this far behind re-reads the feed when it reconnects
+                    pass
+
+    async def _poll(self):
+        interval = timedelta(seconds=settings.notification_poll_seconds)
+        while True:
+            await asyncio.sleep(settings.notification_poll_seconds)
+            started = datetime.now(timezone.utc)
+            try:
+                # Only users connected to this worker
+                rows = await get_repository().list_notifications_since("in_app", self._since.isoformat(), list(self._subscribers))
+            except Exception:
+                logger.exception("Notification poll failed")
+                continue
+            self.publish(rows)
+            self._since = started - interval
+
+
+# Global instance
+notification_feed = NotificationFeed()
@@ -0,0 +1,89 @@
+import asyncio
+import io
+import multiprocessing
+from typing import Optional
+import PyPDF2
+from app.core.config import settings
+from app.core.metrics import stage_timer
+
+
+class PDFExtractionError(Exception):
+    pass
+
+
+def extract_text_from_pdf(file: bytes, max_pages: Optional[int] = None) -> str:
+    try:
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file))
+        if max_pages and len(pdf_reader.pages) > max_pages:
+            raise PDFExtractionError(f"PDF has more than {max_pages} pages")
+        # Pages are collected and joined once instead of growing one string
+        return "".join(page.extract_text() for page in pdf_reader.pages)
+    except PDFExtractionError:
+        raise
+    except Exception as e:
+        # PyPDF2 raises KeyError, ValueError, struct.error and more on malformed files, not only PyPdfError
+        raise PDFExtractionError(f"{type(e).__name__}: {e}")
+
+
+class PDFWorkerPool:
+    """Parses PDFs in a bounded pool of worker processes, off the request workers.
+
+    A document that runs past the timeout gets its worker killed: the pool is
+    terminated and rebuilt, and other documents still in flight are resubmitted.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._in_flight: dict[asyncio.Future, bytes] = {}
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            # spawn, not fork: the API process runs threads that must not be copied mid-operation
+            self._pool = multiprocessing.get_context("spawn").Pool(
+                processes=settings.pdf_workers,
+                maxtasksperchild=settings.pdf_max_tasks_per_child,
+            )
+        return self._pool
+
+    def _submit(self, future: asyncio.Future, content: bytes):
+        loop = future.get_loop()
+
+        def resolve(result):
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(result))
+
+        def reject(exc):
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_exception(exc))
+
+        self._ensure_pool().apply_async(
+            extract_text_from_pdf, (content, settings.pdf_max_pages), callback=resolve, error_callback=reject
+        )
+
+    def _restart(self, stuck: asyncio.Future):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+        for future, content in self._in_flight.items():
+            if future is not stuck and not future.done():
+                self._submit(future, content)
+
+    async def extract(self, content: bytes) -> str:
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[future] = content
+        try:
+            self._submit(future, content)
+            with stage_timer("pdf_extract"):
+                return await asyncio.wait_for(asyncio.shield(future), settings.pdf_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._restart(future)
+            raise PDFExtractionError(f"PDF took longer than {settings.pdf_timeout_seconds}s to parse")
+        finally:
+            self._in_flight.pop(future, None)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+
+# Global instance
+pdf_pool = PDFWorkerPool()
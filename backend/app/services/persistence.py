@@ -0,0 +1,88 @@
+import asyncio
+from typing import Iterable, Optional
+from app.core.config import settings
+from app.core.metrics import MATCHES_STORED
+from app.db import get_repository
+from app.services.notification_feed import notification_feed
+
+# matches needs a unique (user_id, resume_id, job_id) constraint and notifications
+# a unique (match_id, type) constraint for these upserts to be idempotent
+MATCH_CONFLICT_COLUMNS = "user_id,resume_id,job_id"
+NOTIFICATION_CONFLICT_COLUMNS = "match_id,type"
+
+
+def match_key(row: dict) -> tuple[str, str, str]:
+    return str(row['user_id']), str(row['resume_id']), str(row['job_id'])
+
+
+def _chunks(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def load_existing_matches(resume_ids: Optional[Iterable[str]] = None) -> dict[tuple[str, str, str], dict]:
+    """Existing matches keyed by (user_id, resume_id, job_id), read in one paged pass."""
+    rows = await get_repository().list_matches(resume_ids=resume_ids)
+    return {match_key(row): row for row in rows}
+
+
+async def persist_matches(
+    candidates: list[dict],
+    existing: Optional[dict] = None,
+    chunk_size: Optional[int] = None
+) -> list[dict]:
+    """Insert the candidate matches that do not exist yet, plus their notifications.
+
+    Writes are batched upserts that ignore duplicates, so a retried or concurrent
+    run never creates a second match or notification for the same pair. Returns
+    the newly inserted match rows; ``existing`` is updated with them, and with
+    any pair a concurrent writer stored first, when given.
+    """
+    chunk_size = chunk_size or settings.persist_chunk_size
+    if existing is None:
+        existing = await load_existing_matches({candidate['resume_id'] for candidate in candidates})
+
+    new_rows = {}
+    for candidate in candidates:
+        key = match_key(candidate)
+        if key not in existing:
+            new_rows.setdefault(key, candidate)
+
+    repo = get_repository()
+
+    async def write(chunk: list[dict]) -> list[dict]:
+        # Only rows that were actually inserted come back, each with its id
+        rows = await repo.upsert_matches(chunk, on_conflict=MATCH_CONFLICT_COLUMNS)
+        # An in-app entry for the feed, and an email entry the outbox dispatcher
+        # later folds into the user's digest
+        notifications = [
+            {
+                "user_id": row['user_id'],
+                "match_id": row['id'],
+                "type": notification_type,
+                "sent_at": None,
+                "status": "pending"
+            }
+            for row in rows
+            for notification_type in ("in_app", "email")
+        ]
+        if notifications:
+            # Connected clients get the in-app rows pushed right away
+            notification_feed.publish(
+                await repo.upsert_notifications(notifications, on_conflict=NOTIFICATION_CONFLICT_COLUMNS)
+            )
+        return rows
+
+    # Chunks are independent, so they are written concurrently over the pool
+    written = await asyncio.gather(*(write(chunk) for chunk in _chunks(list(new_rows.values()), chunk_size)))
+    inserted = [row for rows in written for row in rows]
+    MATCHES_STORED.inc(len(inserted))
+    existing.update((match_key(row), row) for row in inserted)
+    # Pairs another writer stored after ``existing`` was read are skipped by the
+    # upsert; read them back so every candidate has its row
+    skipped = {candidate['resume_id'] for key, candidate in new_rows.items() if key not in existing}
+    if skipped:
+        existing.update(
+            (match_key(row), row) for row in await repo.list_matches(resume_ids=skipped) if match_key(row) in new_rows
+        )
+    return inserted
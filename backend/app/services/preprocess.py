@@ -1,21 +1,51 @@
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+from app.core.config import settings
+from app.services.stopwords import ENGLISH_STOP_WORDS
+
+# Punctuation and digits are both deleted character by character, so one pass
+# over the combined pattern gives the same result as two separate substitutions
+_STRIP_PATTERN = re.compile(r'[^\w\s]|\d+')
+
+# Once punctuation is gone every token is a run of word characters, and the only
+# word_tokenize rules that still fire are these whole-token contraction splits
+_CONTRACTIONS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
 
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
 
 def preprocess_text(text: str) -> str:
-    # Lowercase
-    text = text.lower()
-    # Remove punctuation and numbers
-    text = re.sub(r'[^\w\s]', '', text)
-    text = re.sub(r'\d+', '', text)
-    # Tokenize
-    tokens = word_tokenize(text)
-    # Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    tokens = [word for word in tokens if word not in stop_words]
+    # Lowercase, then remove punctuation and numbers
+    text = _STRIP_PATTERN.sub('', text.lower())
+    # Tokenize and remove stopwords
+    stop_words = ENGLISH_STOP_WORDS
+    tokens = []
+    for token in text.split():
+        parts = _CONTRACTIONS.get(token)
+        if parts:
+            tokens.extend(part for part in parts if part not in stop_words)
+        elif token not in stop_words:
+            tokens.append(token)
     # Join back
-    return ' '.join(tokens)
\ No newline at end of file
+    return ' '.join(tokens)
+
+
+def preprocess_batch(texts: Iterable[str], processes: Optional[int] = None, chunksize: int = 256) -> Iterator[str]:
+    """Yield ``preprocess_text(text)`` for every text, in input order.
+
+    With ``processes`` > 1 the texts are normalized in a process pool, which only
+    pays off for corpora large enough to amortize starting the workers.
+    """
+    processes = settings.preprocess_processes if processes is None else processes
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            yield from executor.map(preprocess_text, texts, chunksize=chunksize)
+    else:
+        for text in texts:
+            yield preprocess_text(text)
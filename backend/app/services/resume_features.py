@@ -0,0 +1,94 @@
+import re
+from datetime import date
+from typing import Optional
+from app.services.skills import skill_text
+
+# Bumped whenever the parsers change, so the backfill re-processes older rows
+RESUME_FEATURES_VERSION = 2
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+_MONTH = r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+_DATE = rf'(?:{_MONTH}\s+|(\d{{1,2}})\s*/\s*)?((?:19|20)\d{{2}})'
+_DATE_RANGE = re.compile(
+    rf'{_DATE}\s*(?:-|–|—|to|until)\s*(?:{_DATE}|(present|current|now|today))',
+    re.IGNORECASE
+)
+_STATED_YEARS = re.compile(
+    r'(\d{1,2})\+?\s*(?:years?|yrs?)(?:\s+of)?(?:\s+[a-z-]+){0,3}?\s+experience'
+    r'|experience\s*(?:of)?\s*:?\s*(\d{1,2})\+?\s*(?:years?|yrs?)',
+    re.IGNORECASE
+)
+_MAX_YEARS = 50
+
+# Keys of EDUCATION_LEVELS, checked from the highest level down; the first hit wins
+_EDUCATION_PATTERNS = [
+    ('phd', re.compile(r'\b(ph\.?\s?d|doctorate|doctor of)(?!\w)', re.IGNORECASE)),
+    ('master', re.compile(r'\b(masters?|m\.?\s?sc|m\.?\s?s\.|mba|m\.?\s?tech|m\.?\s?eng)(?!\w)', re.IGNORECASE)),
+    ('bachelor', re.compile(r'\b(bachelors?|b\.?\s?sc|b\.?\s?s\.|b\.?\s?a\.|b\.?\s?tech|b\.?\s?eng|b\.?\s?e\.|undergraduate degree)(?!\w)', re.IGNORECASE)),
+    ('high school', re.compile(r'\b(high school|secondary school|ged|diploma)(?!\w)', re.IGNORECASE)),
+]
+
+
+def _month_number(name: Optional[str], number: Optional[str]) -> int:
+    if name:
+        return _MONTHS[name[:3].lower()]
+    if number and 1 <= int(number) <= 12:
+        return int(number)
+    return 1
+
+
+def _date_ranges(text: str, today: date) -> list[tuple[float, float]]:
+    ranges = []
+    for match in _DATE_RANGE.finditer(text):
+        start_name, start_number, start_year, end_name, end_number, end_year, ongoing = match.groups()
+        start = int(start_year) + (_month_number(start_name, start_number) - 1) / 12
+        if ongoing:
+            end = today.year + (today.month - 1) / 12
+        else:
+            end = int(end_year) + (_month_number(end_name, end_number) - 1) / 12
+        if start <= end <= today.year + 1:
+            ranges.append((start, end))
+    return ranges
+
+
+def extract_experience_years(text: str, today: Optional[date] = None) -> Optional[int]:
+    """Years of experience: the larger of any stated "N years of experience" and
+    the total span of the date ranges in the text (overlapping jobs counted once)."""
+    today = today or date.today()
+    stated = [int(a or b) for a, b in _STATED_YEARS.findall(text)]
+
+    covered = 0.0
+    end_so_far = None
+    for start, end in sorted(_date_ranges(text, today)):
+        if end_so_far is None or start > end_so_far:
+            covered += end - start
+            end_so_far = end
+        elif end > end_so_far:
+            covered += end - end_so_far
+            end_so_far = end
+
+    if not stated and end_so_far is None:
+        return None
+    return min(int(max(stated + [covered])), _MAX_YEARS)
+
+
+def extract_education_level(text: str) -> Optional[str]:
+    # Highest level mentioned anywhere, as a key of EDUCATION_LEVELS
+    for level, pattern in _EDUCATION_PATTERNS:
+        if pattern.search(text):
+            return level
+    return None
+
+
+def extract_resume_features(raw_text: str) -> dict:
+    """Structured columns for a resume row, parsed from the text as extracted from
+    the PDF (before preprocessing strips digits and punctuation)."""
+    return {
+        "experience_years": extract_experience_years(raw_text),
+        "education_level": extract_education_level(raw_text),
+        "skill_text": skill_text(raw_text),
+        "features_version": RESUME_FEATURES_VERSION,
+    }
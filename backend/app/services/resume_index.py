@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import NamedTuple, Optional
+import numpy as np
+import scipy.sparse as sp
+from app.core.config import settings
+from app.services.batch_score import StructuredFeatures, score_matrices
+from app.services.explain import top_terms
+from app.services.skills import SkillDictionary, resume_skill_text
+from app.services.vectorize import FittedModel
+
+
+class ResumeSnapshot(NamedTuple):
+    model: FittedModel
+    resumes: list
+    positions: dict
+    matrix: sp.csr_matrix
+    # Stored experience and education columns, and the skills found in each
+    # resume as bitsets over ``skills``
+    skills: SkillDictionary
+    features: StructuredFeatures
+
+
+def _texts(resume: dict) -> tuple:
+    # A resume is encoded again when either text it is scored on changes
+    return resume['text_content'], resume.get('skill_text')
+
+
+class ResumeIndex:
+    """In-memory TF-IDF matrix of every resume, one L2-normalized row per resume.
+
+    The reverse of JobIndex: a newly posted job is scored against all resumes in a
+    single sparse product instead of waiting for the next full rescore.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._state: Optional[ResumeSnapshot] = None
+        # Database time of the last read, and when the table was last read in full
+        self.refreshed_at: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        state = self._state
+        return len(state.resumes) if state else 0
+
+    def snapshot(self) -> Optional[ResumeSnapshot]:
+        return self._state
+
+    def needs_full_load(self) -> bool:
+        # Incremental reads only see inserts and edits, so deletions are picked up
+        # by re-reading the whole table every resume_index_full_load_seconds
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > settings.resume_index_full_load_seconds
+
+    def sync(self, resumes: list[dict], model: FittedModel, skills: SkillDictionary, refreshed_at: Optional[str] = None):
+        # Replaces the index with ``resumes``, re-vectorizing only new or edited text
+        with self._lock:
+            self._state = self._merge(self._state, resumes, model, skills)
+            self._loaded_at = time.monotonic()
+            self.refreshed_at = refreshed_at
+
+    def upsert(self, resumes: list[dict], model: FittedModel, skills: SkillDictionary, refreshed_at: Optional[str] = None):
+        with self._lock:
+            state = self._state
+            merged = {str(resume['id']): resume for resume in (state.resumes if state else [])}
+            merged.update({str(resume['id']): resume for resume in resumes})
+            self._state = self._merge(state, list(merged.values()), model, skills)
+            if refreshed_at:
+                self.refreshed_at = refreshed_at
+
+    @staticmethod
+    def _merge(
+        state: Optional[ResumeSnapshot],
+        resumes: list[dict],
+        model: FittedModel,
+        skills: SkillDictionary
+    ) -> Optional[ResumeSnapshot]:
+        if not resumes:
+            return None
+        if state is None or state.model.version != model.version:
+            # A refit vocabulary changes every row
+            texts = [resume['text_content'] for resume in resumes]
+            skill_texts = [resume_skill_text(resume) for resume in resumes]
+            return _make_snapshot(model, list(resumes), model.transform_many(texts), skills, skills.encode_texts(skill_texts))
+
+        kept_rows, kept, new = [], [], []
+        for resume in resumes:
+            position = state.positions.get(str(resume['id']))
+            if position is not None and _texts(state.resumes[position]) == _texts(resume):
+                kept_rows.append(position)
+                kept.append(resume)
+            else:
+                new.append(resume)
+        same_skills = state.skills.version == skills.version
+        if same_skills and not new and kept_rows == list(range(len(state.resumes))) and kept == state.resumes:
+            return state
+        parts = [state.matrix[kept_rows]]
+        if new:
+            parts.append(model.transform_many([resume['text_content'] for resume in new]))
+        if same_skills:
+            bits = [state.features.skill_bits[kept_rows]]
+            if new:
+                bits.append(skills.encode_texts([resume_skill_text(resume) for resume in new]))
+            skill_bits = np.vstack(bits)
+        else:
+            # A new skill dictionary (a job listed a skill nobody had) only changes
+            # the bitsets; kept TF-IDF rows stay as they are
+            skill_bits = skills.encode_texts([resume_skill_text(resume) for resume in kept + new])
+        return _make_snapshot(model, kept + new, sp.vstack(parts, format='csr'), skills, skill_bits)
+
+    def match_job(self, job: dict, threshold: Optional[float] = None) -> list[tuple[dict, dict, list[str]]]:
+        """(resume, scores, top terms) for every resume scoring at least ``threshold`` against ``job``."""
+        state = self._state
+        if state is None:
+            return []
+        job_vec = state.model.transform(job['description'])
+        matches = score_matrices(
+            state.matrix, job_vec, state.features, StructuredFeatures.for_jobs([job], state.skills), threshold=threshold
+        )
+        rows = [match.resume_row for match in matches]
+        # The job's single row repeated once per matched resume
+        terms = top_terms(state.model, state.matrix[rows], job_vec[[0] * len(rows)])
+        return [(state.resumes[row], match.scores, match_terms) for row, match, match_terms in zip(rows, matches, terms)]
+
+
+def _make_snapshot(model: FittedModel, resumes: list[dict], matrix, skills: SkillDictionary, skill_bits) -> ResumeSnapshot:
+    positions = {str(resume['id']): i for i, resume in enumerate(resumes)}
+    features = StructuredFeatures.from_values(
+        [resume.get('experience_years') for resume in resumes],
+        [resume.get('education_level') for resume in resumes],
+        skill_bits,
+    )
+    return ResumeSnapshot(model, resumes, positions, sp.csr_matrix(matrix), skills, features)
+
+
+# Global instance
+resume_index = ResumeIndex()
@@ -0,0 +1,65 @@
+from typing import Iterable, Optional
+import numpy as np
+import scipy.sparse as sp
+
+
+class CandidateIndex:
+    """Inverted term index over a job matrix: one posting list of (job row, weight) per term.
+
+    Retrieval accumulates scores term-at-a-time over the posting lists of the
+    query's heaviest terms only, so it reads those lists and never the rest of
+    the matrix.
+    """
+
+    def __init__(self, matrix: sp.csr_matrix):
+        # CSC columns are the posting lists
+        self.postings = sp.csc_matrix(matrix)
+        self.rows = matrix.shape[0]
+
+    def candidates(
+        self,
+        query: sp.spmatrix,
+        count: int,
+        query_terms: Optional[int] = None,
+        allowed: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Rows of the ``count`` jobs with the highest (partial) dot product with ``query``.
+
+        ``allowed`` is a boolean mask over rows; jobs outside it are never returned.
+        """
+        query = sp.csr_matrix(query)
+        terms, weights = query.indices, query.data
+        if query_terms and len(terms) > query_terms:
+            # Query-term pruning: the lightest terms add the least to any job's score
+            keep = np.argpartition(weights, -query_terms)[-query_terms:]
+            terms, weights = terms[keep], weights[keep]
+        if len(terms) == 0:
+            return np.empty(0, dtype=np.intp)
+
+        # Gather the postings of the kept terms straight from the CSC arrays,
+        # without slicing a sub-matrix per query
+        starts = self.postings.indptr[terms]
+        lengths = self.postings.indptr[terms + 1] - starts
+        positions = np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        contributions = self.postings.data[positions] * np.repeat(weights, lengths)
+        scores = np.bincount(self.postings.indices[positions], weights=contributions, minlength=self.rows)
+        if allowed is not None:
+            scores[~allowed] = 0
+        # Jobs with no posting in the query's terms are never candidates
+        matched = np.flatnonzero(scores)
+        if len(matched) > count:
+            matched = matched[np.argpartition(scores[matched], -count)[-count:]]
+        return matched
+
+
+def recall_at_k(exact_scores: Iterable[float], retrieved_scores: Iterable[float]) -> float:
+    """Share of the exhaustive top-k that the pruned top-k recovered.
+
+    Compared by score rather than id, so jobs tied at the cut-off count either way.
+    """
+    exact_scores = list(exact_scores)
+    if not exact_scores:
+        return 1.0
+    cutoff = min(exact_scores)
+    hits = sum(score >= cutoff for score in retrieved_scores)
+    return min(hits, len(exact_scores)) / len(exact_scores)
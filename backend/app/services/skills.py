@@ -0,0 +1,183 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+import numpy as np
+from app.core.config import settings
+
+# Common spellings mapped to one canonical skill. Short forms that are also
+# ordinary resume words ("CV", "RN", "TS", "TF", "DL") are left out, as they
+# would credit skills the resume does not have
+SKILL_ALIASES = {
+    "js": "javascript",
+    "py": "python",
+    "golang": "go",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "sklearn": "scikit-learn",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "aws": "amazon web services",
+    "gcp": "google cloud",
+    "rest api": "rest",
+    "restful": "rest",
+    "ci cd": "ci/cd",
+}
+
+# Skill names that are also ordinary words only count in resume text when
+# written the way the skill is: "Go" but not "go hiking", "AI" but not "ai".
+# Job skills lists name skills on purpose and are not checked
+CASED_SKILL_TOKENS = {
+    "c": {"C"},
+    "r": {"R"},
+    "go": {"Go", "GO"},
+    "node": {"Node"},
+    "ai": {"AI"},
+}
+
+# Bits per bitset word
+_WORD_BITS = 64
+
+# Words keep the characters that tell skills apart, so C, C++ and C# differ,
+# ".NET" is not "net" and "Node.js" stays one token. A trailing full stop is
+# not part of the word
+_SKILL_TOKEN = re.compile(r"\.?\w[\w+#]*(?:\.\w[\w+#]*)*")
+
+
+def _tokens(text: str) -> tuple[str, ...]:
+    return tuple(token.lower() for token in _SKILL_TOKEN.findall(text))
+
+
+def _text_tokens(text: str) -> tuple[str, ...]:
+    # An ambiguous word in the wrong case becomes "", which no skill starts or continues with
+    tokens = []
+    for token in _SKILL_TOKEN.findall(text):
+        lowered = token.lower()
+        cased = CASED_SKILL_TOKENS.get(lowered)
+        tokens.append("" if cased is not None and token not in cased else lowered)
+    return tuple(tokens)
+
+
+def skill_text(raw_text: str) -> str:
+    """The skill words of text as extracted from a PDF, case kept; stored as ``resumes.skill_text``."""
+    return " ".join(_SKILL_TOKEN.findall(raw_text))
+
+
+def resume_skill_text(resume: dict) -> str:
+    # Rows parsed before skill_text existed use the preprocessed text until the backfill reaches them
+    return resume.get('skill_text') or resume['text_content']
+
+
+@lru_cache(maxsize=1)
+def _alias_keys() -> dict[tuple, tuple]:
+    return {_tokens(alias): _tokens(canonical) for alias, canonical in SKILL_ALIASES.items()}
+
+
+def skill_key(skill: str) -> tuple[str, ...]:
+    """Normalized token sequence of a skill, with aliases resolved; () if nothing is left."""
+    key = _tokens(skill)
+    return _alias_keys().get(key, key)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per element of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    # numpy < 2: count per byte through a lookup table
+    counts = _BYTE_POPCOUNT[np.ascontiguousarray(words).view(np.uint8)]
+    return counts.reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class SkillDictionary:
+    """Canonical skills, each owning one bit, plus a token trie to find them in text.
+
+    Built from the ``skills`` lists of all jobs and the aliases that point at
+    them. Every occurrence is reported, overlapping or not, so whether a text
+    contains a skill never depends on which other skills are in the dictionary.
+    """
+
+    def __init__(self, skills: Iterable[str] = ()):
+        keys = sorted({key for key in map(skill_key, skills) if key})
+        self.names = [" ".join(key) for key in keys]
+        self.ids = {key: i for i, key in enumerate(keys)}
+        self.words = max(1, -(-len(keys) // _WORD_BITS))
+        self.version = hashlib.sha1("\n".join(self.names).encode()).hexdigest()[:16]
+
+        # Nested dicts keyed by token; the None key holds the skill id ending there
+        self._trie: dict = {}
+        patterns = dict.fromkeys(keys)
+        patterns.update((alias, canonical) for alias, canonical in _alias_keys().items() if canonical in self.ids)
+        for pattern, canonical in patterns.items():
+            node = self._trie
+            for token in pattern:
+                node = node.setdefault(token, {})
+            node[None] = self.ids[canonical or pattern]
+
+    @classmethod
+    def from_jobs(cls, jobs: list[dict]) -> "SkillDictionary":
+        return cls(skill for job in jobs for skill in job.get('skills') or [])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def extract(self, text: str) -> set[int]:
+        """Ids of every dictionary skill occurring in ``text``, in one pass over its tokens."""
+        tokens = _text_tokens(text)
+        found = set()
+        for start in range(len(tokens)):
+            node = self._trie.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                if None in node:
+                    found.add(node[None])
+                if position == len(tokens):
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        return found
+
+    def lookup(self, skills: Iterable[str]) -> set[int]:
+        # Ids of a job's listed skills; ones missing from the dictionary are dropped
+        return {self.ids[key] for key in map(skill_key, skills or []) if key in self.ids}
+
+    def encode(self, id_sets: list[set[int]]) -> np.ndarray:
+        """One row of ``words`` uint64 bitset words per id set."""
+        bits = np.zeros((len(id_sets), self.words), dtype=np.uint64)
+        for row, ids in enumerate(id_sets):
+            for skill_id in ids:
+                bits[row, skill_id // _WORD_BITS] |= np.uint64(1 << (skill_id % _WORD_BITS))
+        return bits
+
+    def encode_texts(self, texts: list[str]) -> np.ndarray:
+        return self.encode([self.extract(text) for text in texts])
+
+    def encode_jobs(self, jobs: list[dict]) -> np.ndarray:
+        return self.encode([self.lookup(job.get('skills')) for job in jobs])
+
+
+def skill_overlap_scores(resume_bits: np.ndarray, job_bits: np.ndarray) -> np.ndarray:
+    """(R, J) share of each job's listed skills found in each resume, 0-100; nan where a job lists none."""
+    required = popcount(job_bits).sum(axis=1, dtype=np.int64)
+    shared = np.zeros((resume_bits.shape[0], job_bits.shape[0]), dtype=np.int64)
+    # One word at a time keeps the temporary at (R, J) instead of (R, J, words)
+    for word in range(job_bits.shape[1]):
+        shared += popcount(resume_bits[:, word, None] & job_bits[None, :, word])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(required > 0, shared * 100 / required, np.nan)
+
+
+def blend_skill_scores(similarity: np.ndarray, overlap: np.ndarray, weight: Optional[float] = None) -> np.ndarray:
+    # Jobs without a skills list keep the plain text similarity
+    weight = settings.skill_match_weight if weight is None else weight
+    return np.where(np.isnan(overlap), similarity, similarity * (1 - weight) + np.nan_to_num(overlap) * weight)
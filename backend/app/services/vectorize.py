@@ -1,17 +1,103 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from app.services.preprocess import preprocess_text
+import hashlib
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import stage_timer
+from app.services.preprocess import preprocess_batch
+
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+def _tfidf() -> "TfidfVectorizer":
+    # sklearn takes a few hundred ms to import, so it is loaded with the first model
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer()
+
+
+def _preprocess(texts: list[str]) -> list[str]:
+    # Large corpora go through the process pool; small batches stay in-process
+    processes = settings.preprocess_processes if len(texts) >= settings.preprocess_pool_min_texts else 0
+    with stage_timer("preprocess"):
+        return list(preprocess_batch(texts, processes=processes))
+
+
+class FittedModel:
+    """A fitted TF-IDF model. Never mutated, so it can be shared across threads and swapped atomically."""
+
+    def __init__(self, tfidf: "TfidfVectorizer", version: str):
+        self.tfidf = tfidf
+        # Fingerprint of the vocabulary and idf weights; refitting on identical
+        # data keeps the same version
+        self.version = version
+
+    @classmethod
+    def fit(cls, texts: list[str]) -> "FittedModel":
+        texts = _preprocess(texts)
+        with stage_timer("fit"):
+            tfidf = _tfidf().fit(texts)
+        digest = hashlib.sha1('\n'.join(tfidf.get_feature_names_out()).encode())
+        digest.update(tfidf.idf_.tobytes())
+        return cls(tfidf, digest.hexdigest()[:16])
+
+    @classmethod
+    def from_arrays(cls, terms: list[str], idf: np.ndarray, version: str) -> "FittedModel":
+        # idf may be a read-only memory map; sklearn keeps a reference instead of copying it
+        tfidf = _tfidf()
+        tfidf.vocabulary_ = {term: i for i, term in enumerate(terms)}
+        tfidf.idf_ = idf
+        return cls(tfidf, version)
+
+    @cached_property
+    def terms(self) -> np.ndarray:
+        # Vocabulary by column index, for mapping vector entries back to words
+        return self.tfidf.get_feature_names_out()
+
+    def transform(self, text: str):
+        with stage_timer("preprocess"):
+            texts = list(preprocess_batch([text], processes=0))
+        with stage_timer("vectorize"):
+            return self.tfidf.transform(texts)
+
+    def transform_many(self, texts: list[str]):
+        texts = _preprocess(texts)
+        # Rows are L2-normalized, so a dot product between two rows is their cosine similarity
+        with stage_timer("vectorize"):
+            return self.tfidf.transform(texts)
+
 
 class Vectorizer:
     def __init__(self):
-        self.vectorizer = TfidfVectorizer()
+        self._model: Optional[FittedModel] = None
+
+    @property
+    def model(self) -> Optional[FittedModel]:
+        # Callers that transform more than once should hold on to this snapshot
+        return self._model
+
+    @property
+    def is_fitted(self) -> bool:
+        return self._model is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        model = self._model
+        return model.version if model else None
 
     def fit(self, texts: list[str]):
-        processed = [preprocess_text(text) for text in texts]
-        self.vectorizer.fit(processed)
+        # Fit a fresh model and swap it in with one assignment, so a concurrent
+        # reader sees either the old model or the new one, never a half-fitted one
+        self._model = FittedModel.fit(texts)
+
+    def install(self, model: FittedModel):
+        self._model = model
 
     def transform(self, text: str):
-        processed = preprocess_text(text)
-        return self.vectorizer.transform([processed])
+        return self._model.transform(text)
+
+    def transform_many(self, texts: list[str]):
+        return self._model.transform_many(texts)
 
 # Global instance
-vectorizer = Vectorizer()
\ No newline at end of file
+vectorizer = Vectorizer()
@@ -0,0 +1,103 @@
+import asyncio
+import importlib
+import time
+from typing import Optional
+from app.core.config import settings
+from app.core.logging import logger
+from app.db import get_repository
+from app.services.catalog import job_catalog
+from app.services.job_index import job_index
+from app.services.model_store import load_current_model
+from app.services.vectorize import vectorizer
+
+
+class Readiness:
+    """Warm-up progress, reported by GET /health/ready."""
+
+    def __init__(self):
+        # starting or ready
+        self.status = "starting"
+        # Completed steps and how long each took, in ms
+        self.steps: dict[str, float] = {}
+        # Last failed step; still set once ready if warm-up gave up
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def report(self) -> dict:
+        return {"status": self.status, "steps": dict(self.steps), "error": self.error}
+
+
+# Global instance
+readiness = Readiness()
+
+_warm_up_task: Optional[asyncio.Task] = None
+
+
+def _import_sklearn():
+    # Imported on first use otherwise; a few hundred ms the first fit would pay
+    importlib.import_module("sklearn.feature_extraction.text")
+
+
+async def _load_catalog() -> list[dict]:
+    # Also opens the storage backend's client
+    return await job_catalog.get_all(get_repository())
+
+
+async def _step(name: str, awaitable):
+    started = time.perf_counter()
+    try:
+        result = await awaitable
+    except Exception:
+        readiness.error = f"{name} failed"
+        raise
+    readiness.steps[name] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+async def _warm_up_once():
+    await _step("sklearn", asyncio.to_thread(_import_sklearn))
+    await _step("model", asyncio.to_thread(load_current_model))
+    jobs = await _step("catalog", _load_catalog())
+    # Without a published model the first match fits one and builds the index with it
+    if vectorizer.is_fitted:
+        await _step("index", asyncio.to_thread(job_index.sync, jobs))
+
+
+async def warm_up():
+    """Load what the first requests would otherwise wait for: sklearn, the published model, the job catalog and index.
+
+    A failed attempt (e.g. storage briefly unreachable at boot) is retried with
+    exponential backoff. After the last one the process reports ready anyway and
+    loads lazily, as in "lazy" mode, rather than staying out of rotation until restarted.
+    """
+    for attempt in range(settings.warm_up_retries + 1):
+        try:
+            await _warm_up_once()
+        except Exception:
+            logger.exception(f"Warm-up failed (attempt {attempt + 1}): {readiness.error}")
+            if attempt < settings.warm_up_retries:
+                await asyncio.sleep(settings.warm_up_backoff_seconds * 2 ** attempt)
+            continue
+        readiness.error = None
+        logger.info(f"Warm-up done in {sum(readiness.steps.values()):.0f} ms: {readiness.steps}")
+        break
+    else:
+        logger.warning("Giving up on warm-up; serving and loading on first use")
+    readiness.status = "ready"
+
+
+async def start_warm_up():
+    """Warm up as startup_mode says: before serving ("blocking"), alongside it ("background") or not at all ("lazy")."""
+    global _warm_up_task
+    if settings.startup_mode == "blocking":
+        await warm_up()
+    elif settings.startup_mode == "background":
+        # Held so the task is not garbage collected mid-run
+        _warm_up_task = asyncio.create_task(warm_up())
+    elif settings.startup_mode == "lazy":
+        readiness.status = "ready"
+    else:
+        raise ValueError(f"Unknown startup mode: {settings.startup_mode}")
@@ -0,0 +1,57 @@
+import asyncio
+from app.core.config import settings
+from app.core.logging import logger
+from app.db import Repository, close_repository, get_repository
+from app.services.pdf_extract import PDFExtractionError, pdf_pool
+from app.services.resume_features import RESUME_FEATURES_VERSION, extract_resume_features
+
+
+async def _extract(repo: Repository, resume: dict, semaphore: asyncio.Semaphore) -> bool:
+    # The stored text_content has its digits stripped, so parse the original PDF
+    async with semaphore:
+        try:
+            content = await repo.download_resume_file(f"resumes/{resume['user_id']}/{resume['filename']}")
+            raw_text = await pdf_pool.extract(content)
+        except PDFExtractionError as e:
+            logger.warning(f"Resume {resume['id']} could not be parsed: {e}")
+            raw_text = ""
+        except Exception:
+            # Storage may be briefly unavailable: leave the row for the next run
+            logger.warning(f"Resume {resume['id']} file could not be read", exc_info=True)
+            return False
+        features = await asyncio.to_thread(extract_resume_features, raw_text)
+        # Marked with the current version even when nothing was found, so an
+        # unparseable file is not retried every run
+        await repo.update_resume(resume['id'], features)
+        return True
+
+
+async def backfill_resume_features() -> int:
+    """Fill experience_years/education_level on resumes parsed by an older (or no) extractor; returns rows updated."""
+    repo = get_repository()
+    semaphore = asyncio.Semaphore(settings.backfill_concurrency)
+    updated, last_id = 0, None
+    while True:
+        # Keyset paging on id: rows skipped in this run (unreadable files) are
+        # behind the cursor and cannot fill a batch and end the run early
+        resumes = await repo.list_resumes_needing_features(
+            RESUME_FEATURES_VERSION, settings.backfill_batch_size, after_id=last_id
+        )
+        if not resumes:
+            return updated
+        written = await asyncio.gather(*(_extract(repo, resume, semaphore) for resume in resumes))
+        updated += sum(written)
+        last_id = str(resumes[-1]['id'])
+        logger.info(f"Backfilled resume features for {updated} resumes")
+
+
+if __name__ == "__main__":
+    # python -m app.workers.backfill
+    async def main():
+        try:
+            await backfill_resume_features()
+        finally:
+            pdf_pool.close()
+            await close_repository()
+
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import asynccontextmanager, closing
+from typing import Optional
+from app.core.config import settings
+from app.core.logging import logger
+from app.db import Repository
+
+# Identifies this process as a lease holder, unique across workers and nodes
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_expires_at ON records (expires_at);
+"""
+
+
+class LeaseLost(Exception):
+    """Raised out of a heartbeat block once another worker has taken one of its leases."""
+
+
+class RecordStore:
+    """Shared values that disappear after their ttl, such as match job status, in a SQLite file.
+
+    Every worker process on the host opens the same file under data_dir. The
+    file must be on a local filesystem, because WAL mode does not work over
+    network filesystems, so records are shared by the workers of one node.
+    Leases and rescore state go through the repository instead and reach every
+    node sharing the database.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit, so every statement is its own atomic transaction
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def put_record(self, key: str, value: dict, ttl: float):
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute("DELETE FROM records WHERE expires_at < ?", (now,))
+            connection.execute(
+                "INSERT INTO records (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+                (key, json.dumps(value), now + ttl)
+            )
+
+    def get_record(self, key: str) -> Optional[dict]:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT value FROM records WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+@asynccontextmanager
+async def heartbeat(repo: Repository, leases: dict[str, str], ttl: float):
+    """Keep extending ``leases`` (name -> holder) while the block runs.
+
+    Work that outlasts ``ttl`` would otherwise see its lease expire and be
+    taken over by another worker while it is still in flight. If a renewal
+    fails anyway (the worker stalled past ``ttl`` and someone else took the
+    lease), the block is cancelled and LeaseLost raised, so the work stops
+    instead of running twice.
+    """
+    owner = asyncio.current_task()
+    lost = []
+
+    async def renew():
+        while True:
+            await asyncio.sleep(ttl / 3)
+            for name, holder in leases.items():
+                if not await repo.acquire_lease(name, holder, ttl):
+                    logger.warning(f"Lease {name} was lost by {holder}")
+                    lost.append(name)
+                    owner.cancel()
+                    return
+
+    task = asyncio.create_task(renew())
+    try:
+        yield
+    except asyncio.CancelledError:
+        if lost:
+            owner.uncancel()
+            raise LeaseLost(lost[0]) from None
+        raise
+    finally:
+        task.cancel()
+        if lost and owner.cancelling():
+            # The block finished before the cancellation reached it
+            owner.uncancel()
+
+
+def record_store() -> RecordStore:
+    # Follows data_dir, so tests and benchmarks pointing it elsewhere get their own store
+    return RecordStore(os.path.join(settings.data_dir, "coordination.db"))
+
+
+def shard_bounds(shard: int, shards: int) -> tuple[Optional[str], Optional[str]]:
+    """Id range [low, high) of ``shard`` out of ``shards``; the outer ends are open (None).
+
+    Resume ids are random UUIDs, so cutting their leading 32 bits into equal
+    ranges gives shards of nearly equal size, and every backend can filter on
+    them with a plain range condition.
+    """
+    def bound(index: int) -> Optional[str]:
+        if index in (0, shards):
+            return None
+        return f"{index * 2 ** 32 // shards:08x}-0000-0000-0000-000000000000"
+    return bound(shard), bound(shard + 1)
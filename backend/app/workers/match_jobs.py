@@ -0,0 +1,107 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+from app.core.config import settings
+from app.core.logging import logger
+from app.workers.coordination import record_store
+
+JOB_RECORD_PREFIX = "match-job:"
+
+
+class MatchJobQueueFull(Exception):
+    pass
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class MatchJobQueue:
+    """Runs match computations in the background on a bounded pool of asyncio workers.
+
+    At most ``match_job_max_pending`` jobs may be queued or running in this
+    process; beyond that ``submit`` refuses instead of letting the backlog grow.
+    Job records (status, then results) are kept in the node's record store, so
+    any worker sharing data_dir can answer a status request, and expire
+    ``match_job_ttl_seconds`` after their last update.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._pending = 0
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Tasks and queues belong to one event loop; start over on a new one
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._workers = [loop.create_task(self._work()) for _ in range(settings.match_job_workers)]
+            self._pending = 0
+        return self._queue
+
+    async def _save(self, record: dict):
+        store = await asyncio.to_thread(record_store)
+        await asyncio.to_thread(store.put_record, JOB_RECORD_PREFIX + record['id'], record, settings.match_job_ttl_seconds)
+
+    async def submit(self, user_id: str, run: Callable[[], Awaitable[list]], **details) -> dict:
+        """Queue ``run`` and return its job record; raises MatchJobQueueFull when the pool is saturated."""
+        queue = self._ensure_workers()
+        if self._pending >= settings.match_job_max_pending:
+            raise MatchJobQueueFull()
+        # Counted before the first await, so concurrent submits cannot overshoot the bound
+        self._pending += 1
+        record = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "status": "queued",
+            "created_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "matches": None,
+            **details
+        }
+        try:
+            # Saved before a worker can pick it up, so "running" is never overwritten by "queued"
+            await self._save(record)
+        except Exception:
+            self._pending -= 1
+            raise
+        queue.put_nowait((record, run))
+        return record
+
+    async def _work(self):
+        while True:
+            record, run = await self._queue.get()
+            try:
+                record.update(status="running", started_at=_now())
+                await self._save(record)
+                try:
+                    record.update(status="done", matches=await run())
+                except Exception:
+                    logger.exception(f"Match job {record['id']} failed")
+                    record.update(status="failed", error="Match computation failed")
+                record['finished_at'] = _now()
+                await self._save(record)
+            except Exception:
+                logger.exception(f"Could not record match job {record['id']}")
+            finally:
+                self._pending -= 1
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        store = await asyncio.to_thread(record_store)
+        return await asyncio.to_thread(store.get_record, JOB_RECORD_PREFIX + job_id)
+
+    def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._loop = None
+
+
+# Global instance
+match_jobs = MatchJobQueue()
@@ -0,0 +1,138 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import EMAILS, stage_timer
+from app.db import Repository, get_repository
+from app.services.mailer import EmailTransport, get_transport
+
+
+@dataclass
+class Digest:
+    user_id: str
+    to: str
+    notification_ids: list = field(default_factory=list)
+    lines: list = field(default_factory=list)
+
+    @property
+    def subject(self) -> str:
+        if len(self.lines) == 1:
+            return "New Job Match!"
+        return f"{len(self.lines)} New Job Matches!"
+
+    @property
+    def body(self) -> str:
+        return "\n".join(self.lines)
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all concurrent senders."""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1 / rate_per_second if rate_per_second > 0 else 0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def build_digests(notifications: list[dict], matches: dict, jobs: dict) -> list[Digest]:
+    # One message per user, listing every match queued since the last drain
+    digests = {}
+    for notification in notifications:
+        user_id = str(notification['user_id'])
+        digest = digests.get(user_id)
+        if digest is None:
+            # In real app, get from auth
+            digest = digests[user_id] = Digest(user_id=user_id, to="user@example.com")
+        digest.notification_ids.append(notification['id'])
+        match = matches.get(str(notification['match_id']))
+        if match:
+            job = jobs.get(str(match['job_id']), {})
+            digest.lines.append(f"You have a {match['score']}% match for {job.get('title', 'a job')}")
+    return [digest for digest in digests.values() if digest.lines]
+
+
+async def deliver(
+    transport: EmailTransport,
+    digest: Digest,
+    limiter: RateLimiter,
+    semaphore: asyncio.Semaphore
+) -> bool:
+    async with semaphore:
+        for attempt in range(settings.outbox_max_retries + 1):
+            await limiter.wait()
+            try:
+                with stage_timer("email_send"):
+                    await transport.send(digest.to, digest.subject, digest.body)
+                EMAILS.inc(status="sent")
+                return True
+            except Exception:
+                EMAILS.inc(status="error")
+                logger.warning(f"Email to user {digest.user_id} failed (attempt {attempt + 1})", exc_info=True)
+                if attempt < settings.outbox_max_retries:
+                    await asyncio.sleep(settings.outbox_backoff_seconds * 2 ** attempt)
+    EMAILS.inc(status="failed")
+    return False
+
+
+async def _fetch_pending(repo: Repository) -> tuple[list[dict], dict, dict]:
+    # Every worker drains on its own schedule; claiming gives each row to one of
+    # them. Ordered by user so a user's queued matches land in the same batch
+    notifications = await repo.claim_pending_notifications(
+        "email", settings.outbox_batch_size, settings.outbox_claim_seconds, columns="id,user_id,match_id"
+    )
+    match_ids = [n['match_id'] for n in notifications if n.get('match_id')]
+    matches = {}
+    if match_ids:
+        rows = await repo.get_matches_by_ids(match_ids, columns="id,job_id,score")
+        matches = {str(row['id']): row for row in rows}
+    jobs = {}
+    if matches:
+        rows = await repo.get_jobs_by_ids([row['job_id'] for row in matches.values()], columns="id,title")
+        jobs = {str(row['id']): row for row in rows}
+    return notifications, matches, jobs
+
+
+async def _mark(repo: Repository, notification_ids: list, status: str):
+    if not notification_ids:
+        return
+    update = {"status": status}
+    if status == "sent":
+        update["sent_at"] = datetime.now(timezone.utc).isoformat()
+    await repo.update_notifications(notification_ids, update)
+
+
+async def dispatch_outbox(transport: Optional[EmailTransport] = None) -> int:
+    """Drain pending email notifications as per-user digests; returns the number of messages sent."""
+    transport = transport or get_transport()
+    repo = get_repository()
+    limiter = RateLimiter(settings.outbox_rate_per_second)
+    semaphore = asyncio.Semaphore(settings.outbox_concurrency)
+    sent_count = 0
+    while True:
+        notifications, matches, jobs = await _fetch_pending(repo)
+        if not notifications:
+            return sent_count
+        digests = build_digests(notifications, matches, jobs)
+        results = await asyncio.gather(*(deliver(transport, digest, limiter, semaphore) for digest in digests))
+
+        sent_ids, failed_ids = [], []
+        for digest, delivered in zip(digests, results):
+            (sent_ids if delivered else failed_ids).extend(digest.notification_ids)
+        # Rows whose match disappeared have nothing left to send
+        digested = set(sent_ids) | set(failed_ids)
+        orphaned = [n['id'] for n in notifications if n['id'] not in digested]
+        await asyncio.gather(_mark(repo, sent_ids, "sent"), _mark(repo, failed_ids + orphaned, "failed"))
+        sent_count += sum(results)
+        if len(notifications) < settings.outbox_batch_size:
+            return sent_count
@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime, timezone
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import stage_timer
+from app.db import get_repository
+from app.services.model_store import load_current_model
+from app.services.persistence import persist_matches
+from app.services.job_index import job_index
+from app.services.resume_index import resume_index
+from app.services.skills import SkillDictionary
+from app.services.vectorize import FittedModel, vectorizer
+
+# Only what scoring needs from each resume
+RESUME_INDEX_COLUMNS = "id,user_id,text_content,skill_text,experience_years,education_level"
+
+
+async def refresh_resume_index(model: FittedModel, skills: SkillDictionary):
+    # Rows touched after this moment are picked up again by the next refresh
+    refreshed_at = datetime.now(timezone.utc).isoformat()
+    repo = get_repository()
+    if resume_index.needs_full_load() or resume_index.refreshed_at is None:
+        resumes = await repo.list_resumes(columns=RESUME_INDEX_COLUMNS)
+        await asyncio.to_thread(resume_index.sync, resumes, model, skills, refreshed_at)
+    else:
+        resumes = await repo.list_resumes(columns=RESUME_INDEX_COLUMNS, updated_since=resume_index.refreshed_at)
+        await asyncio.to_thread(resume_index.upsert, resumes, model, skills, refreshed_at)
+
+
+async def match_new_job(job: dict) -> int:
+    """Score a just-posted job against every resume and store its matches; returns how many were created."""
+    try:
+        if not vectorizer.is_fitted and not await asyncio.to_thread(load_current_model):
+            # No vocabulary yet; the next rescore fits one and covers this job
+            return 0
+        # Resumes keep skill bitsets over the catalog's dictionary, which create_job
+        # already extended with this posting; without a job index use the job's own
+        snapshot = job_index.snapshot()
+        if snapshot is not None and str(job['id']) in snapshot.positions:
+            skills = snapshot.skills
+        else:
+            skills = SkillDictionary.from_jobs([job])
+        await refresh_resume_index(vectorizer.model, skills)
+        with stage_timer("reverse_match"):
+            scored = await asyncio.to_thread(resume_index.match_job, job, settings.match_threshold)
+
+        candidates = []
+        for resume, scores, terms in scored:
+            candidates.append({
+                "user_id": resume['user_id'],
+                "resume_id": resume['id'],
+                "job_id": job['id'],
+                "score": scores['overall'],
+                "top_terms": terms
+            })
+        # A brand-new job has no stored matches, so there is nothing to read first;
+        # the emails are only queued, for the outbox dispatcher
+        inserted = await persist_matches(candidates, existing={})
+        logger.info(f"Job {job['id']} matched {len(inserted)} resumes")
+        return len(inserted)
+    except Exception:
+        logger.exception(f"Reverse matching failed for job {job['id']}")
+        return 0
@@ -1,63 +1,274 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 import asyncio
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from app.services.vectorize import vectorizer
-from app.services.match_score import compute_weighted_score
-from app.api.routers.notifications import send_email
-from supabase import create_client
+from app.services.job_index import job_index
+from app.services.batch_score import score_all
+from app.services.model_store import load_current_model, publish_model
+from app.services.persistence import persist_matches
+from app.workers.coordination import WORKER_ID, LeaseLost, heartbeat, shard_bounds
+from app.workers.state import RescoreWatermark, load_watermark, save_watermark
+from app.workers.outbox import dispatch_outbox
+from app.db import Repository, get_repository
 from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import PAIRS_CONSIDERED, stage_timer
 
-supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
+# Only what scoring needs from each resume
+RESCORE_RESUME_COLUMNS = "id,user_id,text_content,skill_text,experience_years,education_level"
+
+RESCORE_COORDINATOR_LEASE = "rescore:coordinator"
+RESCORE_SHARD_PREFIX = "rescore:run:"
+RESCORE_PLAN_KEY = "rescore:plan"
 
 scheduler = AsyncIOScheduler()
 
-async def periodic_match_rescore():
-    # Get all resumes and jobs
-    resumes = supabase.table("resumes").select("*").execute().data
-    jobs = supabase.table("jobs").select("*").execute().data
 
+def _score(resumes: list[dict], jobs: list[dict], job_matrix, model, job_features=None, skills=None) -> list[tuple[dict, dict, dict, list[str]]]:
+    if not resumes or not jobs:
+        # A shard can be empty, and an incremental run may have nothing changed
+        return []
+    PAIRS_CONSIDERED.inc(len(resumes) * len(jobs), source="rescore")
+    with stage_timer("rescore"):
+        return score_all(
+            resumes,
+            jobs,
+            resume_experience_years=[resume.get('experience_years') for resume in resumes],
+            resume_education_levels=[resume.get('education_level') for resume in resumes],
+            job_matrix=job_matrix,
+            model=model,
+            job_features=job_features,
+            skills=skills,
+            threshold=settings.match_threshold,
+            top_k=settings.rescore_top_k,
+        )
+
+
+def _refresh_index(jobs: list[dict], changed_job_ids: set):
+    # Refit the vocabulary only when there is none yet or enough of the catalog
+    # changed for it to go stale; a refit is what forces a full rescore
+    if not vectorizer.is_fitted or len(changed_job_ids) > settings.rescore_refit_ratio * len(jobs):
+        job_texts = [job['description'] for job in jobs]
+        vectorizer.fit(job_texts)
+    previous = job_index.snapshot()
+    job_index.sync(jobs)
+    snapshot = job_index.snapshot()
+    if snapshot is not previous:
+        # Share the refreshed vocabulary and job matrix with the other workers
+        publish_model()
+    return snapshot
+
+
+@dataclass
+class RescorePlan:
+    """One rescore run as the coordinator planned it, shared with every worker."""
+    run_id: str
+    # Becomes the watermark once every shard is done
+    run_started_at: str
+    # Watermark of the previous run; None rescores every pair
+    last_run_at: Optional[str]
+    model_version: str
+    changed_job_ids: list[str]
+    shards: int
+    finished: bool = False
+
+    def shard_lease(self, shard: int) -> str:
+        return f"{RESCORE_SHARD_PREFIX}{self.run_id}:shard:{shard}"
+
+
+async def _plan_run(repo, watermark: RescoreWatermark) -> Optional[RescorePlan]:
+    # Rows touched after this moment are picked up again by the next run
+    run_started_at = datetime.now(timezone.utc).isoformat()
+
+    if watermark.last_run_at:
+        jobs, changed_jobs = await asyncio.gather(
+            repo.list_jobs(),
+            repo.list_jobs(columns="id", updated_since=watermark.last_run_at),
+        )
+    else:
+        jobs, changed_jobs = await repo.list_jobs(), []
     if not jobs:
-        return
+        return None
+    changed_job_ids = {str(job['id']) for job in changed_jobs}
+
+    # Fitting is CPU-bound, so it runs off the event loop; the refreshed model
+    # and job matrix are published for the workers that take shards
+    await asyncio.to_thread(_refresh_index, jobs, changed_job_ids)
+
+    full_rebuild = watermark.last_run_at is None or watermark.model_version != vectorizer.version
+    return RescorePlan(
+        run_id=uuid.uuid4().hex[:12],
+        run_started_at=run_started_at,
+        last_run_at=None if full_rebuild else watermark.last_run_at,
+        model_version=vectorizer.version,
+        changed_job_ids=sorted(changed_job_ids),
+        shards=max(1, settings.rescore_shards),
+    )
 
-    # Fit vectorizer
-    job_texts = [job['description'] for job in jobs]
-    vectorizer.fit(job_texts)
-
-    for resume in resumes:
-        for job in jobs:
-            scores = compute_weighted_score(
-                resume['text_content'],
-                job['description'],
-                job['skills'],
-                job.get('experience_years'),
-                job.get('education_level'),
-                5,  # Placeholder
-                'bachelor'
+
+async def _rescore_shard(plan: RescorePlan, shard: int):
+    """Score one shard of resumes and store its new matches.
+
+    Shards are disjoint by resume id, so no two workers ever write the same
+    (user, resume, job) pair.
+    """
+    repo = get_repository()
+    snapshot = job_index.snapshot()
+    resumes = await repo.list_resumes(
+        columns=RESCORE_RESUME_COLUMNS + ",updated_at", id_range=shard_bounds(shard, plan.shards)
+    )
+
+    if plan.last_run_at is None:
+        scored = await asyncio.to_thread(
+            _score, resumes, snapshot.jobs, snapshot.matrix, snapshot.model, snapshot.features, snapshot.skills
+        )
+    else:
+        changed = [resume for resume in resumes if resume['updated_at'] > plan.last_run_at]
+        unchanged = [resume for resume in resumes if resume['updated_at'] <= plan.last_run_at]
+        # New or edited resumes against every job...
+        scored = await asyncio.to_thread(
+            _score, changed, snapshot.jobs, snapshot.matrix, snapshot.model, snapshot.features, snapshot.skills
+        )
+        # ...and every other resume against only the new or edited jobs
+        rows = [snapshot.positions[job_id] for job_id in plan.changed_job_ids if job_id in snapshot.positions]
+        if rows and unchanged:
+            scored += await asyncio.to_thread(
+                _score, unchanged, [snapshot.jobs[row] for row in rows], snapshot.matrix[rows], snapshot.model,
+                snapshot.features.take(rows), snapshot.skills
             )
-            if scores['overall'] >= 70:
-                # Check if match already exists
-                existing = supabase.table("matches").select("*").eq("user_id", resume['user_id']).eq("resume_id", resume['id']).eq("job_id", job['id']).execute()
-                if not existing.data:
-                    match_data = {
-                        "user_id": resume['user_id'],
-                        "resume_id": resume['id'],
-                        "job_id": job['id'],
-                        "score": scores['overall'],
-                        "top_terms": []
-                    }
-                    supabase.table("matches").insert(match_data).execute()
-                    # Notification
-                    notification_data = {
-                        "user_id": resume['user_id'],
-                        "match_id": None,
-                        "type": "in_app",
-                        "sent_at": None,
-                        "status": "pending"
-                    }
-                    supabase.table("notifications").insert(notification_data).execute()
-                    # Email
-                    send_email("user@example.com", "New Job Match!", f"You have a {scores['overall']}% match for {job['title']}")
+
+    candidates = []
+    for resume, job, scores, terms in scored:
+        candidates.append({
+            "user_id": resume['user_id'],
+            "resume_id": resume['id'],
+            "job_id": job['id'],
+            "score": scores['overall'],
+            "top_terms": terms
+        })
+    # Existing pairs are read for this shard's matched resumes only; queues the
+    # emails too, for the outbox dispatcher
+    await persist_matches(candidates)
+
+
+async def _work_on_shards(repo: Repository, plan: RescorePlan, wait: bool = False) -> bool:
+    """Claim and score unfinished shards until none is left to claim.
+
+    With ``wait`` (the coordinator), keep polling until every shard is done,
+    taking over shards whose worker let its lease expire. Returns whether all
+    shards are done.
+    """
+    # Unique per call: the coordinator and the poller may share a process
+    holder = f"{WORKER_ID}:{uuid.uuid4().hex[:8]}"
+    names = [plan.shard_lease(shard) for shard in range(plan.shards)]
+    while True:
+        done = await repo.list_completed_leases(names)
+        for shard, name in enumerate(names):
+            if name in done or not await repo.acquire_lease(name, holder, settings.rescore_lease_seconds):
+                continue
+            try:
+                async with heartbeat(repo, {name: holder}, settings.rescore_lease_seconds):
+                    await _rescore_shard(plan, shard)
+            except LeaseLost:
+                # Another worker took the shard over after this one stalled; it finishes it
+                continue
+            except Exception:
+                # Released so another worker can retry it; the coordinator gives up on the run
+                await repo.release_lease(name, holder)
+                if wait:
+                    raise
+                logger.exception(f"Rescore shard {shard} of run {plan.run_id} failed")
+                continue
+            await repo.complete_lease(name, holder)
+            done.add(name)
+        if len(done) == len(names):
+            return True
+        if not wait:
+            return False
+        await asyncio.sleep(settings.rescore_poll_seconds)
+
+
+def _run_due(watermark: RescoreWatermark) -> bool:
+    if watermark.last_run_at is None:
+        return True
+    elapsed = datetime.now(timezone.utc) - datetime.fromisoformat(watermark.last_run_at)
+    return elapsed >= timedelta(seconds=settings.rescore_interval_seconds)
+
+
+async def _finish_plan(repo: Repository, plan: RescorePlan):
+    # Skipped if another coordinator has published a newer plan meanwhile,
+    # which happens when this one lost its lease
+    current = await repo.get_state(RESCORE_PLAN_KEY)
+    if current is None or current['run_id'] == plan.run_id:
+        plan.finished = True
+        await repo.set_state(RESCORE_PLAN_KEY, asdict(plan))
+
+
+async def periodic_match_rescore():
+    """Checked on every worker; the holder of the coordinator lease runs it when due.
+
+    Leases, the plan and the watermark live in the repository, so one run
+    covers every worker on every node sharing it. A run is due once
+    rescore_interval_seconds have passed since the last completed one started,
+    whichever worker's check notices first. The coordinator refreshes the
+    model, publishes a plan splitting the resumes into id-range shards, and
+    works on shards itself while the other workers claim the rest through
+    rescore_shard_worker. The watermark advances once every shard is done.
+    """
+    repo = get_repository()
+    if not await repo.acquire_lease(RESCORE_COORDINATOR_LEASE, WORKER_ID, settings.rescore_lease_seconds):
+        return
+    try:
+        # Held through the refit and the whole run, so another worker's check
+        # cannot plan a second run and delete this one's shard leases
+        async with heartbeat(repo, {RESCORE_COORDINATOR_LEASE: WORKER_ID}, settings.rescore_lease_seconds):
+            # Read under the lease: a run that just finished elsewhere is seen here
+            watermark = await load_watermark(repo)
+            if not _run_due(watermark):
+                return
+            plan = await _plan_run(repo, watermark)
+            if plan is None:
+                return
+            await repo.delete_leases(RESCORE_SHARD_PREFIX, f"{RESCORE_SHARD_PREFIX}{plan.run_id}:")
+            await repo.set_state(RESCORE_PLAN_KEY, asdict(plan))
+            try:
+                await _work_on_shards(repo, plan, wait=True)
+                await save_watermark(repo, RescoreWatermark(last_run_at=plan.run_started_at, model_version=plan.model_version))
+            finally:
+                # Finished or failed, the other workers stop looking for its shards;
+                # a failed run leaves the watermark, so the next check retries it
+                await _finish_plan(repo, plan)
+    except LeaseLost:
+        # Another worker took over as coordinator and owns the rescore from here
+        pass
+    finally:
+        await repo.release_lease(RESCORE_COORDINATOR_LEASE, WORKER_ID)
+
+
+async def rescore_shard_worker():
+    """Polled on every worker: help with the shards of a running rescore."""
+    repo = get_repository()
+    state = await repo.get_state(RESCORE_PLAN_KEY)
+    if state is None or state['finished']:
+        return
+    plan = RescorePlan(**state)
+    # Shards must be scored with the coordinator's model and job matrix
+    if vectorizer.version != plan.model_version:
+        await asyncio.to_thread(load_current_model)
+    if vectorizer.version != plan.model_version or job_index.snapshot() is None:
+        return
+    await _work_on_shards(repo, plan)
+
 
 def start_scheduler():
-    scheduler.add_job(periodic_match_rescore, IntervalTrigger(hours=24))  # Daily
-    scheduler.start()
\ No newline at end of file
+    # Checked often; runs only once rescore_interval_seconds have passed since the last one
+    scheduler.add_job(periodic_match_rescore, IntervalTrigger(seconds=settings.rescore_check_seconds), max_instances=1)
+    scheduler.add_job(rescore_shard_worker, IntervalTrigger(seconds=settings.rescore_poll_seconds), max_instances=1)
+    # Pick up artifacts published by whichever worker ran the rescore
+    scheduler.add_job(load_current_model, IntervalTrigger(seconds=settings.model_refresh_seconds))
+    scheduler.add_job(dispatch_outbox, IntervalTrigger(seconds=settings.outbox_poll_seconds), max_instances=1)
+    scheduler.start()
@@ -0,0 +1,25 @@
+from dataclasses import asdict, dataclass
+from typing import Optional
+from app.db import Repository
+
+RESCORE_WATERMARK_KEY = "rescore:watermark"
+
+
+@dataclass
+class RescoreWatermark:
+    # ISO timestamp taken when the last successful run started, and the
+    # vectorizer version its scores were computed with
+    last_run_at: Optional[str] = None
+    model_version: Optional[str] = None
+
+
+async def load_watermark(repo: Repository) -> RescoreWatermark:
+    # Kept in the repository's shared state, so every node sees the same one
+    try:
+        return RescoreWatermark(**(await repo.get_state(RESCORE_WATERMARK_KEY) or {}))
+    except TypeError:
+        return RescoreWatermark()
+
+
+async def save_watermark(repo: Repository, watermark: RescoreWatermark):
+    await repo.set_state(RESCORE_WATERMARK_KEY, asdict(watermark))
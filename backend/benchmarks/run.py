@@ -0,0 +1,201 @@
+"""Benchmarks for the matching pipeline on a seeded synthetic corpus.
+
+    python -m benchmarks.run --resumes 1000 --jobs 2000 --output results.json
+
+Runs against the in-memory storage backend by default (``--backend sqlite``
+for the SQLite one), so no network is involved.
+
+Each stage reports throughput, latency percentiles and peak traced memory as
+JSON, so two runs can be diffed to spot regressions.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Optional
+import numpy as np
+
+
+def _percentiles(latencies: list[float]) -> dict:
+    values = np.asarray(latencies) * 1000
+    return {
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p95": round(float(np.percentile(values, 95)), 3),
+        "p99": round(float(np.percentile(values, 99)), 3),
+        "max": round(float(values.max()), 3),
+    }
+
+
+def measure(operation: Callable, items: list, units_per_item: int = 1, memory: bool = True) -> dict:
+    """Time ``operation`` once per item, then (optionally) repeat the pass under
+    tracemalloc for its peak memory, so tracing never skews the timings."""
+    latencies = []
+    started = time.perf_counter()
+    for item in items:
+        call_started = time.perf_counter()
+        operation(item)
+        latencies.append(time.perf_counter() - call_started)
+    total = time.perf_counter() - started
+
+    result = {
+        "count": len(items),
+        "total_seconds": round(total, 4),
+        "throughput_per_second": round(len(items) * units_per_item / total, 2) if total else None,
+        "latency_ms": _percentiles(latencies),
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            for item in items:
+                operation(item)
+            result["peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(
+    resumes: int = 200,
+    jobs: int = 500,
+    seed: int = 0,
+    requests: int = 20,
+    pairs: int = 200,
+    memory: bool = True,
+    data_dir: Optional[str] = None,
+    backend: str = "memory",
+    top_k: int = 10,
+) -> dict:
+    from fastapi.testclient import TestClient
+    from app.core.config import settings
+    from app.core.security import verify_token
+    from app.db import create_repository
+    from app.db import repository as repository_module
+    from app.main import app
+    from app.services.catalog import job_catalog
+    from app.services.job_index import job_index
+    from app.services.match_score import compute_weighted_score
+    from app.services.preprocess import preprocess_text
+    from app.services.vectorize import vectorizer
+    from app.workers.scheduler import periodic_match_rescore
+    from app.workers.state import RescoreWatermark, save_watermark
+    from benchmarks.synthetic import generate_jobs, generate_resumes
+
+    settings.data_dir = data_dir or tempfile.mkdtemp(prefix="bench-")
+    job_rows = generate_jobs(jobs, seed)
+    resume_rows, raw_texts = generate_resumes(resumes, seed)
+    repo = create_repository(backend)
+    asyncio.run(repo.insert_jobs(job_rows))
+    asyncio.run(repo.insert_resumes(resume_rows))
+    rng = random.Random(seed)
+    stages = {}
+
+    stages["preprocess_text"] = measure(preprocess_text, raw_texts, memory=memory)
+
+    descriptions = [job['description'] for job in job_rows]
+    stages["vectorizer_fit"] = measure(lambda texts: vectorizer.fit(texts), [descriptions], len(descriptions), memory)
+    resume_texts = [resume['text_content'] for resume in resume_rows]
+    stages["vectorizer_transform"] = measure(vectorizer.transform, resume_texts, memory=memory)
+
+    sampled_pairs = [(rng.choice(resume_rows), rng.choice(job_rows)) for _ in range(pairs)]
+    stages["compute_weighted_score"] = measure(
+        lambda pair: compute_weighted_score(
+            pair[0]['text_content'], pair[1]['description'], pair[1]['skills'],
+            pair[1]['experience_years'], pair[1]['education_level'],
+            pair[0]['experience_years'], pair[0]['education_level'],
+        ),
+        sampled_pairs,
+        memory=memory,
+    )
+
+    # The API and the workers all reach the local repository; requests are
+    # authenticated as the owner of the resume being matched
+    current_user = {}
+    repository_module._repository = repo
+    app.dependency_overrides[verify_token] = lambda: current_user["id"]
+    job_catalog.invalidate()
+    job_index.install(None)
+    try:
+        client = TestClient(app)
+
+        def post_match(resume: dict):
+            current_user["id"] = resume['user_id']
+            response = client.post("/api/v1/matches", json={"resume_id": resume['id']})
+            response.raise_for_status()
+
+        # One warm-up request builds the job index, like the first request after a deploy
+        post_match(resume_rows[0])
+        stages["post_matches"] = measure(post_match, rng.sample(resume_rows, min(requests, len(resume_rows))), memory=memory)
+
+        # Top-k retrieval against the index the requests built: the candidate
+        # search with retrieval_query_terms, and the exhaustive scoring it replaces
+        queries = [resume['text_content'] for resume in rng.sample(resume_rows, min(requests, len(resume_rows)))]
+        stages["top_k_exhaustive"] = measure(lambda text: job_index.score(text, top_k=top_k, exhaustive=True), queries, memory=memory)
+        stages["top_k_retrieval"] = measure(lambda text: job_index.score(text, top_k=top_k), queries, memory=memory)
+        stages["top_k_retrieval"]["recall"] = round(job_index.measure_recall(queries, top_k), 4)
+        stages["top_k_retrieval"]["query_terms"] = settings.retrieval_query_terms
+
+        def rescore(_):
+            # Every run starts from scratch: no watermark, so a full R x J rescore
+            asyncio.run(save_watermark(repo, RescoreWatermark()))
+            asyncio.run(periodic_match_rescore())
+
+        stages["periodic_match_rescore"] = measure(rescore, [None], len(resume_rows) * len(job_rows), memory)
+        stages["periodic_match_rescore"]["units"] = "resume-job pairs"
+    finally:
+        app.dependency_overrides.clear()
+        repository_module._repository = None
+        matches_stored = len(asyncio.run(repo.list_matches(columns="id")))
+        asyncio.run(repo.close())
+        job_catalog.invalidate()
+        job_index.install(None)
+        vectorizer.install(None)
+
+    return {
+        "config": {
+            "resumes": resumes, "jobs": jobs, "seed": seed, "requests": requests, "pairs": pairs, "backend": backend,
+            "top_k": top_k,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "stages": stages,
+        "matches_stored": matches_stored,
+    }
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=20, help="POST /matches calls to time")
+    parser.add_argument("--pairs", type=int, default=200, help="compute_weighted_score calls to time")
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory", help="storage backend")
+    parser.add_argument("--top-k", type=int, default=10, help="matches per resume for the retrieval stages")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        resumes=args.resumes, jobs=args.jobs, seed=args.seed,
+        requests=args.requests, pairs=args.pairs, memory=not args.no_memory, backend=args.backend, top_k=args.top_k,
+    )
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import random
+import uuid
+from datetime import datetime, timezone
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "SQL", "PostgreSQL", "MongoDB", "Redis",
+    "Docker", "Kubernetes", "AWS", "Terraform", "React", "Vue", "Node.js", "FastAPI", "Django", "Spark",
+    "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "scikit-learn", "Statistics", "Tableau",
+    "Excel", "Accounting", "Sales", "Marketing", "SEO", "Figma", "Project Management", "Scrum",
+    "Patient Care", "Registered Nurse", "Pharmacology", "Teaching", "Customer Service",
+]
+TITLES = [
+    "Backend Engineer", "Frontend Developer", "Data Scientist", "Data Engineer", "DevOps Engineer",
+    "Machine Learning Engineer", "Product Designer", "Accountant", "Sales Manager", "Marketing Specialist",
+    "Nurse", "Teacher", "Project Manager", "Support Specialist", "Business Analyst",
+]
+VERBS = ["built", "designed", "maintained", "led", "optimized", "migrated", "launched", "automated", "analyzed", "delivered"]
+NOUNS = [
+    "platform", "pipeline", "dashboard", "service", "team", "campaign", "budget", "workflow", "model", "api",
+    "infrastructure", "reports", "ward", "curriculum", "customers", "integration", "database", "release",
+]
+FILLER = [
+    "collaborated", "stakeholders", "scalable", "reliable", "customer", "quality", "growth", "agile", "cloud",
+    "performance", "security", "strategy", "research", "operations", "mentoring", "documentation", "testing",
+]
+DEGREES = ["High school diploma", "Bachelor of Science", "B.A. in Economics", "Master of Science", "MBA", "Ph.D."]
+EDUCATION_LEVELS = [None, "high school", "bachelor", "master", "phd"]
+LOCATIONS = ["Remote", "Berlin", "London", "New York", "Bangalore", "Toronto", "Sydney"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _sentence(rng: random.Random, skills: list[str]) -> str:
+    words = [rng.choice(VERBS), rng.choice(NOUNS), "with", rng.choice(skills)]
+    words += rng.sample(FILLER, rng.randint(2, 6))
+    return " ".join(words).capitalize() + "."
+
+
+def generate_jobs(count: int, seed: int = 0) -> list[dict]:
+    """Job rows shaped like the jobs table, reproducible for a given seed."""
+    rng = random.Random(seed)
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat()
+    jobs = []
+    for _ in range(count):
+        skills = rng.sample(SKILLS, rng.randint(3, 8))
+        jobs.append({
+            "id": _uuid(rng),
+            "title": rng.choice(TITLES),
+            "description": " ".join(_sentence(rng, skills) for _ in range(rng.randint(4, 12))),
+            "skills": skills,
+            "experience_years": rng.choice([None, 1, 2, 3, 5, 7, 10]),
+            "education_level": rng.choice(EDUCATION_LEVELS),
+            "location": rng.choice(LOCATIONS),
+            "created_at": created_at,
+        })
+    return jobs
+
+
+def generate_resume_texts(count: int, seed: int = 0) -> list[str]:
+    """Raw resume text as it comes out of a PDF: work history with date ranges, skills, a degree."""
+    rng = random.Random(seed + 1)
+    texts = []
+    for _ in range(count):
+        skills = rng.sample(SKILLS, rng.randint(4, 12))
+        lines = [f"{rng.choice(TITLES)} | {rng.choice(LOCATIONS)}", f"Skills: {', '.join(skills)}"]
+        year = rng.randint(2000, 2018)
+        for _ in range(rng.randint(1, 4)):
+            end = min(year + rng.randint(1, 5), 2024)
+            lines.append(f"{rng.choice(TITLES)}, {rng.choice(MONTHS)} {year} - {rng.choice(MONTHS)} {end}")
+            lines += [_sentence(rng, skills) for _ in range(rng.randint(3, 8))]
+            year = end
+        lines.append(rng.choice(DEGREES))
+        texts.append("\n".join(lines))
+    return texts
+
+
+def generate_resumes(count: int, seed: int = 0, users: int = None) -> tuple[list[dict], list[str]]:
+    """Resume rows (preprocessed text and extracted columns, as upload_resume stores them) and their raw texts."""
+    from app.services.preprocess import preprocess_text
+    from app.services.resume_features import extract_resume_features
+
+    rng = random.Random(seed + 2)
+    user_ids = [_uuid(rng) for _ in range(users or max(1, count // 2))]
+    raw_texts = generate_resume_texts(count, seed)
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat()
+    resumes = []
+    for i, raw_text in enumerate(raw_texts):
+        resumes.append({
+            "id": _uuid(rng),
+            "user_id": user_ids[i % len(user_ids)],
+            "filename": f"resume-{i}.pdf",
+            "text_content": preprocess_text(raw_text),
+            "created_at": created_at,
+            **extract_resume_features(raw_text),
+        })
+    return resumes, raw_texts
@@ -5,6 +5,7 @@ import os
 from dotenv import load_dotenv
 import requests
 import json
+import time
 from io import BytesIO
 
 # Load environment variables
@@ -16,7 +17,10 @@ SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
 
 # Backend URL
-BACKEND_URL = "http://localhost:8000"
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+API_URL = f"{BACKEND_URL}/api/v1"
+# How long a fetched dashboard is reused across reruns; actions that change it clear the cache
+DASHBOARD_TTL_SECONDS = 30
 
 # Streamlit page config
 st.set_page_config(page_title="Job Matching System", page_icon=":briefcase:", layout="wide")
@@ -72,8 +76,40 @@ def logout_user():
     supabase.auth.sign_out()
     st.session_state.logged_in = False
     st.session_state.user = None
+    st.session_state.session = None
+    refresh_dashboard()
     st.rerun()
 
+def access_token():
+    # Kept in session state, so a rerun only asks Supabase again once the token is about to expire
+    session = st.session_state.get("session")
+    if session is None or (session.expires_at and session.expires_at - 60 < time.time()):
+        session = supabase.auth.get_session()
+        st.session_state.session = session
+    return session.access_token
+
+# Backend calls
+@st.cache_resource
+def http_session():
+    # One pooled connection to the backend, reused by every rerun
+    return requests.Session()
+
+def api(method, path, **kwargs):
+    headers = {"Authorization": f"Bearer {access_token()}"}
+    return http_session().request(method, f"{API_URL}{path}", headers=headers, timeout=30, **kwargs)
+
+@st.cache_data(ttl=DASHBOARD_TTL_SECONDS, show_spinner=False)
+def fetch_dashboard(token, version):
+    # Keyed by token, so users never see each other's cached data, and by the
+    # session's version, so refresh_dashboard() makes only this session fetch again
+    response = http_session().get(f"{API_URL}/dashboard", headers={"Authorization": f"Bearer {token}"}, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+def refresh_dashboard():
+    # fetch_dashboard.clear() would drop every user's cached dashboard on this server
+    st.session_state.dashboard_version = st.session_state.get("dashboard_version", 0) + 1
+
 # Main app
 def main():
     if 'logged_in' not in st.session_state:
@@ -95,6 +131,7 @@ def main():
                 if response:
                     st.session_state.logged_in = True
                     st.session_state.user = response.user
+                    st.session_state.session = response.session
                     st.success("Logged in successfully!")
                     st.rerun()
 
@@ -115,78 +152,71 @@ def dashboard():
     if st.button("Logout"):
         logout_user()
 
+    # One request for everything below, reused across reruns for DASHBOARD_TTL_SECONDS
+    try:
+        data = fetch_dashboard(access_token(), st.session_state.get("dashboard_version", 0))
+    except Exception as e:
+        st.error(f"Failed to load dashboard: {str(e)}")
+        return
+    if st.button("Refresh"):
+        refresh_dashboard()
+        st.rerun()
+
     st.header("Upload Resume")
     uploaded_file = st.file_uploader("Choose a PDF resume", type="pdf")
     if uploaded_file is not None and st.button("Upload Resume"):
         try:
-            # Get access token
-            session = supabase.auth.get_session()
-            access_token = session.access_token
-
-            # Prepare file
             files = {"file": (uploaded_file.name, uploaded_file.getvalue(), "application/pdf")}
-            headers = {"Authorization": f"Bearer {access_token}"}
-
-            response = requests.post(f"{BACKEND_URL}/resumes/upload", files=files, headers=headers)
+            response = api("POST", "/resumes", files=files)
             if response.status_code == 200:
                 st.success("Resume uploaded successfully!")
+                refresh_dashboard()
             else:
                 st.error(f"Upload failed: {response.text}")
         except Exception as e:
             st.error(f"Error: {str(e)}")
 
     st.header("Compute Matches")
-    if st.button("Find Matching Jobs"):
-        try:
-            session = supabase.auth.get_session()
-            access_token = session.access_token
-            headers = {"Authorization": f"Bearer {access_token}"}
-
-            response = requests.post(f"{BACKEND_URL}/matches/compute", headers=headers)
-            if response.status_code == 200:
-                st.success("Matches computed!")
-            else:
-                st.error(f"Failed to compute matches: {response.text}")
-        except Exception as e:
-            st.error(f"Error: {str(e)}")
-
-    st.header("Your Matches")
-    try:
-        session = supabase.auth.get_session()
-        access_token = session.access_token
-        headers = {"Authorization": f"Bearer {access_token}"}
-
-        response = requests.get(f"{BACKEND_URL}/matches/", headers=headers)
-        if response.status_code == 200:
-            matches = response.json()
-            if matches:
-                for match in matches:
-                    st.write(f"Job: {match['job_title']} - Score: {match['score']:.2f}")
-            else:
-                st.write("No matches found.")
-        else:
-            st.error("Failed to fetch matches.")
-    except Exception as e:
-        st.error(f"Error: {str(e)}")
-
-    st.header("Notifications")
-    try:
-        session = supabase.auth.get_session()
-        access_token = session.access_token
-        headers = {"Authorization": f"Bearer {access_token}"}
-
-        response = requests.get(f"{BACKEND_URL}/notifications/", headers=headers)
-        if response.status_code == 200:
-            notifications = response.json()
-            if notifications:
-                for notif in notifications:
-                    st.write(f"{notif['message']} - {notif['created_at']}")
-            else:
-                st.write("No notifications.")
-        else:
-            st.error("Failed to fetch notifications.")
-    except Exception as e:
-        st.error(f"Error: {str(e)}")
+    resumes = {f"{resume['filename']} ({resume['created_at'][:10]})": resume['id'] for resume in data['resumes']}
+    if not resumes:
+        st.write("Upload a resume first.")
+    else:
+        selected = st.selectbox("Resume", list(resumes))
+        if st.button("Find Matching Jobs"):
+            try:
+                response = api("POST", "/matches", json={"resume_id": resumes[selected]})
+                if response.status_code == 200:
+                    st.success(f"Matches computed! {len(response.json())} jobs match.")
+                    refresh_dashboard()
+                else:
+                    st.error(f"Failed to compute matches: {response.text}")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+
+    st.header(f"Your Matches ({data['counts']['matches']})")
+    if data['matches']:
+        for match in data['matches']:
+            st.write(f"Job: {match['job_title']} - Score: {match['score']:.2f}")
+    else:
+        st.write("No matches found.")
+
+    st.header(f"Notifications ({data['counts']['unread_notifications']} unread)")
+    if data['notifications']:
+        for notif in data['notifications']:
+            score = f" ({notif['score']:.0f}%)" if notif['score'] is not None else ""
+            st.write(f"New match: {notif['job_title']}{score} - {notif['created_at']}")
+        if data['counts']['unread_notifications'] and st.button("Mark all as read"):
+            try:
+                response = api("POST", "/notifications/read", json={})
+                if response.status_code == 200:
+                    refresh_dashboard()
+                    st.rerun()
+                else:
+                    st.error(f"Failed to update notifications: {response.text}")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+    else:
+        st.write("No notifications.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
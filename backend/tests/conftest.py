@@ -0,0 +1,34 @@
+import os
+import pytest
+
+# Tests never reach a live Supabase project; set before app.core.config is imported
+os.environ["STORAGE_BACKEND"] = "memory"
+
+
+@pytest.fixture
+def memory_repo(tmp_path, monkeypatch):
+    """A fresh in-memory repository behind get_repository, for tests that go through the app.
+
+    Requests authenticate as "u1", and data_dir is a temporary directory. The
+    job catalog, index and model are reset afterwards, so no state leaks into
+    other tests.
+    """
+    from app.core.config import settings
+    from app.core.security import verify_token
+    from app.db import create_repository
+    from app.db import repository as repository_module
+    from app.main import app
+    from app.services.catalog import job_catalog
+    from app.services.job_index import job_index
+    from app.services.vectorize import vectorizer
+
+    monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+    repo = create_repository("memory")
+    monkeypatch.setattr(repository_module, "_repository", repo)
+    app.dependency_overrides[verify_token] = lambda: "u1"
+    job_catalog.invalidate()
+    yield repo
+    app.dependency_overrides.clear()
+    job_catalog.invalidate()
+    job_index.install(None)
+    vectorizer.install(None)
@@ -0,0 +1,18 @@
+from benchmarks.run import run_benchmarks
+from benchmarks.synthetic import generate_jobs
+
+
+def test_generator_is_seeded():
+    assert generate_jobs(5, seed=1) == generate_jobs(5, seed=1)
+    assert generate_jobs(5, seed=1) != generate_jobs(5, seed=2)
+
+
+def test_benchmarks_run_offline(tmp_path):
+    results = run_benchmarks(resumes=20, jobs=30, requests=3, pairs=5, memory=False, data_dir=str(tmp_path))
+    assert set(results["stages"]) == {
+        "preprocess_text", "vectorizer_fit", "vectorizer_transform",
+        "compute_weighted_score", "post_matches", "top_k_exhaustive", "top_k_retrieval", "periodic_match_rescore",
+    }
+    for stage in results["stages"].values():
+        assert stage["latency_ms"]["p50"] <= stage["latency_ms"]["p99"]
+    assert results["matches_stored"] > 0
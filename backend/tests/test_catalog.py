@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db import get_repository
+from app.api.routers.jobs import JOB_FIELDS
+from app.services.catalog import job_catalog
+
+
+class CatalogRepository:
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.reads = 0
+
+    async def list_jobs(self):
+        self.reads += 1
+        return list(self.jobs)
+
+
+@pytest.fixture
+def repo():
+    jobs = [
+        {"id": f"00000000-0000-0000-0000-00000000000{i}", "title": f"Job {i}", "description": "d", "skills": [],
+         "experience_years": None, "education_level": None, "location": None, "created_at": "2024-01-01"}
+        for i in range(5)
+    ]
+    repo = CatalogRepository(jobs)
+    app.dependency_overrides[get_repository] = lambda: repo
+    job_catalog.invalidate()
+    yield repo
+    app.dependency_overrides.clear()
+    job_catalog.invalidate()
+
+
+def test_jobs_keyset_pagination_and_projection(repo):
+    client = TestClient(app)
+    first = client.get("/api/v1/jobs", params={"limit": 2, "fields": "id,title"})
+    assert first.status_code == 200
+    assert [job["title"] for job in first.json()] == ["Job 0", "Job 1"]
+    assert set(first.json()[0]) == {"id", "title"}
+
+    second = client.get("/api/v1/jobs", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [job["title"] for job in second.json()] == ["Job 2", "Job 3"]
+    assert repo.reads == 1
+
+    assert client.get("/api/v1/jobs", params={"fields": "salary"}).status_code == 400
+
+
+def test_jobs_etag_revalidation(repo):
+    client = TestClient(app)
+    response = client.get("/api/v1/jobs")
+    etag = response.headers["ETag"]
+    assert client.get("/api/v1/jobs", headers={"If-None-Match": etag}).status_code == 304
+
+    repo.jobs.append(dict(repo.jobs[0], id="00000000-0000-0000-0000-000000000009"))
+    job_catalog.invalidate()
+    assert client.get("/api/v1/jobs", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_jobs_etag_accepts_lists_and_weak_tags(repo):
+    client = TestClient(app)
+    etag = client.get("/api/v1/jobs").headers["ETag"]
+    strong = etag.removeprefix("W/")
+    for header in (f'"other", {etag}', strong, f'"a",{strong}', "*"):
+        assert client.get("/api/v1/jobs", headers={"If-None-Match": header}).status_code == 304
+    assert client.get("/api/v1/jobs", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_jobs_response_is_typed(repo):
+    repo.jobs[0]["internal_note"] = "x"
+    body = TestClient(app).get("/api/v1/jobs", params={"limit": 1}).json()
+    assert set(body[0]) == JOB_FIELDS
+
+
+def test_invalidation_discards_a_load_already_in_flight(repo):
+    asyncio.run(_invalidate_during_load(repo))
+
+
+async def _invalidate_during_load(repo):
+    started, release = asyncio.Event(), asyncio.Event()
+    list_jobs = repo.list_jobs
+
+    async def slow_list_jobs():
+        jobs = await list_jobs()
+        started.set()
+        await release.wait()
+        return jobs
+
+    repo.list_jobs = slow_list_jobs
+    load = asyncio.create_task(job_catalog.get_all(repo))
+    await started.wait()
+    repo.jobs.append(dict(repo.jobs[0], id="00000000-0000-0000-0000-000000000009"))
+    job_catalog.invalidate()
+    release.set()
+    assert len(await load) == 5
+
+    repo.list_jobs = list_jobs
+    assert len(await job_catalog.get_all(repo)) == 6
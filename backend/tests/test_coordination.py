@@ -0,0 +1,142 @@
+import asyncio
+import uuid
+import pytest
+from app.core.config import settings
+from app.db.memory import MemoryRepository
+from app.db.sqlite import SQLiteRepository
+from app.workers.coordination import LeaseLost, heartbeat, shard_bounds
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo(request):
+    repo = MemoryRepository() if request.param == "memory" else SQLiteRepository(":memory:")
+    yield repo
+    asyncio.run(repo.close())
+
+
+def test_leases_are_exclusive_until_they_expire(repo):
+    async def scenario():
+        assert await repo.acquire_lease("rescore:coordinator", "a", ttl=60)
+        assert not await repo.acquire_lease("rescore:coordinator", "b", ttl=60)
+        # The holder can extend its own lease
+        assert await repo.acquire_lease("rescore:coordinator", "a", ttl=60)
+
+        assert await repo.acquire_lease("shard:0", "a", ttl=-1)
+        assert await repo.acquire_lease("shard:0", "b", ttl=60)
+        await repo.complete_lease("shard:0", "b")
+        assert not await repo.acquire_lease("shard:0", "a", ttl=60)
+        assert await repo.list_completed_leases(["shard:0", "shard:1"]) == {"shard:0"}
+
+        await repo.release_lease("rescore:coordinator", "b")
+        assert not await repo.acquire_lease("rescore:coordinator", "b", ttl=60)
+        await repo.release_lease("rescore:coordinator", "a")
+        assert await repo.acquire_lease("rescore:coordinator", "b", ttl=60)
+
+        await repo.delete_leases("shard:", keep="shard:1")
+        assert await repo.list_completed_leases(["shard:0"]) == set()
+
+        assert await repo.get_state("plan") is None
+        await repo.set_state("plan", {"run_id": "r1", "shards": [1, 2]})
+        await repo.set_state("plan", {"run_id": "r2", "shards": [3]})
+        assert await repo.get_state("plan") == {"run_id": "r2", "shards": [3]}
+    asyncio.run(scenario())
+
+
+def test_heartbeat_keeps_a_lease_past_its_ttl(repo):
+    async def scenario():
+        assert await repo.acquire_lease("shard:0", "a", ttl=0.3)
+        async with heartbeat(repo, {"shard:0": "a"}, ttl=0.3):
+            await asyncio.sleep(0.6)
+            return await repo.acquire_lease("shard:0", "b", ttl=60)
+
+    assert not asyncio.run(scenario())
+
+
+def test_heartbeat_aborts_the_work_when_its_lease_is_lost(repo):
+    finished = []
+
+    async def scenario():
+        assert await repo.acquire_lease("shard:0", "a", ttl=0.3)
+        # Another worker takes the lease over, as if this one had stalled past its ttl
+        await repo.release_lease("shard:0", "a")
+        assert await repo.acquire_lease("shard:0", "b", ttl=60)
+        with pytest.raises(LeaseLost):
+            async with heartbeat(repo, {"shard:0": "a"}, ttl=0.3):
+                await asyncio.sleep(5)
+                finished.append(True)
+        # The task is usable afterwards
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert not finished
+
+
+def test_shards_partition_the_id_space():
+    ids = [str(uuid.uuid4()) for _ in range(500)] + ["00000000-0000-0000-0000-000000000000", "ffffffff-ffff-ffff-ffff-ffffffffffff"]
+    shards = 7
+    owners = []
+    for resume_id in ids:
+        owners.append([
+            shard for shard in range(shards)
+            if (shard_bounds(shard, shards)[0] or "") <= resume_id < (shard_bounds(shard, shards)[1] or "g")
+        ])
+    assert all(len(owner) == 1 for owner in owners)
+
+
+def test_sharded_rescore_with_a_helper_worker(memory_repo, monkeypatch):
+    from app.workers import scheduler
+    from benchmarks.synthetic import generate_jobs, generate_resumes
+
+    monkeypatch.setattr(settings, "rescore_shards", 4)
+    monkeypatch.setattr(settings, "rescore_poll_seconds", 0)
+    repo = memory_repo
+
+    async def scenario():
+        await repo.insert_jobs(generate_jobs(40, seed=3))
+        await repo.insert_resumes(generate_resumes(60, seed=3)[0])
+        # The helper polls while the coordinator plans and works
+        coordinator = asyncio.create_task(scheduler.periodic_match_rescore())
+        while not coordinator.done():
+            await scheduler.rescore_shard_worker()
+            await asyncio.sleep(0)
+        await coordinator
+        plan = await repo.get_state(scheduler.RESCORE_PLAN_KEY)
+        shards = [scheduler.RescorePlan(**plan).shard_lease(shard) for shard in range(4)]
+        return await repo.list_matches(columns="resume_id,job_id"), plan, await repo.list_completed_leases(shards)
+
+    matches, plan, completed = asyncio.run(scenario())
+    pairs = [(row['resume_id'], row['job_id']) for row in matches]
+    assert pairs and len(pairs) == len(set(pairs))
+    assert plan['finished']
+    assert len(completed) == 4
+
+
+def test_rescore_waits_for_the_interval_since_the_last_run(memory_repo, monkeypatch):
+    from app.workers import scheduler
+    from app.workers.state import load_watermark
+    from benchmarks.synthetic import generate_jobs, generate_resumes
+
+    repo = memory_repo
+    runs = []
+    plan_run = scheduler._plan_run
+
+    async def counting_plan_run(*args):
+        runs.append(True)
+        return await plan_run(*args)
+
+    monkeypatch.setattr(scheduler, "_plan_run", counting_plan_run)
+
+    async def scenario():
+        await repo.insert_jobs(generate_jobs(10, seed=1))
+        await repo.insert_resumes(generate_resumes(10, seed=1)[0])
+        await scheduler.periodic_match_rescore()
+        first = await load_watermark(repo)
+        # A second worker's check right after finds the run already done
+        await scheduler.periodic_match_rescore()
+        monkeypatch.setattr(settings, "rescore_interval_seconds", 0)
+        await scheduler.periodic_match_rescore()
+        return first, await load_watermark(repo)
+
+    first, second = asyncio.run(scenario())
+    assert len(runs) == 2
+    assert first.last_run_at < second.last_run_at
@@ -0,0 +1,39 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+
+
+def test_dashboard_in_one_response(memory_repo, monkeypatch):
+    monkeypatch.setattr(settings, "dashboard_matches", 1)
+    monkeypatch.setattr(settings, "dashboard_notifications", 2)
+    repo = memory_repo
+
+    async def seed():
+        resume = await repo.insert_resume({"user_id": "u1", "filename": "a.pdf", "text_content": "python"})
+        jobs = await repo.insert_jobs([{"title": f"Job {i}", "description": "python"} for i in range(3)])
+        matches = await repo.upsert_matches(
+            [
+                {"user_id": "u1", "resume_id": resume['id'], "job_id": job['id'], "score": 80.0 + i, "created_at": f"2024-01-0{i + 1}"}
+                for i, job in enumerate(jobs)
+            ],
+            on_conflict="user_id,resume_id,job_id"
+        )
+        await repo.upsert_notifications(
+            [{"user_id": "u1", "match_id": match['id'], "type": "in_app", "created_at": match['created_at']} for match in matches],
+            on_conflict="match_id,type"
+        )
+        return resume
+
+    resume = asyncio.run(seed())
+    client = TestClient(app)
+    payload = client.get("/api/v1/dashboard").json()
+    older = client.get("/api/v1/notifications", params={"type": "in_app", "cursor": payload['next_notifications_cursor']}).json()
+
+    assert [row['id'] for row in payload['resumes']] == [resume['id']]
+    assert [(row['job_title'], row['score']) for row in payload['matches']] == [("Job 2", 82.0)]
+    assert payload['counts'] == {"matches": 3, "unread_notifications": 3}
+    # Job 1's match is not among the latest matches and is read for its notification
+    assert [(row['job_title'], row['score']) for row in payload['notifications']] == [("Job 2", 82.0), ("Job 1", 81.0)]
+    # The rest of the feed continues from the cursor
+    assert [row['created_at'] for row in older] == ["2024-01-01"]
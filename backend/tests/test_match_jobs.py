@@ -0,0 +1,68 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.core.config import settings
+from app.core.security import verify_token
+from app.main import app
+from app.workers.match_jobs import match_jobs
+from benchmarks.synthetic import generate_jobs, generate_resumes
+
+
+@pytest.fixture
+def seeded(memory_repo, monkeypatch):
+    monkeypatch.setattr(settings, "match_threshold", 20)
+    monkeypatch.setattr(settings, "match_stream_block_size", 7)
+    resumes = generate_resumes(1, seed=5)[0]
+    asyncio.run(memory_repo.insert_jobs(generate_jobs(30, seed=5)))
+    asyncio.run(memory_repo.insert_resumes(resumes))
+    app.dependency_overrides[verify_token] = lambda: resumes[0]['user_id']
+    yield resumes
+    match_jobs.close()
+
+
+def test_job_and_stream_return_the_synchronous_matches(seeded):
+    body = {"resume_id": seeded[0]['id']}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+            submitted = await client.post("/matches/jobs", json=body)
+            assert submitted.status_code == 202
+            assert submitted.headers["Location"].endswith(submitted.json()["id"])
+            while (job := (await client.get("http://test" + submitted.headers["Location"])).json())["status"] in ("queued", "running"):
+                await asyncio.sleep(0.01)
+
+            streamed = await client.post("/matches/stream", json=body)
+            events = await client.post("/matches/stream", json=body, headers={"Accept": "text/event-stream"})
+            direct = await client.post("/matches", json=body)
+            missing = await client.post("/matches/jobs", json={"resume_id": "00000000-0000-4000-8000-000000000000"})
+            return job, streamed, events, direct, missing
+
+    job, streamed, events, direct, missing = asyncio.run(scenario())
+    expected = {row["id"]: row["score"] for row in direct.json()}
+    assert len(expected) > 7
+    assert job["status"] == "done"
+    assert {row["id"]: row["score"] for row in job["matches"]} == expected
+
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    assert {row["id"]: row["score"] for row in map(json.loads, streamed.text.splitlines())} == expected
+
+    blocks = [block.split("\n") for block in events.text.strip().split("\n\n")]
+    assert [lines[0] for lines in blocks] == ["event: match"] * len(expected) + ["event: done"]
+    assert json.loads(blocks[-1][1][len("data: "):]) == {"count": len(expected)}
+    # An unknown resume fails at submission, before any job is queued
+    assert missing.status_code == 404
+
+
+def test_full_queue_is_refused(seeded, monkeypatch):
+    monkeypatch.setattr(settings, "match_job_max_pending", 0)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+            return await client.post("/matches/jobs", json={"resume_id": seeded[0]['id']})
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"]
@@ -0,0 +1,204 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from app.services.vectorize import Vectorizer
+from app.services.job_index import JobIndex
+from app.services import match_score
+
+JOBS = [
+    {"id": "1", "title": "Backend Engineer", "description": "Python developer building REST APIs with FastAPI and PostgreSQL", "skills": ["python"], "experience_years": 3, "education_level": "bachelor"},
+    {"id": "2", "title": "Data Scientist", "description": "Machine learning engineer with Python, scikit-learn and statistics", "skills": ["ml"], "experience_years": 7, "education_level": "master"},
+    {"id": "3", "title": "Nurse", "description": "Registered nurse for patient care in a busy hospital ward", "skills": [], "experience_years": None, "education_level": None},
+]
+RESUME = "Experienced Python developer. Built REST APIs and machine learning pipelines."
+
+
+@pytest.fixture
+def fitted(monkeypatch):
+    vec = Vectorizer()
+    vec.fit([job["description"] for job in JOBS])
+    monkeypatch.setattr(match_score, "vectorizer", vec)
+    return vec
+
+
+def test_job_index_matches_pairwise_scores(fitted):
+    index = JobIndex(fitted)
+    index.build(JOBS)
+    for job, scores in index.score(RESUME, 5, "bachelor"):
+        expected = match_score.compute_weighted_score(
+            RESUME, job["description"], job["skills"],
+            job.get("experience_years"), job.get("education_level"), 5, "bachelor"
+        )
+        assert scores == expected
+
+
+def test_job_index_sync_handles_edits_and_removals(fitted):
+    index = JobIndex(fitted)
+    index.build(JOBS)
+    edited = dict(JOBS[2], description="Python nurse")
+    index.sync([JOBS[0], edited])
+    scored = {job["id"]: scores for job, scores in index.score(RESUME)}
+    assert set(scored) == {"1", "3"}
+    assert scored["3"]["skills"] > 0
+
+
+def test_concurrent_upserts_keep_every_job(fitted):
+    index = JobIndex(fitted)
+    index.build(JOBS)
+    added = [{"id": f"new-{i}", "title": "Engineer", "description": f"Python engineer {i}", "skills": []} for i in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda job: index.upsert([job]), added))
+    assert len(index) == len(JOBS) + len(added)
+
+
+def test_batch_scoring_matches_pairwise_scores(fitted, monkeypatch):
+    from app.services import batch_score
+    monkeypatch.setattr(batch_score, "vectorizer", fitted)
+    resumes = [
+        {"id": "r1", "text_content": RESUME},
+        {"id": "r2", "text_content": "Hospital nurse caring for patients"},
+        {"id": "r3", "text_content": "Statistics and machine learning with Python"},
+    ]
+    expected = {}
+    for resume in resumes:
+        for job in JOBS:
+            scores = match_score.compute_weighted_score(
+                resume["text_content"], job["description"], job["skills"],
+                job.get("experience_years"), job.get("education_level"), 5, "bachelor"
+            )
+            if scores["overall"] >= 40:
+                expected[(resume["id"], job["id"])] = scores
+
+    assert expected
+    scored = batch_score.score_all(
+        resumes, JOBS, [5] * 3, ["bachelor"] * 3, threshold=40, block_size=2, workers=2
+    )
+    assert {(r["id"], j["id"]): s for r, j, s, _ in scored} == expected
+
+    top = batch_score.score_all(resumes, JOBS, [5] * 3, ["bachelor"] * 3, top_k=1, block_size=2)
+    assert sorted(r["id"] for r, _, _, _ in top) == ["r1", "r2", "r3"]
+
+
+def test_model_artifact_round_trip(fitted, monkeypatch, tmp_path):
+    from app.core.config import settings
+    from app.services import model_store
+    monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+    index = JobIndex(fitted)
+    index.build(JOBS)
+
+    artifact_id = model_store.save_model(index.snapshot())
+    loaded = model_store.load_model(artifact_id)
+    assert loaded.version == fitted.version
+    assert [job["id"] for job in loaded.jobs] == [job["id"] for job in index.snapshot().jobs]
+
+    restored = JobIndex(fitted)
+    restored.install(loaded)
+    assert restored.score(RESUME, 5, "bachelor") == index.score(RESUME, 5, "bachelor")
+
+
+def test_pruned_top_k_matches_exhaustive(fitted, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "retrieval_candidates", 2)
+    index = JobIndex(fitted)
+    index.build(JOBS)
+    exhaustive = index.score(RESUME, 5, "bachelor", top_k=1, exhaustive=True)
+    assert index.score(RESUME, 5, "bachelor", top_k=1) == exhaustive
+    assert index.measure_recall([RESUME, "Hospital nurse"], top_k=1) == 1.0
+    # Keeping a single query term still only returns jobs sharing it
+    monkeypatch.setattr(settings, "retrieval_candidates", 1)
+    monkeypatch.setattr(settings, "retrieval_query_terms", 1)
+    assert len(index.score("hospital", top_k=1)) == 1
+    assert index.score("hospital", top_k=1)[0][0]["id"] == "3"
+
+
+def test_resume_index_matches_pairwise_scores(fitted):
+    from app.services.resume_index import ResumeIndex
+    resumes = [
+        {"id": "r1", "user_id": "u1", "text_content": RESUME, "experience_years": 5, "education_level": "bachelor"},
+        {"id": "r2", "user_id": "u2", "text_content": "Hospital nurse caring for patients", "experience_years": 5, "education_level": "bachelor"},
+    ]
+    from app.services.skills import SkillDictionary
+    skills = SkillDictionary.from_jobs(JOBS)
+    index = ResumeIndex()
+    index.sync(resumes, fitted.model, skills)
+    index.upsert([{"id": "r3", "user_id": "u3", "text_content": "Python statistics"}], fitted.model, skills)
+    assert len(index) == 3
+    for job in JOBS:
+        matched = {resume["id"]: scores for resume, scores, _ in index.match_job(job, threshold=40)}
+        for resume in resumes:
+            expected = match_score.compute_weighted_score(
+                resume["text_content"], job["description"], job["skills"],
+                job.get("experience_years"), job.get("education_level"), 5, "bachelor"
+            )
+            if expected["overall"] >= 40:
+                assert matched[resume["id"]] == expected
+            else:
+                assert resume["id"] not in matched
+
+
+def test_job_index_hard_filters(fitted):
+    index = JobIndex(fitted)
+    index.build([dict(job, location=location) for job, location in zip(JOBS, ["Berlin", "Remote", " berlin "])])
+    assert {job["id"] for job, _ in index.score(RESUME, 5, "bachelor", location="BERLIN")} == {"1", "3"}
+    everything = index.score(RESUME, 5, "bachelor")
+    cutoff = sorted(scores["overall"] for _, scores in everything)[1]
+    filtered = index.score(RESUME, 5, "bachelor", min_score=cutoff)
+    assert filtered == [(job, scores) for job, scores in everything if scores["overall"] >= cutoff]
+    assert index.score(RESUME, 5, "bachelor", location="Paris") == []
+
+
+def test_top_terms_are_largest_shared_weights(fitted):
+    from app.services.explain import top_terms
+    model = fitted.model
+    resumes = model.transform_many([RESUME, RESUME, "Hospital nurse"])
+    jobs = model.transform_many([JOBS[0]["description"], JOBS[2]["description"], JOBS[0]["description"]])
+    terms = top_terms(model, resumes, jobs, n=3)
+    product = resumes[0].multiply(jobs[0]).toarray().ravel()
+    expected = [model.terms[i] for i in product.argsort()[::-1][:3]]
+    assert terms[0] == expected
+    assert terms[1] == []
+    assert terms[2] == []
+
+
+def test_resume_is_transformed_once_per_request(fitted, monkeypatch):
+    from app.api.routers import matches as matches_router
+    index = JobIndex(fitted)
+    index.build(JOBS)
+    monkeypatch.setattr(matches_router, "job_index", index)
+    model = index.snapshot().model
+    calls = []
+    transform = model.transform
+    monkeypatch.setattr(model, "transform", lambda text: calls.append(text) or transform(text))
+    scored = matches_router._score({"text_content": RESUME}, None, None, 2)
+    assert scored and all(terms for _, _, terms in scored)
+    assert len(calls) == 1
+
+
+def test_resume_index_keeps_vectors_when_only_skills_change(fitted, monkeypatch):
+    from app.services.resume_index import ResumeIndex
+    from app.services.skills import SkillDictionary
+    resumes = [{"id": "r1", "user_id": "u1", "text_content": RESUME}, {"id": "r2", "user_id": "u2", "text_content": "Kubernetes"}]
+    index = ResumeIndex()
+    index.sync(resumes, fitted.model, SkillDictionary(["python"]))
+    matrix = index.snapshot().matrix
+
+    monkeypatch.setattr(fitted.model, "transform_many", lambda texts: pytest.fail("resumes were transformed again"))
+    skills = SkillDictionary(["python", "kubernetes"])
+    index.sync(resumes, fitted.model, skills)
+    state = index.snapshot()
+    assert (state.matrix != matrix).nnz == 0
+    assert state.skills is skills
+    np.testing.assert_array_equal(state.features.skill_bits, skills.encode_texts([RESUME, "Kubernetes"]))
+
+
+def test_candidates_accumulate_over_posting_lists():
+    import scipy.sparse as sp
+    from app.services.retrieval import CandidateIndex
+    matrix = sp.random(300, 400, density=0.05, format="csr", random_state=0)
+    query = sp.random(1, 400, density=0.1, format="csr", random_state=1)
+    exact = (matrix @ query.T).toarray().ravel()
+    index = CandidateIndex(matrix)
+    assert set(index.candidates(query, 20)) == set(np.argsort(-exact)[:20])
+    # With one query term only jobs posting that term come back
+    heaviest = query.indices[np.argmax(query.data)]
+    assert set(index.candidates(query, 300, query_terms=1)) == set(matrix[:, heaviest].nonzero()[0])
@@ -0,0 +1,38 @@
+from fastapi.testclient import TestClient
+from app.core.metrics import Histogram, stage_timer
+from app.main import app
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test", ("stage",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, stage="score")
+    lines = histogram.render()
+    assert 'test_seconds_bucket{stage="score",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="score",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{stage="score",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="score"} 3' in lines
+
+
+def test_metrics_endpoint():
+    client = TestClient(app)
+    with stage_timer("preprocess"):
+        pass
+    client.get("/api/v1/jobs")
+    response = client.get("/api/v1/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'job_matching_stage_seconds_count{stage="preprocess"}' in response.text
+    assert 'job_matching_http_request_seconds_count{method="GET",route="/api/v1/jobs",status="200"}' in response.text
+    assert 'job_matching_db_request_seconds_count{operation="list_jobs"}' in response.text
+
+
+def test_slow_computations_are_profiled(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.core.profiling import profile_if_slow
+    monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+    with profile_if_slow("match", threshold_ms=0):
+        sum(range(1000))
+    with profile_if_slow("match", threshold_ms=60_000):
+        sum(range(1000))
+    assert len(list((tmp_path / "profiles").glob("match-*.prof"))) == 1
@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from app.api.routers import notifications as notifications_router
+from app.core.config import settings
+from app.main import app
+from app.services.notification_feed import NotificationFeed
+
+
+def _authenticate(token: str) -> str:
+    if token != "good":
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return "u1"
+
+
+async def _add_notifications(repo, count: int) -> list[dict]:
+    resume = await repo.insert_resume({"user_id": "u1", "filename": "a.pdf", "text_content": "python"})
+    jobs = await repo.insert_jobs([{"title": f"Job {i}", "description": "python"} for i in range(count)])
+    matches = await repo.upsert_matches(
+        [{"user_id": "u1", "resume_id": resume['id'], "job_id": job['id'], "score": 80.0} for job in jobs],
+        on_conflict="user_id,resume_id,job_id"
+    )
+    return await repo.upsert_notifications(
+        [{"user_id": "u1", "match_id": match['id'], "type": "in_app"} for match in matches], on_conflict="match_id,type"
+    )
+
+
+@pytest.fixture
+def repo(memory_repo, monkeypatch):
+    monkeypatch.setattr(notifications_router, "authenticate", _authenticate)
+    return memory_repo
+
+
+def test_feed_pages_and_marks_read(repo):
+    asyncio.run(_add_notifications(repo, 5))
+    client = TestClient(app)
+    seen, cursor = [], None
+    while True:
+        response = client.get("/api/v1/notifications", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+        seen += [row["id"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 5
+    assert client.get("/api/v1/notifications", params={"cursor": "not-a-cursor"}).status_code == 400
+    # The in-app feed by default; the outbox's email rows only when asked for
+    asyncio.run(repo.upsert_notifications(
+        [{"user_id": "u1", "match_id": row['match_id'], "type": "email"} for row in asyncio.run(repo.list_notifications("u1", "in_app"))],
+        on_conflict="match_id,type"
+    ))
+    assert {row["type"] for row in client.get("/api/v1/notifications").json()} == {"in_app"}
+    assert {row["type"] for row in client.get("/api/v1/notifications", params={"type": "email"}).json()} == {"email"}
+    assert client.get("/api/v1/notifications", params={"type": "sms"}).status_code == 422
+
+    assert client.get("/api/v1/notifications/unread-count").json() == {"unread": 5}
+    assert client.post("/api/v1/notifications/read", json={"ids": seen[:2]}).json() == {"unread": 3}
+    assert client.post("/api/v1/notifications/read", json={}).json() == {"unread": 0}
+
+
+def test_socket_pushes_notifications_from_other_workers(repo, monkeypatch):
+    monkeypatch.setattr(settings, "notification_poll_seconds", 0.05)
+    client = TestClient(app)
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/api/v1/notifications/ws?token=bad") as socket:
+            socket.receive_json()
+
+    with client.websocket_connect("/api/v1/notifications/ws?token=good") as socket:
+        assert socket.receive_json() == {"type": "unread", "unread": 0}
+        # Written straight to storage, as another worker would: only the poll finds it
+        added = asyncio.run(_add_notifications(repo, 1))
+        message = socket.receive_json()
+    assert message["type"] == "notification"
+    assert message["notification"]["id"] == added[0]["id"]
+
+
+def test_socket_closes_when_updates_fail(repo, monkeypatch):
+    async def unavailable(user_id, notification_type):
+        raise ConnectionError("storage unavailable")
+
+    monkeypatch.setattr(repo, "count_unread_notifications", unavailable)
+    client = TestClient(app)
+    with client.websocket_connect("/api/v1/notifications/ws?token=good") as socket:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            socket.receive_json()
+    assert closed.value.code == 1011
+
+
+def test_published_rows_reach_subscribers_once():
+    feed = NotificationFeed()
+
+    async def scenario():
+        mine, other = feed.subscribe("u1"), feed.subscribe("u2")
+        row = {"id": "n1", "user_id": "u1", "type": "in_app"}
+        feed.publish([row, {"id": "n2", "user_id": "u1", "type": "email"}])
+        feed.publish([row])
+        received = [mine.get_nowait() for _ in range(mine.qsize())]
+        feed.unsubscribe("u1", mine)
+        feed.unsubscribe("u2", other)
+        return received, other.qsize()
+
+    received, others = asyncio.run(scenario())
+    assert received == [{"id": "n1", "user_id": "u1", "type": "in_app"}]
+    assert others == 0
@@ -0,0 +1,70 @@
+import asyncio
+from app.core.config import settings
+from app.services.mailer import MemoryTransport
+from app.services.persistence import persist_matches
+from app.workers.outbox import RateLimiter, build_digests, deliver, dispatch_outbox
+
+
+def test_build_digests_groups_per_user():
+    notifications = [
+        {"id": 1, "user_id": "u1", "match_id": "m1"},
+        {"id": 2, "user_id": "u1", "match_id": "m2"},
+        {"id": 3, "user_id": "u2", "match_id": "m3"},
+    ]
+    matches = {
+        "m1": {"id": "m1", "job_id": "j1", "score": 91.5},
+        "m2": {"id": "m2", "job_id": "j2", "score": 75.0},
+        "m3": {"id": "m3", "job_id": "j1", "score": 80.0},
+    }
+    jobs = {"j1": {"id": "j1", "title": "Backend Engineer"}, "j2": {"id": "j2", "title": "Data Scientist"}}
+
+    digests = {digest.user_id: digest for digest in build_digests(notifications, matches, jobs)}
+    assert digests["u1"].notification_ids == [1, 2]
+    assert digests["u1"].subject == "2 New Job Matches!"
+    assert "91.5% match for Backend Engineer" in digests["u1"].body
+    assert digests["u2"].subject == "New Job Match!"
+
+
+class FlakyTransport(MemoryTransport):
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    async def send(self, to, subject, body):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("provider unavailable")
+        await super().send(to, subject, body)
+
+
+def test_deliver_retries_with_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "outbox_backoff_seconds", 0)
+    monkeypatch.setattr(settings, "outbox_max_retries", 2)
+    digest = build_digests(
+        [{"id": 1, "user_id": "u1", "match_id": "m1"}],
+        {"m1": {"id": "m1", "job_id": "j1", "score": 90}},
+        {"j1": {"id": "j1", "title": "Nurse"}},
+    )[0]
+
+    async def run(transport):
+        return await deliver(transport, digest, RateLimiter(0), asyncio.Semaphore(1))
+
+    transport = FlakyTransport(failures=2)
+    assert asyncio.run(run(transport))
+    assert len(transport.sent) == 1
+    assert not asyncio.run(run(FlakyTransport(failures=3)))
+
+
+def test_concurrent_drains_send_each_digest_once(memory_repo):
+    repo = memory_repo
+
+    async def scenario():
+        resume = await repo.insert_resume({"user_id": "u1", "filename": "a.pdf", "text_content": "python"})
+        jobs = await repo.insert_jobs([{"title": "Nurse", "description": "care"}])
+        await persist_matches([{"user_id": "u1", "resume_id": resume['id'], "job_id": jobs[0]['id'], "score": 90.0, "top_terms": []}])
+        transport = MemoryTransport()
+        # As if two workers drained at the same moment
+        await asyncio.gather(dispatch_outbox(transport), dispatch_outbox(transport))
+        return transport.sent
+
+    assert len(asyncio.run(scenario())) == 1
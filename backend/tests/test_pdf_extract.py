@@ -0,0 +1,52 @@
+import asyncio
+import io
+import PyPDF2
+import pytest
+from app.services.pdf_extract import PDFExtractionError, PDFWorkerPool, extract_text_from_pdf
+
+
+def _blank_pdf(pages: int) -> bytes:
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(100, 100)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_extract_limits():
+    assert extract_text_from_pdf(_blank_pdf(3), max_pages=3) == ""
+    with pytest.raises(PDFExtractionError):
+        extract_text_from_pdf(_blank_pdf(4), max_pages=3)
+    with pytest.raises(PDFExtractionError):
+        extract_text_from_pdf(b"not a pdf")
+
+
+def test_malformed_pdf_errors_are_wrapped(monkeypatch):
+    def malformed(stream):
+        raise KeyError("/Root")
+    monkeypatch.setattr(PyPDF2, "PdfReader", malformed)
+    with pytest.raises(PDFExtractionError, match="KeyError"):
+        extract_text_from_pdf(b"%PDF-1.4")
+
+
+def test_worker_pool(monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "pdf_workers", 1)
+    pool = PDFWorkerPool()
+
+    async def run():
+        assert await pool.extract(_blank_pdf(1)) == ""
+        with pytest.raises(PDFExtractionError):
+            await pool.extract(b"not a pdf")
+        # A parse past the deadline fails, and the rebuilt pool keeps serving
+        monkeypatch.setattr(settings, "pdf_timeout_seconds", 0)
+        with pytest.raises(PDFExtractionError):
+            await pool.extract(_blank_pdf(1))
+        monkeypatch.setattr(settings, "pdf_timeout_seconds", 30)
+        assert await pool.extract(_blank_pdf(1)) == ""
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.close()
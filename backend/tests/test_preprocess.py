@@ -0,0 +1,13 @@
+from app.services.preprocess import preprocess_text, preprocess_batch
+
+
+def test_preprocess_text():
+    assert preprocess_text("Hello, World! I have 10 years of Python.") == "hello world years python"
+    # word_tokenize splits these contractions, leaving "can"/"not" as stopwords
+    assert preprocess_text("I cannot wait, gonna learn Go") == "wait gon na learn go"
+
+
+def test_preprocess_batch_preserves_order():
+    texts = ["Senior Java developer", "The nurse's ward", "", "Data-driven analyst"]
+    assert list(preprocess_batch(texts)) == [preprocess_text(text) for text in texts]
+    assert list(preprocess_batch(texts, processes=2, chunksize=1)) == [preprocess_text(text) for text in texts]
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock
+from app.core.config import settings
+from app.services.resume_features import (
+    RESUME_FEATURES_VERSION, extract_education_level, extract_experience_years, extract_resume_features
+)
+from app.services.pdf_extract import pdf_pool
+from app.workers.backfill import backfill_resume_features
+
+
+def test_experience_from_date_ranges_and_statements():
+    text = "Engineer, Acme  Jan 2015 - Mar 2018\nSenior Engineer  2017 – Present"
+    # Overlapping jobs count once: Jan 2015 up to Jun 2024
+    assert extract_experience_years(text, today=date(2024, 6, 1)) == 9
+    assert extract_experience_years("5+ years of professional experience in Python") == 5
+    assert extract_experience_years("Experience: 3 years") == 3
+    assert extract_experience_years("No dates here") is None
+
+
+def test_highest_education_level():
+    assert extract_education_level("B.Sc. in Physics, M.S. in Computer Science") == "master"
+    assert extract_education_level("Ph.D. candidate") == "phd"
+    assert extract_education_level("High school diploma") == "high school"
+    assert extract_resume_features("Self-taught")["education_level"] is None
+    assert extract_resume_features("C++ and C# developer.")["skill_text"] == "C++ and C# developer"
+
+
+def test_backfill_leaves_unreadable_files_for_the_next_run(memory_repo, monkeypatch):
+    repo = memory_repo
+
+    async def unavailable(path):
+        raise ConnectionError("storage unavailable")
+
+    async def scenario():
+        resume = await repo.insert_resume({"user_id": "u1", "filename": "a.pdf", "text_content": "python"})
+        monkeypatch.setattr(repo, "download_resume_file", unavailable)
+        await backfill_resume_features()
+        return await repo.list_resumes_needing_features(RESUME_FEATURES_VERSION, 10), resume
+
+    pending, resume = asyncio.run(scenario())
+    assert [row['id'] for row in pending] == [resume['id']]
+
+
+def test_backfill_pages_past_skipped_rows_and_counts_written_ones(memory_repo, monkeypatch):
+    repo = memory_repo
+    monkeypatch.setattr(settings, "backfill_batch_size", 2)
+    download = repo.download_resume_file
+
+    async def flaky(path):
+        if path.endswith("bad.pdf"):
+            raise ConnectionError("storage unavailable")
+        return await download(path)
+
+    async def scenario():
+        # The unreadable files sort first, so they fill the whole first batch
+        rows = [
+            await repo.insert_resume({"id": f"{i}", "user_id": "u1", "filename": name, "text_content": "python"})
+            for i, name in enumerate(("bad.pdf", "bad.pdf", "good.pdf", "good.pdf", "good.pdf"))
+        ]
+        for row in rows:
+            await repo.upload_resume_file(f"resumes/u1/{row['filename']}", b"%PDF")
+        monkeypatch.setattr(repo, "download_resume_file", flaky)
+        monkeypatch.setattr(pdf_pool, "extract", AsyncMock(return_value="5 years of experience"))
+        updated = await backfill_resume_features()
+        return updated, await repo.list_resumes_needing_features(RESUME_FEATURES_VERSION, 10)
+
+    updated, pending = asyncio.run(scenario())
+    assert updated == 3
+    assert [row['filename'] for row in pending] == ["bad.pdf", "bad.pdf"]
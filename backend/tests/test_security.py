@@ -0,0 +1,98 @@
+import time
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import JWTError, jwk, jwt
+from app.core import security
+from app.core.config import settings
+from app.core.security import KeySet, TokenCache, verify_token
+
+SECRET = "test-secret"
+
+
+@pytest.fixture(autouse=True)
+def auth_settings(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_jwt_secret", SECRET)
+    monkeypatch.setattr(settings, "jwt_audience", "authenticated")
+    monkeypatch.setattr(settings, "jwt_verify_signature", True)
+    monkeypatch.setattr(security, "token_cache", TokenCache(max_size=2, ttl=300))
+
+
+def _token(sub="u1", exp_in=3600, key=SECRET, algorithm="HS256", **headers):
+    claims = {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + exp_in}
+    return jwt.encode(claims, key, algorithm=algorithm, headers=headers or None)
+
+
+def _verify(token):
+    return verify_token(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+def test_signature_and_expiry_are_checked():
+    assert _verify(_token()) == "u1"
+    for token in (_token(key="wrong-secret"), _token(exp_in=-10)):
+        with pytest.raises(HTTPException) as error:
+            _verify(token)
+        assert error.value.status_code == 401
+
+
+def test_verified_tokens_are_cached_until_exp(monkeypatch):
+    token = _token(exp_in=60)
+    assert _verify(token) == "u1"
+    calls = []
+
+    def decode_token(token):
+        calls.append(token)
+        raise JWTError("Signature has expired")
+    monkeypatch.setattr(security, "decode_token", decode_token)
+    assert _verify(token) == "u1"
+    assert calls == []
+
+    # Past exp the entry is dropped, so the token goes back through verification
+    monkeypatch.setattr(time, "time", lambda: 10 ** 10)
+    with pytest.raises(HTTPException):
+        _verify(token)
+    assert calls == [token]
+
+
+def test_token_cache_is_bounded():
+    cache = TokenCache(max_size=2, ttl=300)
+    for user in ("a", "b", "c"):
+        cache.put(f"token-{user}", user)
+    assert cache.get("token-a") is None
+    assert cache.get("token-c") == "c"
+
+
+def test_asymmetric_tokens_use_the_key_set(monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    keys = KeySet(url=None, refresh_seconds=3600)
+    keys.load([{**jwk.construct(pem, "RS256").public_key().to_dict(), "kid": "key-1"}])
+    monkeypatch.setattr(security, "key_set", keys)
+
+    assert _verify(_token(sub="u2", key=pem, algorithm="RS256", kid="key-1")) == "u2"
+    with pytest.raises(HTTPException):
+        _verify(_token(sub="u3", key=pem, algorithm="RS256", kid="rotated-away"))
+
+
+def test_stale_keys_are_served_while_the_key_server_is_down(monkeypatch):
+    keys = KeySet(url="https://auth.example/jwks.json", refresh_seconds=0, min_refresh_seconds=60)
+    keys.load([{"kid": "key-1", "kty": "RSA"}])
+    calls = []
+
+    def unreachable(url, timeout):
+        calls.append(url)
+        raise httpx.ConnectError("down")
+
+    monkeypatch.setattr(security.httpx, "get", unreachable)
+    assert keys.get("key-1")["kid"] == "key-1"
+    # Backed off: the next lookups neither fetch nor fail
+    assert keys.get("key-1")["kid"] == "key-1"
+    assert keys.get("unknown") is None
+    assert len(calls) == 1
+
+    empty = KeySet(url="https://auth.example/jwks.json", refresh_seconds=3600)
+    with pytest.raises(httpx.HTTPError):
+        empty.get("key-1")
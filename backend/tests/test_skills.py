@@ -0,0 +1,55 @@
+import numpy as np
+from app.services.skills import SkillDictionary, popcount, skill_overlap_scores, skill_text
+
+
+def test_extracts_aliases_and_multiword_skills():
+    skills = SkillDictionary(["Python", "Machine Learning", "PostgreSQL", "Kubernetes", "Go"])
+    found = skills.extract("Built ML pipelines on k8s with postgres; machine learning in python")
+    assert {skills.names[i] for i in found} == {"python", "machine learning", "postgresql", "kubernetes"}
+    # Dictionary contents never change what is found for a given skill
+    assert SkillDictionary(["ml"]).extract("machine learning") == {0}
+    # Ambiguous short forms are not aliases
+    assert SkillDictionary(["Computer Vision", "Registered Nurse"]).extract("CV attached. RN license") == set()
+
+
+
+def _found(skills, text):
+    return {skills.names[i] for i in skills.extract(text)}
+
+
+def test_symbols_keep_c_family_and_dotnet_apart():
+    skills = SkillDictionary(["C", "C++", "C#", ".NET"])
+    assert _found(skills, "Wrote C++ services") == {"c++"}
+    assert _found(skills, "Unity scripting in C#.") == {"c#"}
+    assert _found(skills, "Embedded C and C/C++") == {"c", "c++"}
+    assert _found(skills, "ASP.NET Core and .NET 8") == {".net"}
+    assert _found(skills, "Grew net revenue") == set()
+
+
+def test_ambiguous_names_need_the_skill_spelling():
+    skills = SkillDictionary(["Go", "R", "Node.js", "AI"])
+    assert _found(skills, "Services in Go, analysis in R") == {"go", "r"}
+    assert _found(skills, "Ready to go hiking, r and d") == set()
+    assert _found(skills, "Node and NodeJS") == {"node.js"}
+    assert _found(skills, "Replaced a failing network node") == set()
+    assert _found(skills, "AI research") == {"artificial intelligence"}
+    assert _found(skills, "said ai") == set()
+    # Job skills lists are taken as written, whatever the case
+    assert SkillDictionary(["go"]).lookup(["GO", "golang"]) == {0}
+
+
+def test_skill_text_keeps_the_words_skills_are_found_in():
+    text = skill_text("Skills: C++, Go (5 years), .NET; Node.js.")
+    assert text == "Skills C++ Go 5 years .NET Node.js"
+    assert _found(SkillDictionary(["C++", "Go", ".NET", "Node.js"]), text) == {"c++", "go", ".net", "node.js"}
+
+
+def test_overlap_by_popcount():
+    skills = SkillDictionary(f"skill{chr(97 + i)}{chr(97 + j)}" for i in range(10) for j in range(10))
+    assert skills.words == 2
+    jobs = [{"skills": ["skillaa", "skilljj"]}, {"skills": ["skillab"]}, {"skills": []}]
+    resume_bits = skills.encode_texts(["skillaa and skilljj", "nothing relevant"])
+    overlap = skill_overlap_scores(resume_bits, skills.encode_jobs(jobs))
+    np.testing.assert_array_equal(overlap[:, :2], [[100, 0], [0, 0]])
+    assert np.isnan(overlap[:, 2]).all()
+    assert popcount(np.array([2 ** 64 - 1, 5], dtype=np.uint64)).tolist() == [64, 2]
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.services import warmup
+from app.services.job_index import job_index
+from app.services.vectorize import vectorizer
+from benchmarks.synthetic import generate_jobs
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# About 0.6 s here; NLTK and sklearn at import time used to add over a second
+IMPORT_BUDGET_SECONDS = 1.5
+# Loaded on first use or during warm-up, never by importing the app
+LAZY_MODULES = ["nltk", "sklearn", "pandas", "scipy.stats"]
+
+
+def test_import_stays_within_budget():
+    script = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import app.main\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result["loaded"] == []
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
+
+
+def test_warm_up_reports_readiness(memory_repo, monkeypatch):
+    monkeypatch.setattr(warmup.readiness, "status", "starting")
+    monkeypatch.setattr(warmup.readiness, "steps", {})
+    asyncio.run(memory_repo.insert_jobs(generate_jobs(10, seed=1)))
+    # A fitted model, as if loaded from an artifact, makes the index step run
+    vectorizer.fit([job['description'] for job in generate_jobs(10, seed=1)])
+    client = TestClient(app)
+    starting = client.get("/api/v1/health/ready")
+    asyncio.run(warmup.warm_up())
+    ready = client.get("/api/v1/health/ready")
+    indexed = len(job_index)
+    assert starting.status_code == 503
+    assert starting.json()["status"] == "starting"
+    assert ready.status_code == 200
+    assert set(ready.json()["steps"]) == {"sklearn", "model", "catalog", "index"}
+    assert indexed == 10
+
+
+def test_failed_warm_up_is_retried_then_left_to_lazy_loading(monkeypatch):
+    monkeypatch.setattr(settings, "warm_up_retries", 1)
+    monkeypatch.setattr(settings, "warm_up_backoff_seconds", 0)
+    monkeypatch.setattr(warmup.readiness, "status", "starting")
+    monkeypatch.setattr(warmup.readiness, "error", None)
+    monkeypatch.setattr(warmup.readiness, "steps", {})
+    failures = [ConnectionError("storage unavailable")]
+
+    async def flaky_catalog():
+        if failures:
+            raise failures.pop()
+        return []
+
+    monkeypatch.setattr(warmup, "_load_catalog", flaky_catalog)
+    asyncio.run(warmup.warm_up())
+    assert warmup.readiness.report()["status"] == "ready" and warmup.readiness.error is None
+
+    failures.extend([ConnectionError("storage unavailable")] * 2)
+    monkeypatch.setattr(warmup.readiness, "status", "starting")
+    asyncio.run(warmup.warm_up())
+    assert warmup.readiness.ready
+    assert warmup.readiness.error == "catalog failed"
@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+from app.db import repository as repository_module
+from app.db.memory import MemoryRepository
+from app.db.sqlite import SQLiteRepository
+from app.services.persistence import load_existing_matches, match_key, persist_matches
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo(request):
+    repo = MemoryRepository() if request.param == "memory" else SQLiteRepository(":memory:")
+    yield repo
+    asyncio.run(repo.close())
+
+
+def test_resumes_and_files(repo):
+    async def scenario():
+        first = await repo.insert_resume({"user_id": "u1", "filename": "a.pdf", "text_content": "python", "content_hash": "h"})
+        second = await repo.insert_resume({"user_id": "u2", "filename": "b.pdf", "text_content": "python", "content_hash": "h"})
+        assert (await repo.find_resume_by_hash("h", columns="id"))['id'] == first['id']
+        assert await repo.get_resume(first['id'], "u2") is None
+
+        await repo.update_resume(first['id'], {"features_version": 1})
+        assert [row['filename'] for row in await repo.list_resumes_needing_features(1, 10)] == ["b.pdf"]
+        assert await repo.list_resumes_needing_features(1, 10, after_id=str(second['id'])) == []
+        assert len(await repo.list_resumes_needing_features(1, 10, after_id="")) == 1
+        assert [row['id'] for row in await repo.list_resumes(columns="id", updated_since=second['updated_at'])] == [first['id']]
+
+        await repo.upload_resume_file("resumes/u1/a.pdf", b"%PDF")
+        assert await repo.download_resume_file("resumes/u1/a.pdf") == b"%PDF"
+    asyncio.run(scenario())
+
+
+def test_upserts_skip_duplicates(repo):
+    async def scenario():
+        resume = await repo.insert_resume({"user_id": "u1", "filename": "a.pdf", "text_content": "python"})
+        jobs = await repo.insert_jobs([
+            {"title": "Backend", "description": "python", "skills": ["Python", "SQL"]},
+            {"title": "Frontend", "description": "react", "skills": None},
+        ])
+        assert (await repo.get_jobs_by_ids([jobs[0]['id']], columns="id,skills"))[0]['skills'] == ["Python", "SQL"]
+
+        rows = [{"user_id": "u1", "resume_id": resume['id'], "job_id": job['id'], "score": 80.0, "top_terms": ["python"]} for job in jobs]
+        conflict = "user_id,resume_id,job_id"
+        assert len(await repo.upsert_matches(rows[:1], on_conflict=conflict)) == 1
+        inserted = await repo.upsert_matches(rows, on_conflict=conflict)
+        assert [row['job_id'] for row in inserted] == [jobs[1]['id']]
+        assert len(await repo.list_matches(resume_ids=[resume['id']])) == 2
+
+        notifications = [{"user_id": "u1", "match_id": inserted[0]['id'], "type": kind, "status": "pending"} for kind in ("in_app", "email")]
+        await repo.upsert_notifications(notifications, on_conflict="match_id,type")
+        await repo.upsert_notifications(notifications, on_conflict="match_id,type")
+        pending = await repo.list_pending_notifications("email", 10)
+        assert len(pending) == 1
+
+        await repo.update_notifications([pending[0]['id']], {"status": "sent"})
+        assert await repo.list_pending_notifications("email", 10) == []
+        assert len(await repo.list_notifications("u1", "in_app")) == 1
+    asyncio.run(scenario())
+
+
+def test_notification_feed_pages_and_read_state(repo):
+    async def scenario():
+        resume = await repo.insert_resume({"user_id": "u1", "filename": "a.pdf", "text_content": "python"})
+        jobs = await repo.insert_jobs([{"title": f"Job {i}", "description": "python"} for i in range(5)])
+        matches = await repo.upsert_matches(
+            [{"user_id": "u1", "resume_id": resume['id'], "job_id": job['id'], "score": 80.0} for job in jobs],
+            on_conflict="user_id,resume_id,job_id"
+        )
+        # Two rows share a timestamp, so pages must break ties by id
+        stamps = ["2024-01-01T00:00:01", "2024-01-01T00:00:02", "2024-01-01T00:00:02", "2024-01-01T00:00:03", "2024-01-01T00:00:04"]
+        inserted = await repo.upsert_notifications(
+            [{"user_id": "u1", "match_id": match['id'], "type": "in_app", "created_at": stamp} for match, stamp in zip(matches, stamps)],
+            on_conflict="match_id,type"
+        )
+        assert len(inserted) == 5
+
+        everything = await repo.list_notifications("u1", "in_app")
+        pages, before = [], None
+        while True:
+            page = await repo.list_notifications("u1", "in_app", limit=2, before=before)
+            if not page:
+                break
+            pages.append(page)
+            before = (page[-1]['created_at'], page[-1]['id'])
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [row['id'] for page in pages for row in page] == [row['id'] for row in everything]
+        assert [row['created_at'] for row in everything] == sorted(stamps, reverse=True)
+
+        assert await repo.count_unread_notifications("u1", "in_app") == 5
+        await repo.mark_notifications_read("u1", "in_app", [everything[0]['id'], everything[1]['id']])
+        await repo.mark_notifications_read("u2", "in_app")
+        assert await repo.count_unread_notifications("u1", "in_app") == 3
+        assert (await repo.list_notifications("u1", "in_app", limit=1))[0]['read_at'] is not None
+        await repo.mark_notifications_read("u1", "in_app")
+        assert await repo.count_unread_notifications("u1", "in_app") == 0
+
+        since = await repo.list_notifications_since("in_app", "2024-01-01T00:00:03", ["u1"])
+        assert [row['created_at'] for row in since] == stamps[3:]
+        assert await repo.list_notifications_since("in_app", "2024-01-01T00:00:03", ["u2"]) == []
+    asyncio.run(scenario())
+
+
+def test_persist_reads_back_pairs_stored_concurrently(repo, monkeypatch):
+    monkeypatch.setattr(repository_module, "_repository", repo)
+
+    async def scenario():
+        resume = await repo.insert_resume({"user_id": "u1", "filename": "a.pdf", "text_content": "python"})
+        jobs = await repo.insert_jobs([{"title": "Backend", "description": "python"}])
+        candidate = {"user_id": "u1", "resume_id": resume['id'], "job_id": jobs[0]['id'], "score": 80.0, "top_terms": []}
+        # Both requests read before either wrote
+        first, second = await load_existing_matches([resume['id']]), await load_existing_matches([resume['id']])
+        assert len(await persist_matches([candidate], first)) == 1
+        assert await persist_matches([candidate], second) == []
+        assert second[match_key(candidate)]['id'] == first[match_key(candidate)]['id']
+    asyncio.run(scenario())
+
+
+def test_pending_rows_are_claimed_once(repo):
+    async def scenario():
+        resume = await repo.insert_resume({"user_id": "u1", "filename": "a.pdf", "text_content": "python"})
+        jobs = await repo.insert_jobs([{"title": f"Job {i}", "description": "python"} for i in range(3)])
+        matches = await repo.upsert_matches(
+            [{"user_id": "u1", "resume_id": resume['id'], "job_id": job['id'], "score": 80.0} for job in jobs],
+            on_conflict="user_id,resume_id,job_id"
+        )
+        await repo.upsert_notifications(
+            [{"user_id": "u1", "match_id": match['id'], "type": "email", "status": "pending"} for match in matches],
+            on_conflict="match_id,type"
+        )
+        first = await repo.claim_pending_notifications("email", 2, 60, columns="id")
+        second = await repo.claim_pending_notifications("email", 2, 60, columns="id")
+        assert len(first) == 2 and len(second) == 1
+        assert await repo.claim_pending_notifications("email", 2, 60) == []
+        # A lapsed claim is taken again
+        await repo.update_notifications([row['id'] for row in second], {"claimed_until": "2000-01-01T00:00:00+00:00"})
+        assert [row['id'] for row in await repo.claim_pending_notifications("email", 5, 60)] == [second[0]['id']]
+    asyncio.run(scenario())